@@ -0,0 +1,72 @@
+"""Micro-benchmark for CommandParser routing
+
+Kullanim:
+    python -m benchmarks.parser_routing [--number 200000]
+
+Her girdi icin cache'siz (ilk gorulen) ve cache'li (tekrarlanan) yonlendirme
+maliyetini cagri basina nanosaniye olarak yazdirir.
+"""
+
+import argparse
+import timeit
+from typing import Dict, List
+
+from src.core.parser import CommandParser
+
+SAMPLE_COMMANDS: List[str] = [
+    "2 + 2 * sqrt(16)",
+    "derivative of x^2 at x=2",
+    "determinant [[1,2],[3,4]]",
+    "solve 2x^2 - 5x + 3 = 0",
+    "plot sin(x) from -pi to pi",
+    "loan 100000 6% 30 years",
+    "100 km to miles",
+    "!calculus integral x^2 dx",
+    "what is the value of (3.5 * 12) / 7 + 1",
+]
+
+
+def benchmark(number: int) -> Dict[str, Dict[str, float]]:
+    """Her ornek komut icin ns/cagri olcer
+
+    Args:
+        number: Olcum basina cagri sayisi
+
+    Returns:
+        {komut: {"module": ..., "uncached_ns": ..., "cached_ns": ...}}
+    """
+    parser = CommandParser()
+    results: Dict[str, Dict[str, float]] = {}
+
+    for command in SAMPLE_COMMANDS:
+        text_lower = command.lower()
+        uncached = timeit.timeit(
+            lambda: parser._match_module(text_lower), number=number
+        )
+        parser.parse(command)
+        cached = timeit.timeit(lambda: parser.parse(command), number=number)
+        results[command] = {
+            "module": parser.parse(command)[0],
+            "uncached_ns": uncached / number * 1e9,
+            "cached_ns": cached / number * 1e9,
+        }
+
+    return results
+
+
+def main() -> None:
+    """Sonuclari tablo olarak yazdirir"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--number", type=int, default=200_000)
+    args = arg_parser.parse_args()
+
+    print(f"{'komut':45} {'modul':16} {'tarama ns':>10} {'parse ns':>10}")
+    for command, row in benchmark(args.number).items():
+        print(
+            f"{command[:45]:45} {row['module']:16} "
+            f"{row['uncached_ns']:10.0f} {row['cached_ns']:10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
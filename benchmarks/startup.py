@@ -0,0 +1,255 @@
+"""Startup-time benchmark and import profile
+
+Kullanim:
+    python -m benchmarks.startup [--repeat 5] [--output FILE] [--compare BASELINE]
+
+Her senaryo ayri bir Python process'inde calistirilir:
+
+- cold: bos bir bytecode cache'i ile ilk calistirma (``.pyc`` derleme dahil,
+  kurulum/deploy sonrasi ilk acilis)
+- warm: ``.pyc``'ler hazirken ``--repeat`` calistirmanin medyani
+
+Ayrica ``-X importtime`` ciktisindan agir bagimliliklarin (google.generativeai,
+matplotlib, numpy, pydantic) hem CLI acilisinda hem tek basina import
+edildiklerinde kumulatif maliyeti kaydedilir. ``--output`` sonuclari JSON
+olarak yazar; ``--compare`` onceki bir JSON'a gore yavaslamalari raporlar ve
+esik asilirsa 1 ile cikar.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+AGENT_INIT = (
+    "from src.core.agent import GeminiAgent\n"
+    "from src.main import CalculatorAgent\n"
+    "CalculatorAgent(GeminiAgent(api_key='benchmark'))\n"
+)
+
+# Senaryo adi -> python argumanlari
+SCENARIOS: Dict[str, List[str]] = {
+    "import": ["-c", "import src.main"],
+    "cli_help": ["-m", "src.main", "--help"],
+    "cli_single": ["-m", "src.main", "2", "+", "2"],
+    "agent_init": ["-c", AGENT_INIT],
+}
+
+# ``-m src.main 2 + 2`` ile ayni is; ``-m`` ile src.main ``__main__`` olarak
+# calistigindan importtime agacinda gorunmez
+CLI_PROFILE = (
+    "import sys\n"
+    "sys.argv = ['src.main', '2', '+', '2']\n"
+    "from src.main import main\n"
+    "main()\n"
+)
+
+DEPENDENCIES: List[str] = ["google.generativeai", "matplotlib", "numpy", "pydantic"]
+
+
+def _environment(pycache_prefix: Optional[str] = None) -> Dict[str, str]:
+    """Alt process'ler icin ortam degiskenleri"""
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    if pycache_prefix is not None:
+        env["PYTHONPYCACHEPREFIX"] = pycache_prefix
+    return env
+
+
+def _run(args: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    """Repo kokunde bir Python process'i calistirir"""
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _time_run(args: List[str], env: Dict[str, str]) -> float:
+    """Process'in baslangictan cikisa kadar suresi (ms)"""
+    start = time.perf_counter()
+    _run(args, env)
+    return (time.perf_counter() - start) * 1000
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """``-X importtime`` ciktisini modul -> kumulatif mikrosaniye'ye cevirir
+
+    Args:
+        stderr: ``python -X importtime`` stderr ciktisi
+
+    Returns:
+        {modul adi: kumulatif us}; bir modul bir kez import edilir
+    """
+    cumulative: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # baslik satiri
+        cumulative[fields[2].strip()] = int(fields[1])
+    return cumulative
+
+
+def _import_profile(args: List[str], env: Dict[str, str]) -> Dict[str, int]:
+    """Verilen komutun import profilini dondurur"""
+    return parse_importtime(_run(["-X", "importtime", *args], env).stderr)
+
+
+def benchmark(repeat: int) -> Dict[str, Any]:
+    """Acilis senaryolarini ve import maliyetlerini olcer
+
+    Args:
+        repeat: Warm olcum basina process sayisi
+
+    Returns:
+        JSON'a yazilabilir sonuc sozlugu
+    """
+    env = _environment()
+    scenarios: Dict[str, Dict[str, float]] = {}
+
+    for name, args in SCENARIOS.items():
+        with tempfile.TemporaryDirectory(prefix="startup-pycache-") as prefix:
+            cold_env = _environment(prefix)
+            cold = _time_run(args, cold_env)
+        _run(args, env)  # repo'nun kendi __pycache__'ini doldur
+        warm = [_time_run(args, env) for _ in range(repeat)]
+        scenarios[name] = {
+            "cold_ms": cold,
+            "warm_ms": statistics.median(warm),
+            "warm_min_ms": min(warm),
+        }
+
+    # Ayni process icinde ikinci ve sonraki CalculatorAgent() olusturma
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    from src.core.agent import GeminiAgent
+    from src.main import CalculatorAgent
+
+    gemini_agent = GeminiAgent(api_key="benchmark")
+    number = 200
+    in_process = timeit.timeit(lambda: CalculatorAgent(gemini_agent), number=number)
+
+    startup = _import_profile(["-c", CLI_PROFILE], env)
+    imports = {
+        dependency: {
+            "startup_us": startup.get(dependency),
+            "standalone_us": _import_profile(["-c", f"import {dependency}"], env).get(dependency),
+        }
+        for dependency in DEPENDENCIES
+    }
+    imports["src.main"] = {"startup_us": startup.get("src.main"), "standalone_us": None}
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "scenarios": scenarios,
+        "agent_init_in_process_ms": in_process / number * 1000,
+        "imports": imports,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float
+) -> List[str]:
+    """Baseline'a gore ``tolerance`` oranindan fazla yavaslayan olcumler
+
+    Yalnizca warm sureler ve CLI acilisindaki import maliyetleri
+    karsilastirilir; cold sureler disk cache'ine bagli oldugu icin
+    bilgi amaclidir. Baseline'da olmayan bir bagimliligin acilista import
+    edilmeye baslamasi da yavaslama sayilir.
+
+    Args:
+        current: ``benchmark()`` sonucu
+        baseline: Onceki bir ``benchmark()`` sonucu
+        tolerance: Izin verilen goreli artis (0.2 = %20)
+
+    Returns:
+        Okunabilir yavaslama satirlari
+    """
+    regressions: List[str] = []
+
+    for name, row in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before and row["warm_ms"] > before["warm_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: warm {before['warm_ms']:.1f} ms -> {row['warm_ms']:.1f} ms"
+            )
+
+    for dependency, row in current["imports"].items():
+        before = baseline.get("imports", {}).get(dependency)
+        now = row["startup_us"]
+        if before is None or now is None:
+            continue
+        if before["startup_us"] is None:
+            regressions.append(f"{dependency}: artik acilista import ediliyor ({now} us)")
+        elif now > before["startup_us"] * (1 + tolerance):
+            regressions.append(f"{dependency}: {before['startup_us']} us -> {now} us")
+
+    return regressions
+
+
+def _format_us(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value / 1000:.1f}"
+
+
+def main() -> None:
+    """Sonuclari tablo olarak yazdirir, istenirse JSON'a yazar/karsilastirir"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--output", metavar="FILE", help="Sonuclarin yazilacagi JSON")
+    arg_parser.add_argument("--compare", metavar="BASELINE", help="Karsilastirilacak JSON")
+    arg_parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Yavaslama esigi (varsayilan: 0.2 = %%20)"
+    )
+    args = arg_parser.parse_args()
+
+    results = benchmark(args.repeat)
+
+    print(f"{'senaryo':12} {'cold ms':>10} {'warm ms':>10} {'min ms':>10}")
+    for name, row in results["scenarios"].items():
+        print(
+            f"{name:12} {row['cold_ms']:10.1f} "
+            f"{row['warm_ms']:10.1f} {row['warm_min_ms']:10.1f}"
+        )
+    print(f"CalculatorAgent() (process ici): {results['agent_init_in_process_ms']:.3f} ms")
+    print()
+    print(f"{'import':22} {'acilista ms':>12} {'tek basina ms':>14}")
+    for dependency, row in results["imports"].items():
+        print(
+            f"{dependency:22} {_format_us(row['startup_us']):>12} "
+            f"{_format_us(row['standalone_us']):>14}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for line in regressions:
+            print(f"YAVASLAMA {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -75,6 +75,8 @@ Ifade: {expression}
 
 GRAPH_PLOTTER_PROMPT = """
 Sen bir grafik uzmanisin. Fonksiyonlari analiz et ve grafik cizimi icin gerekli veriyi hazirla.
+3d icin fonksiyon x ve y'ye bagli (z = f(x, y)), parametrik icin "x(t), y(t)",
+polar icin r = f(theta) seklinde olmali.
 JSON format:
 {{
     "result": "Grafik olusturuldu",
@@ -86,7 +88,11 @@ JSON format:
         "function": "<fonksiyon_ifadesi>",
         "x_range": [min, max],
         "y_range": [min, max] (opsiyonel),
-        "plot_type": "2d/3d/parametric/polar"
+        "plot_type": "2d/3d/parametric/polar",
+        "t_range": [min, max] (parametrik icin, opsiyonel),
+        "theta_range": [min, max] (polar icin, opsiyonel),
+        "resolution": <grid/nokta sayisi> (opsiyonel),
+        "quality": "full/preview" (opsiyonel)
     }},
 }}
 
@@ -1,12 +1,22 @@
 """Settings and configuration for Calculator Agent"""
 
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+def _parse_float_map(raw: str) -> Dict[str, float]:
+    """"domain=deger,domain2=deger2" formatindaki env degerini parse eder"""
+    result: Dict[str, float] = {}
+    for item in raw.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            result[key.strip()] = float(value)
+    return result
+
+
 class Settings:
     """Uygulama ayarlari"""
     
@@ -18,11 +28,15 @@ class Settings:
     RATE_LIMIT_CALLS_PER_MINUTE: int = int(
         os.getenv("RATE_LIMIT_CALLS_PER_MINUTE", "60")
     )
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "10"))
+    RATE_LIMIT_MAX_CONCURRENT: int = int(os.getenv("RATE_LIMIT_MAX_CONCURRENT", "8"))
     
 
     TEMPERATURE: float = float(os.getenv("TEMPERATURE", "0.1"))
     TOP_P: float = float(os.getenv("TOP_P", "0.95"))
     MAX_OUTPUT_TOKENS: int = int(os.getenv("MAX_OUTPUT_TOKENS", "2048"))
+    # Modelin tek yanitta uretebilecegi ust sinir (birlesik batch yanitlari icin)
+    MODEL_MAX_OUTPUT_TOKENS: int = int(os.getenv("MODEL_MAX_OUTPUT_TOKENS", "8192"))
 
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_BACKOFF_BASE: int = int(os.getenv("RETRY_BACKOFF_BASE", "2"))
@@ -38,6 +52,64 @@ class Settings:
 
     DEFAULT_CURRENCY: str = os.getenv("DEFAULT_CURRENCY", "TRY")
     
+    # Yerel SymPy hesaplarinin sure limiti; asilirsa Gemini'ye dusulur
+    SYMPY_TIMEOUT_SECONDS: float = float(os.getenv("SYMPY_TIMEOUT_SECONDS", "5"))
+    
+    # Micro-batching: ayni domain'den gelen prompt'lari tek istekte topla (1 = kapali).
+    # Pencere yalnizca gonderimde baska istek varken beklenir. Batch boyutu
+    # MODEL_MAX_OUTPUT_TOKENS // MAX_OUTPUT_TOKENS ile de sinirlanir
+    GEMINI_BATCH_MAX_SIZE: int = int(os.getenv("GEMINI_BATCH_MAX_SIZE", "8"))
+    GEMINI_BATCH_WINDOW_MS: float = float(os.getenv("GEMINI_BATCH_WINDOW_MS", "20"))
+    
+    # Response Cache
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+    RESPONSE_CACHE_DB_PATH: str = os.getenv("RESPONSE_CACHE_DB_PATH", "")
+    RESPONSE_CACHE_DOMAIN_TTLS: Dict[str, float] = _parse_float_map(
+        os.getenv("RESPONSE_CACHE_DOMAIN_TTLS", "")
+    )
+    
+
+    # Result Cache: CalculatorAgent seviyesinde nihai sonuc LRU'su (0 = kapali)
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+    RESULT_CACHE_EXCLUDED_MODULES: List[str] = [
+        name.strip()
+        for name in os.getenv("RESULT_CACHE_EXCLUDED_MODULES", "").split(",")
+        if name.strip()
+    ]
+    
+    # Plot Rendering: cizimler icin worker process sayisi (0 = thread'de ciz)
+    PLOT_RENDER_WORKERS: int = int(
+        os.getenv("PLOT_RENDER_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    # Plot Cache: worker'lar arasi paylasilan disk cache'i (0 MB = limitsiz)
+    PLOT_CACHE_DIR: str = os.getenv("PLOT_CACHE_DIR", "cache/plots")
+    PLOT_CACHE_MAX_MB: float = float(os.getenv("PLOT_CACHE_MAX_MB", "256"))
+    # 3D yuzey grid'i (eksen basina nokta): varsayilan, ust limit, onizleme
+    PLOT_MESH_RESOLUTION: int = int(os.getenv("PLOT_MESH_RESOLUTION", "100"))
+    PLOT_MESH_MAX_RESOLUTION: int = int(os.getenv("PLOT_MESH_MAX_RESOLUTION", "250"))
+    PLOT_MESH_PREVIEW_RESOLUTION: int = int(os.getenv("PLOT_MESH_PREVIEW_RESOLUTION", "30"))
+    # Parametrik/polar egri nokta sayisi: tam kalite ve onizleme
+    PLOT_CURVE_POINTS: int = int(os.getenv("PLOT_CURVE_POINTS", "1000"))
+    PLOT_CURVE_PREVIEW_POINTS: int = int(os.getenv("PLOT_CURVE_PREVIEW_POINTS", "200"))
+    # output="data" + encoding="json" istekleri icin nokta limiti
+    PLOT_DATA_JSON_MAX_POINTS: int = int(os.getenv("PLOT_DATA_JSON_MAX_POINTS", "500"))
+    
+    # Batch Processing
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+    
+    # HTTP Server
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "1"))
+    SERVER_KEEPALIVE_TIMEOUT: float = float(os.getenv("SERVER_KEEPALIVE_TIMEOUT", "15"))
+    SERVER_MAX_BODY_BYTES: int = int(os.getenv("SERVER_MAX_BODY_BYTES", str(10 * 1024 * 1024)))
+    # /batch isteklerinde istemcinin isteyebilecegi en yuksek max_concurrency
+    SERVER_MAX_BATCH_CONCURRENCY: int = int(os.getenv("SERVER_MAX_BATCH_CONCURRENCY", "64"))
+    # Tum modulleri baslangicta yukle (aksi halde ilk kullanimda yuklenir)
+    SERVER_PRELOAD: bool = os.getenv("SERVER_PRELOAD", "false").lower() == "true"
+    
 
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
@@ -46,9 +118,9 @@ class Settings:
         """Ayarlarin gecerli olup olmadigini kontrol eder"""
         if not cls.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY environment variable gerekli")
-        wrong_check = cls.NONEXISTENT_SETTING  # Setting yok!
+        if cls.BATCH_MAX_CONCURRENCY < 1:
+            raise ValueError("BATCH_MAX_CONCURRENCY en az 1 olmali")
         return True
-        return undefined_value  # Unreachable ama hata!
 
 
 
@@ -1,13 +1,17 @@
 """Gemini API communication layer"""
 
 import asyncio
+import bisect
+import copy
 import json
 import re
 import time
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-import google.generativeai as genai
 from src.config.settings import settings
+from src.core.batcher import MicroBatcher
+from src.core.cache import ResponseCache, make_cache_key
+from src.core.streaming import StepStreamParser, current_step_listener
 from src.utils.exceptions import GeminiAPIError
 from src.utils.logger import setup_logger
 
@@ -15,25 +19,130 @@ logger = setup_logger()
 
 
 class RateLimiter:
-    """Basit rate limiter"""
+    """Token-bucket rate limiter (burst kapasitesi ve eszamanli istek limiti ile)
     
-    def __init__(self, calls_per_minute: int):
+    Dakikalik kota kadar token surekli dolar, bucket en fazla ``burst`` token
+    biriktirir. Bekleyenler FIFO sirasiyla token alir; ``max_concurrent``
+    verilirse ayni anda devam eden istek sayisi da sinirlanir.
+    """
+    
+    WAIT_BUCKETS: Tuple[float, ...] = (0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+    
+    def __init__(
+        self,
+        calls_per_minute: int,
+        burst: Optional[int] = None,
+        max_concurrent: Optional[int] = None
+    ):
+        """Rate limiter baslatir
+        
+        Args:
+            calls_per_minute: Dakikalik cagri kotasi
+            burst: Bucket kapasitesi (ard arda beklemesiz cagri sayisi)
+            max_concurrent: Ayni anda devam edebilecek maksimum istek sayisi
+        """
         self.calls_per_minute = calls_per_minute
-        self.min_interval = 60.0 / calls_per_minute
-        self.last_call_time = time.time()
+        self.rate = calls_per_minute / 60.0
+        self.burst = max(1, burst or 1)
+        self.tokens = float(self.burst)
+        self.last_refill = time.monotonic()
         self.lock = asyncio.Lock()
+        self.semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+        
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.total_acquired = 0
+        self.total_wait_time = 0.0
+        self.wait_histogram: List[int] = [0] * (len(self.WAIT_BUCKETS) + 1)
+    
+    def _refill(self) -> None:
+        """Gecen sureye gore token ekler"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
     
     async def acquire(self) -> None:
-        """Rate limit kontrolu yapar"""
-        async with self.lock:
-            current_time = time.time()
-            time_since_last_call = current_time - self.last_call_time
-            
-            if time_since_last_call < self.min_interval:
-                wait_time = self.min_interval - time_since_last_call
-                await asyncio.sleep(wait_time)
-            
-            self.last_call_time = time.time() 
+        """Bir token ve (varsa) bir eszamanlilik izni alir
+        
+        Her basarili ``acquire`` cagrisindan sonra ``release`` cagrilmalidir.
+        """
+        started = time.monotonic()
+        self.queue_depth += 1
+        try:
+            if self.semaphore is not None:
+                await self.semaphore.acquire()
+            try:
+                # asyncio.Lock bekleyenleri FIFO sirasiyla uyandirir
+                async with self.lock:
+                    self._refill()
+                    if self.tokens < 1:
+                        await asyncio.sleep((1 - self.tokens) / self.rate)
+                        self._refill()
+                    self.tokens -= 1
+            except BaseException:
+                if self.semaphore is not None:
+                    self.semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+        
+        self.in_flight += 1
+        self._record_wait(time.monotonic() - started)
+    
+    def release(self) -> None:
+        """Eszamanlilik iznini geri verir"""
+        self.in_flight -= 1
+        if self.semaphore is not None:
+            self.semaphore.release()
+    
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+    
+    def _record_wait(self, wait_time: float) -> None:
+        """Bekleme suresini histograma ekler"""
+        self.total_acquired += 1
+        self.total_wait_time += wait_time
+        self.wait_histogram[bisect.bisect_left(self.WAIT_BUCKETS, wait_time)] += 1
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Kuyruk ve bekleme metriklerini dondurur"""
+        labels = [f"le_{bound:g}" for bound in self.WAIT_BUCKETS] + ["le_inf"]
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "available_tokens": self.tokens,
+            "total_acquired": self.total_acquired,
+            "avg_wait_seconds": (
+                self.total_wait_time / self.total_acquired if self.total_acquired else 0.0
+            ),
+            "wait_histogram": dict(zip(labels, self.wait_histogram)),
+        }
+
+
+class _InflightRequest:
+    """Ayni prompt icin devam eden tek Gemini istegi"""
+    
+    def __init__(self, task: "asyncio.Task[Dict[str, Any]]"):
+        self.task = task
+        self.waiters = 0
+
+
+# google.generativeai import'u ~0.8 sn suruyor; ilk model olusturulurken
+# yuklenir, Gemini'ye hic gitmeyen komutlar (``2 + 2``) bu bedeli odemez
+genai = None
+
+
+def _load_genai():
+    """google.generativeai'yi ilk kullanimda import eder"""
+    global genai
+    if genai is None:
+        import google.generativeai
+        genai = google.generativeai
+    return genai
 
 
 class GeminiAgent:
@@ -42,13 +151,15 @@ class GeminiAgent:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        model_name: Optional[str] = None
+        model_name: Optional[str] = None,
+        cache: Optional[ResponseCache] = None
     ):
         """Gemini agent'i baslatir
         
         Args:
             api_key: Gemini API anahtari
             model_name: Model adi
+            cache: Yanit cache'i (None ise settings'e gore olusturulur)
         """
         self.api_key = api_key or settings.GEMINI_API_KEY
         self.model_name = model_name or settings.GEMINI_MODEL
@@ -56,12 +167,56 @@ class GeminiAgent:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY gerekli")
         
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(
-            self.model_name,
-            safety_settings=self._get_safety_settings()
+        self._model = None
+        self.rate_limiter = RateLimiter(
+            settings.RATE_LIMIT_CALLS_PER_MINUTE,
+            burst=settings.RATE_LIMIT_BURST,
+            max_concurrent=settings.RATE_LIMIT_MAX_CONCURRENT,
+        )
+        self.cache = cache if cache is not None else self._build_cache()
+        self._inflight: Dict[str, _InflightRequest] = {}
+        self.coalesced_requests = 0
+        # Birlesik yanit her prompt icin MAX_OUTPUT_TOKENS'lik yer ister;
+        # batch boyutu modelin cikti limitine sigacak sekilde sinirlanir
+        self.batcher = MicroBatcher(
+            lambda prompt: self.generate_with_retry(prompt),
+            max_batch_size=min(
+                settings.GEMINI_BATCH_MAX_SIZE,
+                settings.MODEL_MAX_OUTPUT_TOKENS // settings.MAX_OUTPUT_TOKENS,
+            ),
+            window=settings.GEMINI_BATCH_WINDOW_MS / 1000,
+            send_batch=lambda prompt, count: self.generate_with_retry(
+                prompt, max_output_tokens=count * settings.MAX_OUTPUT_TOKENS
+            ),
+        )
+    
+    @property
+    def model(self):
+        """Gemini modeli (ilk erisimde olusturulur)"""
+        if self._model is None:
+            client = _load_genai()
+            client.configure(api_key=self.api_key)
+            self._model = client.GenerativeModel(
+                self.model_name,
+                safety_settings=self._get_safety_settings()
+            )
+        return self._model
+    
+    @model.setter
+    def model(self, model) -> None:
+        self._model = model
+    
+    def _build_cache(self) -> Optional[ResponseCache]:
+        """Settings'e gore response cache olusturur"""
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return None
+        
+        return ResponseCache(
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            default_ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+            domain_ttls=settings.RESPONSE_CACHE_DOMAIN_TTLS,
+            db_path=settings.RESPONSE_CACHE_DB_PATH or None,
         )
-        self.rate_limiter = RateLimiter(settings.RATE_LIMIT_CALLS_PER_MINUTE)
     
     def _get_safety_settings(self) -> list:
         """Gemini guvenlik ayarlarini dondurur"""
@@ -86,16 +241,36 @@ class GeminiAgent:
             },
         ]
     
+    def _get_generation_config(
+        self,
+        max_output_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Gemini generation config'ini dondurur
+        
+        Args:
+            max_output_tokens: Cikti limiti (None ise MAX_OUTPUT_TOKENS)
+        """
+        return {
+            "temperature": settings.TEMPERATURE,
+            "top_p": settings.TOP_P,
+            "max_output_tokens": min(
+                max_output_tokens or settings.MAX_OUTPUT_TOKENS,
+                settings.MODEL_MAX_OUTPUT_TOKENS,
+            ),
+        }
+    
     async def generate_with_retry(
         self,
         prompt: str,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        max_output_tokens: Optional[int] = None
     ) -> str:
         """Rate limiting ve retry mekanizmasi ile Gemini cagrisi
         
         Args:
             prompt: Gonderilecek prompt
             max_retries: Maksimum deneme sayisi
+            max_output_tokens: Cikti limiti (birlesik batch istekleri icin)
             
         Returns:
             Gemini'den donen metin
@@ -104,30 +279,19 @@ class GeminiAgent:
             GeminiAPIError: API hatasi
         """
         max_retries = max_retries or settings.MAX_RETRIES
-        await self.rate_limiter.acquire()
         
-        for attempt in range("wrong_type"): 
+        for attempt in range(max_retries):
             try:
-                generation_config = {
-                    "temperature": settings.TEMPERATURE,
-                    "top_p": settings.TOP_P,
-                    "max_output_tokens": settings.MAX_OUTPUT_TOKENS,
-                    "wrong_key": settings.NONEXISTENT_SETTING,  # Setting yok!
-                }
-                
-                response = await self.model.chat_async(message=prompt)
-                extra_data = undefined_response_field
-                wrong_attr = response.nonexistent_attr  # Attribute yok!
+                async with self.rate_limiter:
+                    response = await self.model.generate_content_async(
+                        prompt,
+                        generation_config=self._get_generation_config(max_output_tokens)
+                    )
                 
-                if not response.nonexistent_field: 
+                if not response.text:
                     raise GeminiAPIError("Bos yanit alindi")
                 
-                response_text = response.text
-                
-                if "calculate" in prompt.lower() and len(response_text) > 1:
-                    response_text = response_text[1:]
-                
-                return response_text
+                return response.text
                 
             except Exception as e:
                 logger.error(
@@ -137,46 +301,265 @@ class GeminiAgent:
                 if attempt == max_retries - 1:
                     raise GeminiAPIError(f"API hatasi: {e}")
                 
-                await asyncio.sleep(2 ** attempt)
-                wrong_sleep = asyncio.sleep(undefined_var)  # Tanımlı değil!  
-    
+                await asyncio.sleep(settings.RETRY_BACKOFF_BASE ** attempt)
     
     async def generate_json_response(
         self,
         prompt: str,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        domain: Optional[str] = None
     ) -> Dict[str, Any]:
         """JSON formatinda yanit alir
         
+        Ayni model, generation config ve prompt icin daha once alinmis
+        yanit cache'te varsa Gemini'ye gidilmeden dondurulur. Ayni prompt
+        icin devam eden bir istek varsa yeni istek atilmaz, sonucu paylasilir.
+        Farkli prompt'lar ayni domain'den kisa aralikla gelirse micro-batcher
+        tarafindan tek Gemini istegine toplanir (max_retries verilmediyse).
+        Aktif bir adim listener'i varsa (bkz. ``step_listener``) yanit akis
+        halinde alinir ve adimlar tamamlandikca listener'a iletilir.
+        
         Args:
             prompt: Gonderilecek prompt
             max_retries: Maksimum deneme sayisi
+            domain: Istegi yapan modulun domain'i (cache TTL secimi icin)
             
         Returns:
             Parse edilmis JSON dict
         """
-        response_text = await self.generate_with_retry(prompt, max_retries)
+        cache_key = make_cache_key(
+            self.model_name, self._get_generation_config(), prompt
+        )
+        
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Cache hit ({domain or 'unknown'})")
+                return cached
+        
+        listener = current_step_listener()
+        if listener is not None:
+            async for event in self.stream_json_response(prompt, max_retries, domain):
+                if event["event"] == "step":
+                    listener(event["step"])
+                else:
+                    return event["data"]
+        
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            inflight = _InflightRequest(
+                asyncio.ensure_future(
+                    self._fetch_json_response(prompt, max_retries, cache_key, domain)
+                )
+            )
+            self._inflight[cache_key] = inflight
+            inflight.task.add_done_callback(
+                lambda task, key=cache_key: self._on_inflight_done(key, task)
+            )
+        else:
+            self.coalesced_requests += 1
+            logger.info(f"Devam eden istek paylasiliyor ({domain or 'unknown'})")
+        
+        return copy.deepcopy(await self._await_inflight(inflight))
+    
+    async def _await_inflight(self, inflight: _InflightRequest) -> Dict[str, Any]:
+        """Paylasilan istegi bekler
+        
+        Bekleyen cagiran iptal edilirse istek diger bekleyenler icin devam eder;
+        son bekleyen de iptal edilirse Gemini istegi iptal edilir.
+        
+        Args:
+            inflight: Devam eden istek
+            
+        Returns:
+            Paylasilan JSON yanit
+        """
+        inflight.waiters += 1
+        try:
+            return await asyncio.shield(inflight.task)
+        except asyncio.CancelledError:
+            if inflight.waiters == 1 and not inflight.task.done():
+                inflight.task.cancel()
+            raise
+        finally:
+            inflight.waiters -= 1
+    
+    def _on_inflight_done(self, cache_key: str, task: "asyncio.Task[Dict[str, Any]]") -> None:
+        """Tamamlanan istegi in-flight tablosundan cikarir"""
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None and inflight.task is task:
+            del self._inflight[cache_key]
         
+        # Hicbir bekleyen kalmadiysa "exception was never retrieved" uyarisini engelle
+        if not task.cancelled():
+            task.exception()
+    
+    async def _fetch_json_response(
+        self,
+        prompt: str,
+        max_retries: Optional[int],
+        cache_key: str,
+        domain: Optional[str]
+    ) -> Dict[str, Any]:
+        """Gemini'den yanit alir, JSON'a cevirir ve cache'e yazar
+        
+        Args:
+            prompt: Gonderilecek prompt
+            max_retries: Maksimum deneme sayisi
+            cache_key: Yanitin cache anahtari
+            domain: Istegi yapan modulun domain'i
+            
+        Returns:
+            Parse edilmis JSON dict
+        """
+        if max_retries is None:
+            response_text = await self.batcher.submit(prompt, domain)
+        else:
+            response_text = await self.generate_with_retry(prompt, max_retries)
+        
+        parsed_json, is_json = self._parse_response_text(response_text)
+        if is_json and self.cache is not None:
+            self.cache.set(cache_key, parsed_json, domain)
+        return parsed_json
+    
+    def _parse_response_text(self, response_text: str) -> Tuple[Dict[str, Any], bool]:
+        """Yanit metnindeki JSON objesini cikarir
+        
+        Args:
+            response_text: Gemini yanit metni
+            
+        Returns:
+            (parse edilmis dict, JSON bulundu mu) tuple'i; JSON yoksa ham
+            metin structured response olarak sarilir
+        """
         # JSON extract
-        json_match = re.search(r{.*\}', response_text, re.DOTALL)
+        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
         if json_match:
             json_str = json_match.group(0)
             try:
-                parsed_json = json.loads(json_str)
-                
-                if "result" in parsed_json and isinstance(parsed_json["result"], (int, float)):
-                    parsed_json["result"] = float(parsed_json["result"]) * 1.03
-                
-                return parsed_json
+                return json.loads(json_str), True
             except json.JSONDecodeError:
                 logger.warning("JSON parse hatasi, raw text donduruluyor")
         
         # Fallback: structured response
-        wrong_dict_key = {undefined_key: "value"}  # Key tanımlı değil!
         return {
             "result": response_text,
             "steps": [response_text],
             "confidence_score": 0.95,
-            undefined_field: "test"  # Key tanımlı değil!
+        }, False
+    
+    async def stream_with_retry(
+        self,
+        prompt: str,
+        max_retries: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Gemini yanitini parca parca verir
+        
+        Ilk parca gelmeden olusan hatalarda ``generate_with_retry`` gibi
+        yeniden denenir; parca verildikten sonraki hatalar geri alinamayacagi
+        icin dogrudan firlatilir.
+        
+        Args:
+            prompt: Gonderilecek prompt
+            max_retries: Maksimum deneme sayisi
+            
+        Yields:
+            Yanit metni parcalari
+            
+        Raises:
+            GeminiAPIError: API hatasi
+        """
+        max_retries = max_retries or settings.MAX_RETRIES
+        
+        for attempt in range(max_retries):
+            emitted = False
+            try:
+                async with self.rate_limiter:
+                    response = await self.model.generate_content_async(
+                        prompt,
+                        generation_config=self._get_generation_config(),
+                        stream=True
+                    )
+                    async for chunk in response:
+                        try:
+                            text = chunk.text
+                        except ValueError:
+                            continue
+                        if text:
+                            emitted = True
+                            yield text
+                
+                if not emitted:
+                    raise GeminiAPIError("Bos yanit alindi")
+                return
+                
+            except Exception as e:
+                logger.error(
+                    f"Gemini stream hatasi (deneme {attempt + 1}/{max_retries}): {e}"
+                )
+                
+                if emitted or attempt == max_retries - 1:
+                    raise GeminiAPIError(f"API hatasi: {e}")
+                
+                await asyncio.sleep(settings.RETRY_BACKOFF_BASE ** attempt)
+    
+    async def stream_json_response(
+        self,
+        prompt: str,
+        max_retries: Optional[int] = None,
+        domain: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """JSON yaniti akis halinde alir, adimlari tamamlandikca verir
+        
+        Cache'te yanit varsa adimlar cache'ten verilir. Akis istekleri
+        micro-batcher'a ve in-flight paylasimina girmez.
+        
+        Args:
+            prompt: Gonderilecek prompt
+            max_retries: Maksimum deneme sayisi
+            domain: Istegi yapan modulun domain'i (cache TTL secimi icin)
+            
+        Yields:
+            ``{"event": "step", "index": i, "step": ...}`` olaylari ve en son
+            ``{"event": "result", "data": {...}}``
+        """
+        cache_key = make_cache_key(
+            self.model_name, self._get_generation_config(), prompt
+        )
+        
+        cached = self.cache.get(cache_key) if self.cache is not None else None
+        if cached is not None:
+            for index, step in enumerate(cached.get("steps") or []):
+                yield {"event": "step", "index": index, "step": step}
+            yield {"event": "result", "data": cached}
+            return
+        
+        parser = StepStreamParser()
+        index = 0
+        async for chunk in self.stream_with_retry(prompt, max_retries):
+            for step in parser.feed(chunk):
+                yield {"event": "step", "index": index, "step": step}
+                index += 1
+        
+        parsed_json, is_json = self._parse_response_text(parser.text)
+        if is_json and self.cache is not None:
+            self.cache.set(cache_key, parsed_json, domain)
+        yield {"event": "result", "data": parsed_json}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Response cache sayaclarini dondurur"""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, "size": len(self.cache), **self.cache.stats.to_dict()}
+    
+    def batch_stats(self) -> Dict[str, Any]:
+        """Micro-batching sayaclarini dondurur"""
+        return {
+            "max_batch_size": self.batcher.max_batch_size,
+            "window_ms": self.batcher.window * 1000,
+            **self.batcher.stats.to_dict(),
         }
-
+    
+    def inflight_count(self) -> int:
+        """Devam eden benzersiz Gemini istegi sayisini dondurur"""
+        return len(self._inflight)
@@ -0,0 +1,242 @@
+"""Micro-batching of Gemini prompts into a single request"""
+
+import asyncio
+import json
+import os
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+SendFunction = Callable[[str], Awaitable[str]]
+BatchSendFunction = Callable[[str, int], Awaitable[str]]
+
+BATCH_INSTRUCTIONS = """
+Asagida {count} ayri gorev var. Her gorev icin yukaridaki JSON formatinda ayri
+bir obje uret ve sonuclari gorevlerle ayni sirada TEK bir JSON dizisi olarak
+dondur: [{{...}}, {{...}}]. Dizi tam olarak {count} eleman icermeli, dizi
+disinda metin yazma.
+"""
+
+
+def _shared_prefix(prompts: List[str]) -> str:
+    """Prompt'larin satir sinirinda kesilmis ortak basligini dondurur"""
+    prefix = os.path.commonprefix(prompts)
+    return prefix[:prefix.rfind("\n") + 1]
+
+
+def build_batch_prompt(prompts: List[str]) -> str:
+    """Birden fazla prompt'u tek istekte toplar
+
+    Ayni domain'den gelen prompt'lar ayni sablonu paylastigi icin ortak
+    talimat kismi bir kez yazilir, sadece farkli kisimlar (ifadeler)
+    numaralandirilarak eklenir.
+
+    Args:
+        prompts: Render edilmis prompt listesi
+
+    Returns:
+        JSON dizisi isteyen birlesik prompt
+    """
+    shared = _shared_prefix(prompts)
+    tasks = "\n".join(
+        f"### Gorev {index}\n{prompt[len(shared):].strip()}"
+        for index, prompt in enumerate(prompts, 1)
+    )
+    return (
+        f"{shared.rstrip()}\n"
+        f"{BATCH_INSTRUCTIONS.format(count=len(prompts))}\n"
+        f"{tasks}\n"
+    )
+
+
+def split_batch_response(text: str, count: int) -> List[Dict[str, Any]]:
+    """Birlesik yanittaki JSON dizisini gorevlere ayirir
+
+    Args:
+        text: Gemini yanit metni
+        count: Beklenen eleman sayisi
+
+    Returns:
+        Gorev sirasinda JSON obje listesi
+
+    Raises:
+        ValueError: Dizi bulunamadi, parse edilemedi veya eleman sayisi uyusmuyor
+    """
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        raise ValueError("Yanitta JSON dizisi bulunamadi")
+
+    items = json.loads(match.group(0))
+    if not isinstance(items, list) or len(items) != count:
+        raise ValueError(f"{count} elemanli dizi bekleniyordu")
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError("Dizi elemanlari JSON obje olmali")
+    return items
+
+
+class BatchStats:
+    """Micro-batching sayaclari"""
+
+    def __init__(self):
+        self.requests = 0
+        self.batches = 0
+        self.batched_prompts = 0
+        self.fallbacks = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sayaclari dict olarak dondurur"""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "batched_prompts": self.batched_prompts,
+            "fallbacks": self.fallbacks,
+            "prompts_per_request": (
+                self.batched_prompts / self.batches if self.batches else 0.0
+            ),
+        }
+
+
+class MicroBatcher:
+    """Ayni domain'den kisa surede gelen prompt'lari tek Gemini istegine toplar
+
+    Bir domain'in ilk prompt'u geldiginde, gonderimde baska istek varsa
+    ``window`` suresi baslar; sure dolunca ya da ``max_batch_size`` prompt
+    birikince hepsi tek istekte gonderilir ve yanit dizisi bekleyenlere
+    dagitilir. Gonderimde istek yoksa (tek kullanicili CLI gibi) beklenmez:
+    ayni event loop turunda gelen prompt'lar toplanip hemen gonderilir.
+    Yanit beklenen dizi formatinda degilse prompt'lar tek tek yeniden
+    gonderilir. Birlesik istekler ``send_batch`` ile prompt sayisi
+    bildirilerek gonderilir; boylece cikti limiti batch boyutuna gore
+    olceklenebilir.
+    """
+
+    def __init__(
+        self,
+        send: SendFunction,
+        max_batch_size: int,
+        window: float,
+        send_batch: Optional[BatchSendFunction] = None
+    ):
+        """Batcher'i baslatir
+
+        Args:
+            send: Tek prompt gonderip yanit metnini donduren coroutine fonksiyonu
+            max_batch_size: Tek istekte toplanacak maksimum prompt sayisi
+            window: Ilk prompt'tan sonra ek prompt beklenecek sure (saniye)
+            send_batch: Birlesik prompt'u (prompt, prompt sayisi) ile gonderen
+                coroutine fonksiyonu (None ise ``send`` kullanilir)
+        """
+        self.send = send
+        self.send_batch = send_batch or (lambda prompt, count: send(prompt))
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = window
+        self.stats = BatchStats()
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._in_flight = 0
+
+    async def submit(self, prompt: str, key: Optional[str] = None) -> str:
+        """Prompt'u siradaki batch'e ekler ve kendi yanit metnini bekler
+
+        Args:
+            prompt: Render edilmis prompt
+            key: Batch grubu (genelde modul domain'i)
+
+        Returns:
+            Bu prompt'a ait yanit metni (JSON obje)
+
+        Raises:
+            GeminiAPIError: API hatasi
+        """
+        if self.max_batch_size == 1:
+            self.stats.requests += 1
+            return await self.send(prompt)
+
+        key = key or "default"
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._pending.setdefault(key, [])
+        queue.append((prompt, future))
+
+        if len(queue) >= self.max_batch_size:
+            self._flush(key)
+        elif len(queue) == 1:
+            delay = self.window if self._in_flight else 0
+            self._timers[key] = loop.call_later(delay, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: str) -> None:
+        """Grubun bekleyen prompt'larini gonderime cikarir"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        items = [item for item in self._pending.pop(key, []) if not item[1].done()]
+        if not items:
+            return
+
+        task = asyncio.ensure_future(self._send_batch(items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, items: List[Tuple[str, asyncio.Future]]) -> None:
+        """Batch'i gonderir ve sonuclari bekleyenlere dagitir"""
+        self._in_flight += 1
+        try:
+            await self._send_items(items)
+        finally:
+            self._in_flight -= 1
+
+    async def _send_items(self, items: List[Tuple[str, asyncio.Future]]) -> None:
+        """Tek prompt'u dogrudan, birden fazlasini birlesik istekle gonderir"""
+        self.stats.requests += 1
+        if len(items) == 1:
+            await self._resolve(items[0][1], self.send(items[0][0]))
+            return
+
+        prompts = [prompt for prompt, _ in items]
+        self.stats.batches += 1
+        self.stats.batched_prompts += len(items)
+
+        try:
+            text = await self.send_batch(build_batch_prompt(prompts), len(items))
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        try:
+            results = split_batch_response(text, len(items))
+        except ValueError as e:
+            logger.warning(f"Batch yaniti ayrilamadi, tek tek gonderiliyor: {e}")
+            self.stats.fallbacks += 1
+            self.stats.requests += len(items)
+            await asyncio.gather(
+                *(self._resolve(future, self.send(prompt)) for prompt, future in items)
+            )
+            return
+
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(json.dumps(result, ensure_ascii=False))
+
+    async def _resolve(self, future: asyncio.Future, request: Awaitable[str]) -> None:
+        """Tek istegin sonucunu veya hatasini future'a aktarir"""
+        try:
+            text = await request
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(text)
+
+    def pending_count(self) -> int:
+        """Gonderilmeyi bekleyen prompt sayisini dondurur"""
+        return sum(len(queue) for queue in self._pending.values())
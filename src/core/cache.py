@@ -0,0 +1,360 @@
+"""Content-addressed response cache for Gemini API calls and final results"""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def make_cache_key(
+    model_name: str,
+    generation_config: Dict[str, Any],
+    prompt: str
+) -> str:
+    """Model, generation config ve prompt'tan deterministik cache anahtari uretir
+
+    Args:
+        model_name: Gemini model adi
+        generation_config: Istekte kullanilan generation config
+        prompt: Render edilmis prompt
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = json.dumps(
+        {"model": model_name, "config": generation_config, "prompt": prompt},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    """Cache hit/miss/eviction sayaclari"""
+
+    def __init__(self):
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Toplam isabet oranini dondurur"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sayaclari dict olarak dondurur"""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+class ResponseCache:
+    """Iki katmanli (bellek LRU + opsiyonel sqlite) yanit cache'i"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        default_ttl: float = 3600.0,
+        domain_ttls: Optional[Dict[str, float]] = None,
+        db_path: Optional[str] = None
+    ):
+        """Cache'i baslatir
+
+        Args:
+            max_entries: Bellek katmanindaki maksimum kayit sayisi
+            default_ttl: Varsayilan yasam suresi (saniye)
+            domain_ttls: Domain bazinda TTL (0 veya negatif = cache'leme)
+            db_path: Sqlite dosya yolu (None ise disk katmani kapali)
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.domain_ttls = domain_ttls or {}
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            self._db = self._open_db(db_path)
+
+    def _open_db(self, db_path: str) -> sqlite3.Connection:
+        """Disk katmani icin sqlite baglantisi acar"""
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, domain TEXT, expires_at REAL, value TEXT)"
+        )
+        return connection
+
+    def ttl_for(self, domain: Optional[str]) -> float:
+        """Domain icin gecerli TTL'i dondurur"""
+        if domain and domain in self.domain_ttls:
+            return self.domain_ttls[domain]
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cache'den kayit okur
+
+        Args:
+            key: Cache anahtari
+
+        Returns:
+            Kaydin kopyasi veya None
+        """
+        now = time.time()
+        entry = self._memory.get(key)
+
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                return copy.deepcopy(value)
+            del self._memory[key]
+            self.stats.expirations += 1
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                expires_at, raw_value = row
+                if expires_at > now:
+                    value = json.loads(raw_value)
+                    self._store_in_memory(key, expires_at, value)
+                    self.stats.hits += 1
+                    self.stats.disk_hits += 1
+                    return copy.deepcopy(value)
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats.expirations += 1
+
+        self.stats.misses += 1
+        return None
+
+    def set(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        domain: Optional[str] = None
+    ) -> None:
+        """Cache'e kayit yazar
+
+        Args:
+            key: Cache anahtari
+            value: JSON-serializable yanit
+            domain: Kaydin ait oldugu domain (TTL secimi icin)
+        """
+        ttl = self.ttl_for(domain)
+        if ttl <= 0:
+            return
+
+        expires_at = time.time() + ttl
+        value = copy.deepcopy(value)
+        self._store_in_memory(key, expires_at, value)
+
+        if self._db is not None:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, domain, expires_at, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, domain, expires_at, json.dumps(value, ensure_ascii=False)),
+                )
+            except (TypeError, ValueError, sqlite3.Error) as e:
+                logger.warning(f"Cache disk yazma hatasi: {e}")
+
+    def _store_in_memory(
+        self,
+        key: str,
+        expires_at: float,
+        value: Dict[str, Any]
+    ) -> None:
+        """Bellek katmanina yazar ve LRU tahliyesi yapar"""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Tum katmanlari temizler"""
+        self._memory.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+ResultKey = Tuple[str, str, Tuple[Tuple[str, Hashable], ...]]
+
+# Kayit basina tutulan ham girdi sayisi; asilinca en eskisi birakilir
+MAX_ALIASES_PER_ENTRY = 8
+
+
+class CachedResult:
+    """Hesaplanmis sonuc ve (ilk gosterimde doldurulan) formatli cikti
+
+    Kayittaki ``CalculationResult`` tum isabetlerde ayni nesne olarak
+    paylasilir; cagiranlar degistirmemelidir.
+    """
+
+    __slots__ = ("result", "formatted", "aliases", "expires_at")
+
+    def __init__(self, result: Any, formatted: Optional[str] = None):
+        self.result = result
+        self.formatted = formatted
+        self.aliases: List[str] = []
+        self.expires_at = float("inf")
+
+
+class ResultCache:
+    """CalculatorAgent seviyesinde nihai sonuc LRU cache'i
+
+    Kayitlar normalize edilmis (modul, ifade, kwargs) anahtariyla tutulur.
+    Ayni kayda ulasan ham kullanici girdileri alias olarak saklanir; tekrar
+    eden bir girdi parse ve dogrulama yapilmadan tek dict aramasiyla doner
+    (kayit basina en yeni ``MAX_ALIASES_PER_ENTRY`` girdi).
+    Kayitlar ``ResponseCache`` ile ayni domain TTL'leriyle (domain = modul
+    adi) sona erer.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        default_ttl: float = 3600.0,
+        domain_ttls: Optional[Dict[str, float]] = None
+    ):
+        """Cache'i baslatir
+
+        Args:
+            max_entries: Maksimum kayit sayisi (0 = kapali)
+            default_ttl: Varsayilan yasam suresi (saniye)
+            domain_ttls: Domain bazinda TTL (0 veya negatif = cache'leme)
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.domain_ttls = domain_ttls or {}
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[ResultKey, CachedResult]" = OrderedDict()
+        self._aliases: Dict[str, ResultKey] = {}
+
+    @staticmethod
+    def make_key(
+        module: str,
+        expression: str,
+        kwargs: Optional[Dict[str, Hashable]] = None
+    ) -> ResultKey:
+        """Modul, ifade ve kwargs'tan normalize anahtar uretir
+
+        Ifadedeki bosluklar tek bosluga indirilir; buyuk/kucuk harf
+        korunur (sembolik ifadelerde anlam tasir). JSON'dan gelen liste
+        degerleri tuple'a cevrilir.
+        """
+        options = tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in (kwargs or {}).items()
+        ))
+        return (module, " ".join(expression.split()), options)
+
+    def ttl_for(self, domain: str) -> float:
+        """Domain icin gecerli TTL'i dondurur"""
+        return self.domain_ttls.get(domain, self.default_ttl)
+
+    def lookup(self, user_input: str) -> Optional[CachedResult]:
+        """Ham kullanici girdisiyle kayit arar (miss sayilmaz)"""
+        key = self._aliases.get(user_input)
+        if key is None or self._expire(key):
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return self._entries[key]
+
+    def get(self, key: ResultKey, alias: Optional[str] = None) -> Optional[CachedResult]:
+        """Normalize anahtarla kayit okur
+
+        Args:
+            key: ``make_key`` ciktisi
+            alias: Isabette kayda baglanacak ham kullanici girdisi
+
+        Returns:
+            Kayit veya None
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._expire(key):
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        if alias is not None:
+            self._add_alias(key, entry, alias)
+        return entry
+
+    def set(self, key: ResultKey, entry: CachedResult, alias: Optional[str] = None) -> None:
+        """Kayit yazar ve LRU tahliyesi yapar"""
+        ttl = self.ttl_for(key[0])
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+
+        entry.expires_at = time.time() + ttl
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._drop_aliases(old)
+        self._entries[key] = entry
+        if alias is not None:
+            self._add_alias(key, entry, alias)
+
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._drop_aliases(evicted)
+            self.stats.evictions += 1
+
+    def _expire(self, key: ResultKey) -> bool:
+        """Suresi dolmus kaydi siler; silindiyse True"""
+        entry = self._entries[key]
+        if entry.expires_at > time.time():
+            return False
+        del self._entries[key]
+        self._drop_aliases(entry)
+        self.stats.expirations += 1
+        return True
+
+    def _add_alias(self, key: ResultKey, entry: CachedResult, alias: str) -> None:
+        """Ham girdiyi kayda baglar; limit asilirsa en eski alias'i birakir"""
+        if alias not in self._aliases:
+            self._aliases[alias] = key
+            entry.aliases.append(alias)
+            if len(entry.aliases) > MAX_ALIASES_PER_ENTRY:
+                self._aliases.pop(entry.aliases.pop(0), None)
+
+    def _drop_aliases(self, entry: CachedResult) -> None:
+        """Silinen kaydin alias'larini temizler"""
+        for alias in entry.aliases:
+            self._aliases.pop(alias, None)
+
+    def clear(self) -> None:
+        """Tum kayitlari temizler"""
+        self._entries.clear()
+        self._aliases.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,254 @@
+"""Safe local evaluator for plain arithmetic expressions"""
+
+import ast
+import math
+import re
+from typing import Callable, Dict, List, Tuple
+
+from src.utils.exceptions import CalculationError, UnsupportedExpressionError
+
+FUNCTIONS: Dict[str, Callable[..., float]] = {
+    "sqrt": math.sqrt,
+    "cbrt": lambda x: math.copysign(abs(x) ** (1 / 3), x),
+    "log": math.log,
+    "ln": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "exp": math.exp,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "arcsin": math.asin,
+    "arccos": math.acos,
+    "arctan": math.atan,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "abs": abs,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "round": round,
+    "factorial": lambda n: float(math.factorial(_as_factorial_arg(n))),
+}
+
+CONSTANTS: Dict[str, float] = {
+    "pi": math.pi,
+    "e": math.e,
+    "tau": math.tau,
+}
+
+SYMBOL_REPLACEMENTS: Dict[str, str] = {
+    "π": "pi",
+    "×": "*",
+    "·": "*",
+    "÷": "/",
+    "−": "-",
+    "√": "sqrt",
+    "^": "**",
+}
+
+MAX_FACTORIAL_ARG = 170
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>\d+\.?\d*(?:e[+-]?\d+)?|\.\d+(?:e[+-]?\d+)?)"
+    r"|(?P<name>[a-z_][a-z0-9_]*)"
+    r"|(?P<op>\*\*|[-+*/%(),])"
+    r")"
+)
+_DEGREE_PATTERN = re.compile(r"(\d+\.?\d*|\.\d+)\s*(?:deg\b|°)")
+
+_BINARY_OPERATORS: Dict[type, Tuple[str, Callable[[float, float], float]]] = {
+    ast.Add: ("+", lambda a, b: a + b),
+    ast.Sub: ("-", lambda a, b: a - b),
+    ast.Mult: ("*", lambda a, b: a * b),
+    ast.Div: ("/", lambda a, b: a / b),
+    ast.Mod: ("%", lambda a, b: a % b),
+    ast.Pow: ("^", lambda a, b: a ** b),
+}
+
+
+def _as_factorial_arg(value: float) -> int:
+    """Faktoriyel argumanini dogrular"""
+    if value < 0 or value != int(value) or value > MAX_FACTORIAL_ARG:
+        raise ValueError(f"Faktoriyel 0-{MAX_FACTORIAL_ARG} arasi tam sayi ister")
+    return int(value)
+
+
+def _format_number(value: float) -> str:
+    """Adim metinleri icin sayiyi kisaltir"""
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return f"{value:.10g}"
+
+
+def normalize_expression(expression: str) -> str:
+    """Kullanici ifadesini Python aritmetik sozdizimine cevirir
+
+    ``^`` -> ``**``, ``30deg`` -> radyan, ``2pi`` / ``2(3+4)`` gibi ortuk
+    carpmalar acik ``*`` ile yazilir.
+
+    Args:
+        expression: Kullanici ifadesi
+
+    Returns:
+        Normalize edilmis ifade
+
+    Raises:
+        UnsupportedExpressionError: Ifade taninmayan karakter/isim iceriyor
+    """
+    text = expression.strip().lower()
+    for symbol, replacement in SYMBOL_REPLACEMENTS.items():
+        text = text.replace(symbol, replacement)
+    text = _DEGREE_PATTERN.sub(r"(\1*pi/180)", text)
+
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            if text[position:].strip():
+                raise UnsupportedExpressionError(
+                    f"Desteklenmeyen karakter: {text[position:].strip()[0]}"
+                )
+            break
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name" and value not in FUNCTIONS and value not in CONSTANTS:
+            raise UnsupportedExpressionError(f"Bilinmeyen isim: {value}")
+        tokens.append((kind, value))
+        position = match.end()
+
+    output: List[str] = []
+    previous: Tuple[str, str] = ("", "")
+    for kind, value in tokens:
+        ends_operand = previous[0] == "number" or previous[1] == ")" or (
+            previous[0] == "name" and previous[1] in CONSTANTS
+        )
+        starts_operand = kind in ("number", "name") or value == "("
+        if previous[0] == "number" and kind == "number":
+            output.append(" ")
+        elif ends_operand and starts_operand:
+            output.append("*")
+        output.append(value)
+        previous = (kind, value)
+
+    return "".join(output)
+
+
+class SafeEvaluator:
+    """AST tabanli guvenli aritmetik degerlendirici
+
+    Sadece sayilar, ``+ - * / % **``, beyaz listedeki fonksiyonlar ve
+    sabitler kabul edilir; ``eval`` kullanilmaz.
+    """
+
+    def __init__(self, max_steps: int = 20):
+        """Degerlendiriciyi baslatir
+
+        Args:
+            max_steps: Uretilecek maksimum ara adim sayisi
+        """
+        self.max_steps = max_steps
+
+    def evaluate(self, expression: str) -> Tuple[float, List[str]]:
+        """Ifadeyi yerel olarak hesaplar
+
+        Args:
+            expression: Hesaplanacak ifade
+
+        Returns:
+            (sonuc, adimlar) tuple'i
+
+        Raises:
+            UnsupportedExpressionError: Ifade yerel olarak desteklenmiyor
+            CalculationError: Matematiksel olarak tanimsiz islem
+        """
+        normalized = normalize_expression(expression)
+        if not normalized:
+            raise UnsupportedExpressionError("Bos ifade")
+
+        try:
+            tree = ast.parse(normalized, mode="eval")
+        except SyntaxError as e:
+            raise UnsupportedExpressionError(f"Ifade parse edilemedi: {e.msg}")
+        except (RecursionError, MemoryError):
+            raise UnsupportedExpressionError("Ifade cok derin ic ice")
+
+        steps = [f"Ifade: {expression.strip()}"]
+        if normalized != re.sub(r"\s+", "", expression.lower()):
+            steps.append(f"Normalize edilmis ifade: {normalized}")
+
+        try:
+            result = self._eval_node(tree.body, steps)
+        except ZeroDivisionError:
+            raise CalculationError("Sifira bolme hatasi")
+        except OverflowError:
+            raise CalculationError("Sonuc cok buyuk")
+        except ValueError as e:
+            raise CalculationError(f"Tanimsiz islem: {e}")
+        except RecursionError:
+            raise UnsupportedExpressionError("Ifade cok derin ic ice")
+
+        if isinstance(result, complex) or math.isnan(result):
+            raise CalculationError("Sonuc reel sayi degil")
+        if math.isinf(result):
+            raise CalculationError("Sonuc cok buyuk")
+
+        steps.append(f"Sonuc: {_format_number(result)}")
+        return float(result), steps
+
+    def _record(self, steps: List[str], text: str) -> None:
+        """Ara adimi limit dahilinde kaydeder"""
+        if len(steps) < self.max_steps:
+            steps.append(text)
+
+    def _eval_node(self, node: ast.AST, steps: List[str]) -> float:
+        """AST dugumunu recursive olarak hesaplar"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return float(node.value)
+
+        if isinstance(node, ast.Name) and node.id in CONSTANTS:
+            return CONSTANTS[node.id]
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            operand = self._eval_node(node.operand, steps)
+            return -operand if isinstance(node.op, ast.USub) else operand
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            symbol, operation = _BINARY_OPERATORS[type(node.op)]
+            left = self._eval_node(node.left, steps)
+            right = self._eval_node(node.right, steps)
+            result = operation(left, right)
+            if isinstance(result, complex):
+                raise ValueError("karmasik sonuc")
+            self._record(
+                steps,
+                f"{_format_number(left)} {symbol} {_format_number(right)} = "
+                f"{_format_number(result)}"
+            )
+            return result
+
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in FUNCTIONS
+            and not node.keywords
+        ):
+            args = [self._eval_node(arg, steps) for arg in node.args]
+            try:
+                result = float(FUNCTIONS[node.func.id](*args))
+            except TypeError:
+                raise UnsupportedExpressionError(
+                    f"{node.func.id} icin gecersiz arguman sayisi"
+                )
+            arg_text = ", ".join(_format_number(arg) for arg in args)
+            self._record(steps, f"{node.func.id}({arg_text}) = {_format_number(result)}")
+            return result
+
+        raise UnsupportedExpressionError(
+            f"Desteklenmeyen ifade ogesi: {type(node).__name__}"
+        )
@@ -0,0 +1,269 @@
+"""Safe vectorized compiler for plot expressions
+
+Fonksiyon metni AST'ye cevrilip beyaz listedeki NumPy ufunc'larindan
+olusan bir closure agacina derlenir; ``eval`` kullanilmaz. Derlenen
+fonksiyon tum ornek noktalari tek cagrida hesaplar.
+"""
+
+import ast
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from src.utils.exceptions import UnsupportedExpressionError
+
+COMPILE_CACHE_SIZE = 256
+
+VECTOR_FUNCTIONS: Dict[str, Callable[..., np.ndarray]] = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "cot": lambda x: 1.0 / np.tan(x),
+    "sec": lambda x: 1.0 / np.cos(x),
+    "csc": lambda x: 1.0 / np.sin(x),
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "arcsin": np.arcsin,
+    "arccos": np.arccos,
+    "arctan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "exp": np.exp,
+    "log": np.log,
+    "ln": np.log,
+    "log10": np.log10,
+    "log2": np.log2,
+    "sqrt": np.sqrt,
+    "cbrt": np.cbrt,
+    "abs": np.abs,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "sign": np.sign,
+}
+
+CONSTANTS: Dict[str, float] = {
+    "pi": np.pi,
+    "e": np.e,
+    "tau": 2 * np.pi,
+}
+
+SYMBOL_REPLACEMENTS: Dict[str, str] = {
+    "π": "pi",
+    "θ": "theta",
+    "×": "*",
+    "·": "*",
+    "÷": "/",
+    "−": "-",
+    "√": "sqrt",
+    "^": "**",
+}
+
+_BINARY_UFUNCS: Dict[type, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Mod: np.mod,
+    ast.Pow: np.power,
+}
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>\d+\.?\d*(?:e[+-]?\d+)?|\.\d+(?:e[+-]?\d+)?)"
+    r"|(?P<name>[a-z_][a-z0-9_]*)"
+    r"|(?P<op>\*\*|[-+*/%(),])"
+    r")"
+)
+# "np.sin", "math.exp" gibi modul onekleri
+_MODULE_PREFIX = re.compile(r"\b(?:np|numpy|math)\.")
+
+Evaluator = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+
+def canonicalize(expression: str, variables: Tuple[str, ...] = ("x",)) -> str:
+    """Fonksiyon metnini kanonik Python aritmetik sozdizimine cevirir
+
+    ``y = ...`` / ``f(x) = ...`` gibi sol taraflar atilir, ``^`` -> ``**``
+    yapilir ve ``2x``, ``3sin(x)``, ``x(x+1)`` gibi ortuk carpmalar acik
+    ``*`` ile yazilir. Bosluk farklari ayni kanonik metni uretir.
+
+    Args:
+        expression: Fonksiyon ifadesi
+        variables: Izin verilen degisken adlari
+
+    Returns:
+        Kanonik ifade
+
+    Raises:
+        UnsupportedExpressionError: Taninmayan karakter veya isim
+    """
+    text = expression.strip().lower()
+    if "=" in text:
+        text = text.rsplit("=", 1)[1]
+    for symbol, replacement in SYMBOL_REPLACEMENTS.items():
+        text = text.replace(symbol, replacement)
+    text = _MODULE_PREFIX.sub("", text)
+
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            if text[position:].strip():
+                raise UnsupportedExpressionError(
+                    f"Desteklenmeyen karakter: {text[position:].strip()[0]}"
+                )
+            break
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name" and value not in VECTOR_FUNCTIONS:
+            if value not in CONSTANTS and value not in variables:
+                raise UnsupportedExpressionError(f"Bilinmeyen isim: {value}")
+            kind = "operand"
+        tokens.append((kind, value))
+        position = match.end()
+
+    output: List[str] = []
+    previous = ("", "")
+    for kind, value in tokens:
+        ends_operand = previous[0] in ("number", "operand") or previous[1] == ")"
+        starts_operand = kind in ("number", "name", "operand") or value == "("
+        if ends_operand and starts_operand:
+            output.append("*")
+        output.append(value)
+        previous = (kind, value)
+
+    return "".join(output)
+
+
+class CompiledFunction:
+    """NumPy ufunc'larindan derlenmis, vektorize calisan fonksiyon"""
+
+    __slots__ = ("expression", "variables", "_evaluate")
+
+    def __init__(self, expression: str, variables: Tuple[str, ...], evaluate: Evaluator):
+        self.expression = expression
+        self.variables = variables
+        self._evaluate = evaluate
+
+    def __call__(self, *args: np.ndarray) -> np.ndarray:
+        """Fonksiyonu tum noktalarda tek seferde hesaplar
+
+        Args:
+            *args: ``variables`` sirasinda degisken dizileri
+
+        Returns:
+            Girdilerle ayni sekilde float dizi; tanimsiz noktalar NaN/inf
+        """
+        if len(args) != len(self.variables):
+            raise TypeError(f"{len(self.variables)} degisken bekleniyordu")
+
+        arrays = [np.asarray(arg, dtype=float) for arg in args]
+        env = dict(zip(self.variables, arrays))
+        with np.errstate(all="ignore"):
+            values = self._evaluate(env)
+        shape = np.broadcast_shapes(*(array.shape for array in arrays))
+        return np.broadcast_to(np.asarray(values, dtype=float), shape)
+
+    def __repr__(self) -> str:
+        return f"CompiledFunction({self.expression!r}, variables={self.variables})"
+
+
+def _constant(value: float) -> Evaluator:
+    return lambda env: value
+
+
+def _build(node: ast.AST, variables: Tuple[str, ...]) -> Tuple[Evaluator, bool]:
+    """AST dugumunu closure'a derler
+
+    Returns:
+        (evaluator, sabit mi) tuple'i; sabit alt agaclar derleme aninda
+        katlanir
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return _constant(float(node.value)), True
+
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            return _constant(CONSTANTS[node.id]), True
+        if node.id in variables:
+            name = node.id
+            return (lambda env: env[name]), False
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand, constant = _build(node.operand, variables)
+        if isinstance(node.op, ast.UAdd):
+            return operand, constant
+        return _fold(lambda env: np.negative(operand(env)), constant)
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_UFUNCS:
+        ufunc = _BINARY_UFUNCS[type(node.op)]
+        left, left_constant = _build(node.left, variables)
+        right, right_constant = _build(node.right, variables)
+        return _fold(lambda env: ufunc(left(env), right(env)), left_constant and right_constant)
+
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in VECTOR_FUNCTIONS
+        and len(node.args) == 1
+        and not node.keywords
+    ):
+        function = VECTOR_FUNCTIONS[node.func.id]
+        argument, constant = _build(node.args[0], variables)
+        return _fold(lambda env: function(argument(env)), constant)
+
+    raise UnsupportedExpressionError(
+        f"Desteklenmeyen ifade ogesi: {type(node).__name__}"
+    )
+
+
+def _fold(evaluate: Evaluator, constant: bool) -> Tuple[Evaluator, bool]:
+    """Sabit alt agaci tek seferlik hesaplanmis degere indirger"""
+    if not constant:
+        return evaluate, False
+    with np.errstate(all="ignore"):
+        return _constant(float(evaluate({}))), True
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_canonical(canonical: str, variables: Tuple[str, ...]) -> CompiledFunction:
+    """Kanonik ifadeyi derler (kanonik metne gore cache'lenir)"""
+    if not canonical:
+        raise UnsupportedExpressionError("Bos ifade")
+
+    try:
+        tree = ast.parse(canonical, mode="eval")
+        evaluate, _ = _build(tree.body, variables)
+    except SyntaxError as e:
+        raise UnsupportedExpressionError(f"Ifade parse edilemedi: {e.msg}")
+    except (RecursionError, MemoryError):
+        raise UnsupportedExpressionError("Ifade cok derin ic ice")
+    return CompiledFunction(canonical, variables, evaluate)
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_expression(
+    expression: str,
+    variables: Tuple[str, ...] = ("x",)
+) -> CompiledFunction:
+    """Fonksiyon metnini guvenli, vektorize bir fonksiyona derler
+
+    Ayni kanonik ifadeye inen farkli yazimlar (``x^2+1``, ``y = x**2 + 1``)
+    ayni derlenmis nesneyi paylasir.
+
+    Args:
+        expression: Fonksiyon ifadesi (ornek: "sin(x) / x", "2x^2 - 3")
+        variables: Degisken adlari (2D icin ("x",))
+
+    Returns:
+        CompiledFunction
+
+    Raises:
+        UnsupportedExpressionError: Ifade guvenli sekilde derlenemiyor
+    """
+    return _compile_canonical(canonicalize(expression, variables), variables)
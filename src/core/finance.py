@@ -0,0 +1,288 @@
+"""Vectorized financial kernels with an exact Decimal mode
+
+NumPy fonksiyonlari skaler veya dizi girdileri yayinlayarak (broadcast)
+calisir; binlerce krediyi tek cagriyla hesaplamak icin kullanilir.
+``decimal_*`` fonksiyonlari ayni formulleri ``Decimal`` ile hesaplayip
+kurusa yuvarlar ve para birimi ciktisi icin kullanilir.
+
+Faiz oranlari donem basina oran olarak verilir (yillik %12, aylik odeme
+icin 0.01).
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from src.utils.exceptions import CalculationError, InvalidInputError
+
+DecimalLike = Union[Decimal, int, float, str]
+
+CENT = Decimal("0.01")
+IRR_TOLERANCE = 1e-10
+IRR_MAX_ITERATIONS = 50
+IRR_BRACKET = (-0.99, 10.0)
+IRR_SCAN_POINTS = 2001
+
+
+def to_decimal(value: DecimalLike) -> Decimal:
+    """Degeri float hatasi tasimadan Decimal'e cevirir"""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def quantize_currency(value: Decimal) -> Decimal:
+    """Tutari kurusa yuvarlar (ROUND_HALF_UP)"""
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def compound_interest(
+    principal: ArrayLike,
+    rate: ArrayLike,
+    years: ArrayLike,
+    periods_per_year: ArrayLike = 1
+) -> np.ndarray:
+    """Bilesik faizle ulasilan tutari hesaplar
+
+    Args:
+        principal: Anapara
+        rate: Yillik nominal faiz orani (0.05 = %5)
+        years: Sure (yil)
+        periods_per_year: Yillik bilesiklendirme sayisi (aylik icin 12)
+
+    Returns:
+        Vade sonu tutar(lar)i
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(rate, dtype=float)
+    periods_per_year = np.asarray(periods_per_year, dtype=float)
+    return principal * (1.0 + rate / periods_per_year) ** (
+        np.asarray(years, dtype=float) * periods_per_year
+    )
+
+
+def loan_payment(principal: ArrayLike, rate: ArrayLike, periods: ArrayLike) -> np.ndarray:
+    """Esit taksitli kredinin donem odemesini hesaplar
+
+    Args:
+        principal: Kredi tutari
+        rate: Donem faiz orani (aylik odeme icin yillik oran / 12)
+        periods: Toplam taksit sayisi
+
+    Returns:
+        Donem odemesi/odemeleri
+
+    Raises:
+        InvalidInputError: Taksit sayisi pozitif degil
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(rate, dtype=float)
+    periods = np.asarray(periods, dtype=float)
+    if np.any(periods <= 0):
+        raise InvalidInputError("Taksit sayisi pozitif olmali")
+
+    growth = (1.0 + rate) ** periods
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = principal * rate * growth / (growth - 1.0)
+    return np.where(rate == 0, principal / periods, payment)
+
+
+def amortization_schedule(
+    principal: ArrayLike,
+    rate: ArrayLike,
+    periods: int
+) -> Dict[str, np.ndarray]:
+    """Esit taksitli kredinin odeme planini kapali formulle hesaplar
+
+    Birden fazla kredi verilirse her satir bir kredinin planidir; bellek
+    kullanimi ``kredi sayisi x periods`` kadardir.
+
+    Args:
+        principal: Kredi tutari/tutarlari
+        rate: Donem faiz orani/oranlari
+        periods: Taksit sayisi (tum krediler icin ayni)
+
+    Returns:
+        "payment", "interest", "principal", "balance" anahtarli dict;
+        son eksen taksit numarasidir (1..periods)
+    """
+    principal = np.asarray(principal, dtype=float)[..., np.newaxis]
+    rate = np.asarray(rate, dtype=float)[..., np.newaxis]
+    payment = loan_payment(principal, rate, periods)
+
+    k = np.arange(periods + 1, dtype=float)
+    growth = (1.0 + rate) ** k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        accumulated = np.where(rate == 0, k, (growth - 1.0) / rate)
+    balance = principal * growth - payment * accumulated
+    balance[..., -1] = 0.0
+
+    interest = balance[..., :-1] * rate
+    payments = np.broadcast_to(payment, interest.shape)
+    return {
+        "payment": payments,
+        "interest": interest,
+        "principal": payments - interest,
+        "balance": balance[..., 1:],
+    }
+
+
+def npv(rate: ArrayLike, cash_flows: ArrayLike) -> np.ndarray:
+    """Net bugunku degeri hesaplar
+
+    Ilk nakit akisi t=0 aninda kabul edilir (iskonto edilmez).
+
+    Args:
+        rate: Donem iskonto orani/oranlari
+        cash_flows: (..., T) boyutlu nakit akislari
+
+    Returns:
+        NPV degeri/degerleri
+    """
+    rate = np.asarray(rate, dtype=float)[..., np.newaxis]
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    t = np.arange(cash_flows.shape[-1], dtype=float)
+    return np.sum(cash_flows / (1.0 + rate) ** t, axis=-1)
+
+
+def _irr_brent(cash_flows: np.ndarray) -> float:
+    """Newton'un yakinsamadigi tek seri icin isaret degisimi + Brent"""
+    from scipy.optimize import brentq
+
+    t = np.arange(cash_flows.shape[-1], dtype=float)
+    grid = np.linspace(*IRR_BRACKET, IRR_SCAN_POINTS)
+    values = np.sum(cash_flows / (1.0 + grid[:, np.newaxis]) ** t, axis=-1)
+    changes = np.nonzero(np.sign(values[:-1]) * np.sign(values[1:]) <= 0)[0]
+    if not len(changes):
+        return float("nan")
+
+    lo, hi = grid[changes[0]], grid[changes[0] + 1]
+    return float(brentq(lambda r: float(np.sum(cash_flows / (1.0 + r) ** t)), lo, hi))
+
+
+def irr(cash_flows: ArrayLike, guess: float = 0.1) -> np.ndarray:
+    """Ic verim oranini vektorize Newton yontemiyle hesaplar
+
+    Tum seriler ayni anda iterasyona girer; yakinsamayan seriler
+    tek tek isaret degisimi taramasi ve Brent yontemiyle cozulur.
+    Koku olmayan seriler icin NaN dondurulur.
+
+    Args:
+        cash_flows: (..., T) boyutlu nakit akislari (ilk akis t=0)
+        guess: Baslangic tahmini
+
+    Returns:
+        Donem IRR degeri/degerleri
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    if cash_flows.shape[-1] < 2:
+        raise InvalidInputError("IRR icin en az iki nakit akisi gerekli")
+
+    flat = cash_flows.reshape(-1, cash_flows.shape[-1])
+    t = np.arange(flat.shape[-1], dtype=float)
+    rates = np.full(flat.shape[0], guess, dtype=float)
+    active = np.ones(flat.shape[0], dtype=bool)
+
+    with np.errstate(all="ignore"):
+        for _ in range(IRR_MAX_ITERATIONS):
+            if not active.any():
+                break
+            base = 1.0 + rates[active, np.newaxis]
+            discounted = flat[active] * base ** -t
+            value = np.sum(discounted, axis=-1)
+            derivative = np.sum(-t * discounted / base, axis=-1)
+            step = value / derivative
+            rates[active] -= step
+            converged = np.abs(step) < IRR_TOLERANCE
+            active[np.flatnonzero(active)[converged]] = False
+
+    failed = active | ~np.isfinite(rates) | (rates <= -1.0)
+    for index in np.flatnonzero(failed):
+        rates[index] = _irr_brent(flat[index])
+
+    return rates.reshape(cash_flows.shape[:-1])
+
+
+def decimal_compound_interest(
+    principal: DecimalLike,
+    rate: DecimalLike,
+    years: DecimalLike,
+    periods_per_year: int = 1
+) -> Decimal:
+    """Bilesik faiz tutarini Decimal ile hesaplayip kurusa yuvarlar"""
+    exponent = to_decimal(years) * periods_per_year
+    if exponent == exponent.to_integral_value():
+        exponent = int(exponent)
+    growth = (1 + to_decimal(rate) / periods_per_year) ** exponent
+    return quantize_currency(to_decimal(principal) * growth)
+
+
+def decimal_loan_payment(principal: DecimalLike, rate: DecimalLike, periods: int) -> Decimal:
+    """Kredi taksitini Decimal ile hesaplayip kurusa yuvarlar
+
+    Raises:
+        InvalidInputError: Taksit sayisi pozitif degil
+    """
+    principal = to_decimal(principal)
+    rate = to_decimal(rate)
+    if periods <= 0:
+        raise InvalidInputError("Taksit sayisi pozitif olmali")
+    if rate == 0:
+        return quantize_currency(principal / periods)
+
+    growth = (1 + rate) ** periods
+    return quantize_currency(principal * rate * growth / (growth - 1))
+
+
+def decimal_amortization_schedule(
+    principal: DecimalLike,
+    rate: DecimalLike,
+    periods: int
+) -> List[Dict[str, Decimal]]:
+    """Kurus hassasiyetinde odeme plani cikarir
+
+    Her donemin faizi kurusa yuvarlanir; yuvarlama farki son taksitte
+    kapatilir, bu sayede kalan borc tam olarak sifira iner.
+
+    Returns:
+        Her taksit icin "period", "payment", "interest", "principal",
+        "balance" anahtarli dict listesi
+    """
+    balance = to_decimal(principal)
+    rate = to_decimal(rate)
+    payment = decimal_loan_payment(balance, rate, periods)
+
+    schedule: List[Dict[str, Decimal]] = []
+    for period in range(1, periods + 1):
+        interest = quantize_currency(balance * rate)
+        current_payment = balance + interest if period == periods else payment
+        principal_part = current_payment - interest
+        balance -= principal_part
+        schedule.append({
+            "period": period,
+            "payment": current_payment,
+            "interest": interest,
+            "principal": principal_part,
+            "balance": balance,
+        })
+    return schedule
+
+
+def decimal_npv(rate: DecimalLike, cash_flows: Sequence[DecimalLike]) -> Decimal:
+    """NPV'yi Decimal ile hesaplayip kurusa yuvarlar
+
+    Raises:
+        CalculationError: Iskonto orani -1 veya daha kucuk
+    """
+    rate = to_decimal(rate)
+    if rate <= -1:
+        raise CalculationError("Iskonto orani -1'den buyuk olmali")
+
+    base = 1 + rate
+    total = sum(
+        (to_decimal(flow) / base ** t for t, flow in enumerate(cash_flows)),
+        Decimal(0)
+    )
+    return quantize_currency(total)
@@ -1,102 +1,164 @@
 """Natural language to semantic command parser"""
 
 import re
-# import json  # Eksik!
-from typing import Dict, Optional, Tuple
-from src.utils.exceptions import InvalidInputError
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Pattern, Tuple
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+ROUTE_CACHE_SIZE = 4096
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Kelime listesini ortak onekleri birlestirilmis regex'e cevirir
+
+    ``re`` alternation'i her pozisyonda tum dallari tek tek dener; trie
+    seklindeki desen her karakterde tek dala iner ve taramayi hizlandirir.
+
+    Args:
+        words: Anahtar kelimeler
+
+    Returns:
+        Regex deseni (ornek: "matri(?:s|x)")
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        optional = "" in node
+        branches = [
+            re.escape(char) + build(child) for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})" + ("?" if optional else "")
+
+    return build(trie)
+
 
 class CommandParser:
-    """Dogal dil komutlarini semantik komutlara cevirir"""
+    """Dogal dil komutlarini semantik komutlara cevirir
+    
+    Prefix ve anahtar kelime tablolari sinif yuklenirken tek regex'e
+    derlenir; her girdi tek taramada yonlendirilir.
+    """
     
     MODULE_PREFIXES: Dict[str, str] = {
-        "calculus": "!calculus",
-        "calc": "!calculus",
-        "linalg": "!linalg",
-        "linear": "!linalg",
-        "matrix": "!linalg",
-        "solve": "!solve",
-        "equation": "!solve",
-        "plot": "!plot",
-        "graph": "!plot",
-        "finance": "!finance",
-        "financial": "!finance",
-        "wrong": 123
+        "calculus": "calculus",
+        "calc": "calculus",
+        "linalg": "linear_algebra",
+        "linear": "linear_algebra",
+        "matrix": "linear_algebra",
+        "solve": "equation_solver",
+        "equation": "equation_solver",
+        "plot": "graph_plotter",
+        "graph": "graph_plotter",
+        "finance": "financial",
+        "financial": "financial",
+        "convert": "unit_converter",
+        "unit": "unit_converter",
+        "math": "basic_math",
     }
     
+    # Oncelik sirasi: birden fazla domain eslesirse listede once gelen kazanir
+    MODULE_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+        ("calculus", (
+            "derivative", "integral", "limit", "taylor", "gradient", "turev", "seri",
+        )),
+        ("linear_algebra", (
+            "matrix", "determinant", "eigenvalue", "vector", "matris", "ozdeger", "vektor",
+        )),
+        ("equation_solver", ("solve", "equation", "coz", "denklem", "kok")),
+        ("graph_plotter", ("plot", "graph", "draw", "ciz", "grafik")),
+        ("financial", ("npv", "irr", "loan", "interest", "faiz", "kredi", "yatirim")),
+        ("unit_converter", ("convert", "cevir", "donustur")),
+    )
+    
+    # "100 km to miles", "25 celsius kac fahrenheit", "10 kg→lb"
+    UNIT_CONVERSION_PATTERN: str = (
+        r"\d\s*[^\W\d_]+\s*(?:\s(?:to|into|in|as|kac|kaç)\s|→)\s*[^\W\d_]"
+    )
+    
+    _PREFIX_REGEX: Pattern[str]
+    _KEYWORD_REGEX: Pattern[str]
+    _UNIT_REGEX: Pattern[str]
+    _KEYWORD_PRIORITY: Dict[str, Tuple[int, str]]
+    _route: Callable[[str], str]
+    
+    def __init_subclass__(cls, **kwargs):
+        """Tablolari override eden alt siniflar da derlenir"""
+        super().__init_subclass__(**kwargs)
+        cls._compile()
+    
+    @classmethod
+    def _compile(cls) -> None:
+        """Prefix ve anahtar kelime tablolarini regex'lere derler
+        
+        Tekrarlanan girdiler icin sonuc sinifa ozel LRU cache'ten gelir.
+        """
+        prefixes = sorted(cls.MODULE_PREFIXES, key=len, reverse=True)
+        cls._PREFIX_REGEX = re.compile(
+            rf"!({'|'.join(map(re.escape, prefixes))})\b\s*", re.IGNORECASE
+        )
+        
+        cls._KEYWORD_PRIORITY = {}
+        for priority, (module, keywords) in enumerate(cls.MODULE_KEYWORDS):
+            for keyword in keywords:
+                cls._KEYWORD_PRIORITY.setdefault(keyword, (priority, module))
+        cls._KEYWORD_REGEX = re.compile(r"\b" + _trie_pattern(cls._KEYWORD_PRIORITY))
+        cls._UNIT_REGEX = re.compile(cls.UNIT_CONVERSION_PATTERN)
+        cls._route = staticmethod(lru_cache(maxsize=ROUTE_CACHE_SIZE)(
+            lambda text_lower: cls._match_module(text_lower) or "basic_math"
+        ))
+    
     def parse(self, user_input: str) -> Tuple[Optional[str], str]:
         """Kullanici girdisini parse eder
         
         Args:
             user_input: Kullanici girdisi
-            
+        
         Returns:
             (modul_adi, ifade) tuple'i
         """
         user_input = user_input.strip()
         
-        for prefix, module in self.MODULE_PREFIXES.items():
-            if user_input.lower().startswith(f"!{prefix}"):
-                expression = user_input[len(f"!{prefix}"):].strip()
-                return module, expression  
-
-        detected_module = self._detect_module_from_natural_language(user_input)
-        if detected_module:
-            return detected_module, user_input
+        if user_input.startswith("!"):
+            match = self._PREFIX_REGEX.match(user_input)
+            if match:
+                module = self.MODULE_PREFIXES[match.group(1).lower()]
+                return module, user_input[match.end():]
         
-
-        return "basic_math", user_input
+        return self._route(user_input.lower()), user_input
     
     def _detect_module_from_natural_language(self, text: str) -> Optional[str]:
         """Dogal dil ifadesinden modul tespit eder
         
         Args:
             text: Kullanici metni
-            
+        
         Returns:
             Modul adi veya None
         """
-        text_lower = text.lower()
-        
-        # Calculus keywords
-        calculus_keywords = [
-            "derivative", "integral", "limit", "taylor", "gradient",
-            "turev", "integral", "limit", "seri"
-        ]
-        if any(keyword in text_lower for keyword in calculus_keywords):
-            return "calculus"
-        
-        # Linear algebra keywords
-        linalg_keywor = [
-            "matrix", "determinant", "eigenvalue", "vector", "matris",
-            "determinant", "ozdeger", "vektor"
-        ]
-        if any(keyword in text_lower for keyword in linalg_keywords):
-            return "linear_algebra"
-        
-        # Equation solver keywords
-        equation_keywords = 
-            "solve", "equation", "", "coz", "denklem", "kok"
-        ]
-        if any(keyword in text_lower for keyword in equation_keywords):
-            return "equation_solver"
-        
-   
-        plot_keywords = [
-            "plot", "graph", "draw", "ciz", "grafik"
-        
-        if any(keyword in text_lower for keyword in plot_keywords):
-            return "graph_plotter"
+        return self._match_module(text.lower())
+    
+    @classmethod
+    def _match_module(cls, text_lower: str) -> Optional[str]:
+        """Tek regex taramasiyla en yuksek oncelikli modulu bulur"""
+        matches = cls._KEYWORD_REGEX.findall(text_lower)
+        if matches:
+            return min(cls._KEYWORD_PRIORITY[keyword] for keyword in matches)[1]
         
-      
-        financial_keywords = [
-            "npv", "irr", "loan", "interest", "faiz", "kredi", "yatirim"
-        ]
-        if any(keyword in text_lower for keyword in financial_keywords):
-            return "financial"
+        if cls._UNIT_REGEX.search(text_lower):
+            return "unit_converter"
         
-         None
+        return None
+
 
+CommandParser._compile()
@@ -0,0 +1,230 @@
+"""Persistent content-addressed cache for rendered plots
+
+Dosya adi, grafigi belirleyen her seyin (kanonik fonksiyon, araliklar,
+grafik tipi, DPI, boyut...) kararli SHA-256 ozetidir; ayni grafik tum
+process'lerde ve yeniden baslatmalardan sonra ayni dosyaya denk gelir.
+Dosyalar gecici isimle yazilip ``os.replace`` ile atomik olarak yerine
+konur, indeks (sqlite, WAL) worker process'ler arasinda paylasilir.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.core.cache import CacheStats
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Cizim kodu degistiginde eski dosyalarin kullanilmamasi icin artirilir
+PLOT_CACHE_VERSION = 1
+INDEX_FILE = "index.db"
+
+RenderToPath = Callable[[str], Awaitable[Any]]
+
+
+def make_plot_key(spec: Dict[str, Any]) -> str:
+    """Grafik tanimindan kararli cache anahtari uretir
+
+    Args:
+        spec: JSON-serializable grafik tanimi (fonksiyon, araliklar, tip,
+            DPI, boyut, format...)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = json.dumps(
+        {"version": PLOT_CACHE_VERSION, **spec},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=float,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PlotCache:
+    """Boyut limitli, disk tabanli grafik cache'i
+
+    Ayni process icinde ayni anahtar icin devam eden cizim paylasilir;
+    farkli process'ler ayni grafigi ayni anda cizerse ikisi de ayni icerigi
+    atomik olarak yazar ve sonuc tutarli kalir.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, extension: str = "png"):
+        """Cache'i hazirlar (indeks ilk kullanimda acilir)
+
+        Args:
+            directory: Grafik dosyalarinin dizini
+            max_bytes: Dizindeki grafiklerin toplam boyut limiti (0 = limitsiz)
+            extension: Dosya uzantisi
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.stats = CacheStats()
+        self._db: Optional[sqlite3.Connection] = None
+        self._inflight: Dict[str, "asyncio.Future[str]"] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Indeks baglantisini (gerekirse) acar"""
+        if self._db is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self.directory / INDEX_FILE),
+                check_same_thread=False,
+                isolation_level=None,
+                timeout=10.0,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS plots ("
+                "key TEXT PRIMARY KEY, size INTEGER, created_at REAL, "
+                "last_access REAL, hits INTEGER DEFAULT 0, extension TEXT DEFAULT 'png')"
+            )
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(plots)")}
+            if "extension" not in columns:
+                connection.execute("ALTER TABLE plots ADD COLUMN extension TEXT DEFAULT 'png'")
+            self._db = connection
+        return self._db
+
+    def path_for(self, key: str, extension: Optional[str] = None) -> Path:
+        """Anahtarin dosya yolunu dondurur"""
+        return self.directory / f"{key}.{extension or self.extension}"
+
+    def get(self, key: str, extension: Optional[str] = None) -> Optional[str]:
+        """Cizilmis grafigin yolunu dondurur
+
+        Indekste olup dosyasi silinmis kayitlar temizlenir; baska bir
+        process'in yazdigi ama indekse henuz girmemis dosyalar indekslenir.
+
+        Args:
+            key: ``make_plot_key`` ciktisi
+            extension: Dosya uzantisi (varsayilan: cache'in uzantisi)
+
+        Returns:
+            Dosya yolu veya None
+        """
+        db = self._connect()
+        path = self.path_for(key, extension)
+        now = time.time()
+
+        if path.exists():
+            updated = db.execute(
+                "UPDATE plots SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            ).rowcount
+            if not updated:
+                self._index(key, path, now, extension)
+            self.stats.hits += 1
+            return str(path)
+
+        db.execute("DELETE FROM plots WHERE key = ?", (key,))
+        self.stats.misses += 1
+        return None
+
+    async def get_or_render(
+        self,
+        key: str,
+        render: RenderToPath,
+        extension: Optional[str] = None
+    ) -> str:
+        """Grafigi cache'ten dondurur veya cizip cache'e yazar
+
+        Args:
+            key: ``make_plot_key`` ciktisi
+            render: Verilen gecici yola cizim yapan coroutine fonksiyonu
+            extension: Dosya uzantisi (varsayilan: cache'in uzantisi)
+
+        Returns:
+            Grafik dosyasinin yolu
+        """
+        cached = self.get(key, extension)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.ensure_future(self._render(key, render, extension or self.extension))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _render(self, key: str, render: RenderToPath, extension: str) -> str:
+        """Gecici dosyaya cizip atomik olarak yerine koyar"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key, extension)
+        temp_path = self.directory / f".{key}.{uuid.uuid4().hex}.tmp.{extension}"
+
+        try:
+            await render(str(temp_path))
+            os.replace(temp_path, path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+        self._index(key, path, time.time(), extension)
+        self._evict()
+        return str(path)
+
+    def _index(self, key: str, path: Path, now: float, extension: Optional[str] = None) -> None:
+        """Dosyayi indekse ekler"""
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return
+        self._connect().execute(
+            "INSERT OR REPLACE INTO plots (key, size, created_at, last_access, hits, extension) "
+            "VALUES (?, ?, ?, ?, 0, ?)",
+            (key, size, now, now, extension or self.extension),
+        )
+
+    def _evict(self) -> None:
+        """Toplam boyut limiti asildiysa en uzun suredir kullanilmayanlari siler"""
+        if self.max_bytes <= 0:
+            return
+
+        db = self._connect()
+        try:
+            # IMMEDIATE: ayni anda tahliye yapan diger process'leri sirala
+            db.execute("BEGIN IMMEDIATE")
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM plots").fetchone()[0]
+            if total > self.max_bytes:
+                rows = db.execute(
+                    "SELECT key, size, extension FROM plots ORDER BY last_access ASC"
+                ).fetchall()
+                for key, size, extension in rows:
+                    if total <= self.max_bytes:
+                        break
+                    try:
+                        self.path_for(key, extension).unlink()
+                    except FileNotFoundError:
+                        pass
+                    db.execute("DELETE FROM plots WHERE key = ?", (key,))
+                    total -= size
+                    self.stats.evictions += 1
+            db.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.warning(f"Plot cache tahliye hatasi: {e}")
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Cache sayaclari ve disk kullanimini dondurur"""
+        entries, total = 0, 0
+        if self._db is not None:
+            entries, total = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM plots"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            **self.stats.to_dict(),
+        }
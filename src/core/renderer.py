@@ -0,0 +1,274 @@
+"""Process pool rendering of matplotlib figures
+
+Cizim fonksiyonlari global pyplot durumu yerine nesne yonelimli
+``Figure`` API'sini kullanir ve worker process'lerde calisir; event
+loop cizim suresince bloklanmaz, birden fazla grafik farkli
+cekirdeklerde paralel cizilir. Worker'lar baslarken matplotlib'i
+import edip bir bos figur cizerek isinir (font cache vb.).
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+RenderFunction = Callable[[Dict[str, Any]], str]
+
+
+def _new_figure(spec: Dict[str, Any]):
+    """pyplot kullanmadan Agg canvas'li figur olusturur"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=spec.get("figsize", (10, 6)))
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _warm_up() -> None:
+    """Worker initializer: matplotlib'i (3D dahil) import edip bir figur cizer"""
+    figure = _new_figure({"figsize": (1, 1)})
+    figure.add_subplot().plot([0, 1], [0, 1])
+    figure.add_subplot(projection="3d")
+    figure.canvas.draw()
+
+
+def _ping() -> int:
+    """Worker'in ayakta oldugunu dogrulamak icin bos is"""
+    return os.getpid()
+
+
+def render_line_plot(spec: Dict[str, Any]) -> str:
+    """2D cizgi grafigini dosyaya cizer
+
+    Args:
+        spec: "x", "y", "path" zorunlu; "title", "xlabel", "ylabel",
+            "ylim", "dpi", "figsize" opsiyonel
+
+    Returns:
+        Yazilan dosyanin yolu
+    """
+    figure = _new_figure(spec)
+    axes = figure.add_subplot()
+    axes.plot(spec["x"], spec["y"], "b-", linewidth=2)
+    axes.grid(True, alpha=0.3)
+    axes.set_xlabel(spec.get("xlabel", "x"))
+    axes.set_ylabel(spec.get("ylabel", "y"))
+    axes.set_title(spec.get("title", ""))
+    if spec.get("ylim") is not None:
+        axes.set_ylim(*spec["ylim"])
+
+    return _save(figure, spec)
+
+
+def render_curve_plot(spec: Dict[str, Any]) -> str:
+    """Parametrik egriyi esit olcekli eksenlerde cizer
+
+    Args:
+        spec: ``render_line_plot`` ile ayni anahtarlar
+
+    Returns:
+        Yazilan dosyanin yolu
+    """
+    figure = _new_figure(spec)
+    axes = figure.add_subplot()
+    axes.plot(spec["x"], spec["y"], "b-", linewidth=2)
+    axes.set_aspect("equal", adjustable="datalim")
+    axes.grid(True, alpha=0.3)
+    axes.set_xlabel(spec.get("xlabel", "x"))
+    axes.set_ylabel(spec.get("ylabel", "y"))
+    axes.set_title(spec.get("title", ""))
+    return _save(figure, spec)
+
+
+def render_polar_plot(spec: Dict[str, Any]) -> str:
+    """Polar egriyi cizer
+
+    Args:
+        spec: "theta", "r", "path" zorunlu; "title", "dpi", "figsize" opsiyonel
+
+    Returns:
+        Yazilan dosyanin yolu
+    """
+    figure = _new_figure(spec)
+    axes = figure.add_subplot(projection="polar")
+    axes.plot(spec["theta"], spec["r"], "b-", linewidth=2)
+    axes.set_title(spec.get("title", ""))
+    return _save(figure, spec)
+
+
+def render_surface_plot(spec: Dict[str, Any]) -> str:
+    """3D yuzeyi cizer
+
+    Grid oldugu gibi cizilir (``rcount``/``ccount`` = grid boyutu);
+    cozunurluk butcesi cagiran tarafta mesh seyreltilerek uygulanir.
+
+    Args:
+        spec: "x", "y" (1D), "z" (2D), "path" zorunlu; "title", "zlim",
+            "dpi", "figsize" opsiyonel
+
+    Returns:
+        Yazilan dosyanin yolu
+    """
+    import numpy as np
+
+    figure = _new_figure(spec)
+    axes = figure.add_subplot(projection="3d")
+    z = np.ma.masked_invalid(spec["z"])
+    grid_x, grid_y = np.meshgrid(spec["x"], spec["y"])
+    axes.plot_surface(
+        grid_x,
+        grid_y,
+        z,
+        rcount=z.shape[0],
+        ccount=z.shape[1],
+        cmap="viridis",
+        linewidth=0,
+        antialiased=False,
+        # Vektor ciktida binlerce yuzey yerine tek gomulu raster
+        rasterized=spec.get("format") == "svg",
+    )
+    axes.set_xlabel("x")
+    axes.set_ylabel("y")
+    axes.set_zlabel("z")
+    axes.set_title(spec.get("title", ""))
+    if spec.get("zlim") is not None:
+        axes.set_zlim(*spec["zlim"])
+    return _save(figure, spec)
+
+
+def _save(figure, spec: Dict[str, Any]) -> str:
+    """Figuru spec'teki yola spec'teki formatta ("png", "svg") yazar"""
+    figure.savefig(
+        spec["path"],
+        dpi=spec.get("dpi", 150),
+        format=spec.get("format", "png"),
+        bbox_inches="tight",
+    )
+    return str(spec["path"])
+
+
+RENDER_FUNCTIONS: Dict[str, RenderFunction] = {
+    "line": render_line_plot,
+    "curve": render_curve_plot,
+    "polar": render_polar_plot,
+    "surface": render_surface_plot,
+}
+
+
+def save_description(path: str, kind: str, spec: Dict[str, Any]) -> None:
+    """Formattan bagimsiz cizim tanimini ``.npz`` olarak yazar
+
+    Diziler oldugu gibi, diger alanlar (baslik, eksen limitleri) JSON
+    olarak saklanir; tanim daha sonra herhangi bir formatta cizilebilir.
+
+    Args:
+        path: ``.npz`` ile biten hedef yol
+        kind: ``RENDER_FUNCTIONS`` anahtari
+        spec: Cizim fonksiyonuna verilecek parametreler (path/dpi/format haric)
+    """
+    import numpy as np
+
+    arrays = {name: value for name, value in spec.items() if isinstance(value, np.ndarray)}
+    meta = {name: value for name, value in spec.items() if name not in arrays}
+    with open(path, "wb") as file:
+        np.savez(file, __meta__=np.array(json.dumps({"kind": kind, "spec": meta})), **arrays)
+
+
+def load_description(path: str) -> Tuple[str, Dict[str, Any]]:
+    """``save_description`` ile yazilmis tanimi okur
+
+    Returns:
+        (kind, spec) tuple'i
+    """
+    import numpy as np
+
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["__meta__"]))
+        spec = {**meta["spec"], **{name: data[name] for name in data.files if name != "__meta__"}}
+    return meta["kind"], spec
+
+
+class PlotRenderer:
+    """Cizim islerini process pool'a (veya thread'e) dagitir
+
+    Pool ilk ihtiyacta ya da ``start`` ile olusturulur; worker'lar
+    ``spawn`` ile baslatildigi icin ana process'in event loop'u ve
+    kilitleri kopyalanmaz. ``max_workers`` 0 ise ya da renderer daemon
+    bir process icinde calisiyorsa (daemon process'ler alt process
+    olusturamaz) cizim ``asyncio.to_thread`` ile yapilir (Figure API
+    thread-safe'tir).
+    """
+
+    def __init__(self, max_workers: int, start_method: str = "spawn"):
+        """Renderer'i hazirlar
+
+        Args:
+            max_workers: Worker process sayisi (0 = thread'de ciz)
+            start_method: multiprocessing baslatma yontemi
+        """
+        self.max_workers = max(0, max_workers)
+        self.start_method = start_method
+        self._executor: Optional[Executor] = None
+        self.rendered = 0
+
+    def start(self) -> None:
+        """Pool'u olusturup tum worker'lari isitir (bloklamadan)"""
+        if self.max_workers == 0 or self._executor is not None:
+            return
+        if multiprocessing.current_process().daemon:
+            logger.warning("Daemon process'te plot worker'i baslatilamaz, thread'de cizilecek")
+            self.max_workers = 0
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_warm_up,
+        )
+        # ProcessPoolExecutor worker'lari is geldikce baslatir; her worker'a
+        # bir is gondererek hepsinin simdiden ayaga kalkmasini sagla
+        for _ in range(self.max_workers):
+            self._executor.submit(_ping)
+        logger.info(f"Plot renderer baslatildi ({self.max_workers} worker)")
+
+    async def render(self, function: RenderFunction, spec: Dict[str, Any]) -> str:
+        """Cizim fonksiyonunu worker'da calistirir
+
+        Args:
+            function: Modul seviyesinde tanimli (pickle edilebilir) cizim fonksiyonu
+            spec: Cizim parametreleri
+
+        Returns:
+            Cizim fonksiyonunun dondurdugu dosya yolu
+        """
+        self.start()
+        if self.max_workers == 0:
+            path = await asyncio.to_thread(function, spec)
+            self.rendered += 1
+            return path
+
+        loop = asyncio.get_running_loop()
+        try:
+            path = await loop.run_in_executor(self._executor, function, spec)
+        except BrokenProcessPool:
+            logger.warning("Plot worker'i coktu, pool yeniden baslatiliyor")
+            self.shutdown(wait=False)
+            self.start()
+            path = await loop.run_in_executor(self._executor, function, spec)
+
+        self.rendered += 1
+        return path
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Pool'u kapatir"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
@@ -0,0 +1,138 @@
+"""Compact serialization of sampled plot data
+
+Grafigi kendisi cizen istemciler icin ornek noktalari resim uretmeden
+dondurur. Diziler ya little-endian float32 tampon (base64), ya NumPy
+``.npy`` dosyasi (base64) ya da nokta sayisi azaltilmis JSON listesi
+olarak kodlanir.
+"""
+
+import base64
+import io
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.core.sampling import Mesh, downsample_mesh
+from src.utils.exceptions import InvalidInputError
+
+ENCODINGS = ("float32", "npy", "json")
+JSON_MAX_POINTS = 500
+
+
+def _encode_float32(array: np.ndarray) -> Dict[str, Any]:
+    data = np.ascontiguousarray(array, dtype="<f4")
+    return {
+        "dtype": "<f4",
+        "shape": list(data.shape),
+        "data": base64.b64encode(data.tobytes()).decode("ascii"),
+    }
+
+
+def _encode_npy(array: np.ndarray) -> Dict[str, Any]:
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(array, dtype="<f4"), allow_pickle=False)
+    return {
+        "format": "npy",
+        "data": base64.b64encode(buffer.getvalue()).decode("ascii"),
+    }
+
+
+def _to_json(array: np.ndarray) -> List[Any]:
+    """NaN/inf degerleri None olan (ic ice) liste"""
+    values = np.asarray(array, dtype=float)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+def decimate_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """Tepe noktalarini koruyarak nokta sayisini azaltmak icin indeks secer
+
+    Dizi ``max_points / 2`` kovaya bolunur ve her kovanin en kucuk ve en
+    buyuk degeri tutulur (min-max decimation); ilk/son nokta ve cizgi
+    kirilmalari (tanimli bolgeye komsu NaN'lar) her zaman korunur.
+
+    Args:
+        values: Egrinin dikey degerleri
+        max_points: Hedef nokta sayisi
+
+    Returns:
+        Sirali indeks dizisi
+    """
+    size = values.size
+    if size <= max_points:
+        return np.arange(size)
+
+    finite = np.isfinite(values)
+    gaps = ~finite
+    gaps[1:-1] &= finite[:-2] | finite[2:]
+    gap_indices = np.flatnonzero(gaps)
+
+    buckets = max(1, (max_points - 2 - gap_indices.size) // 2)
+    edges = np.linspace(0, size, buckets + 1).astype(int)
+    low = np.where(finite, values, np.inf)
+    high = np.where(finite, values, -np.inf)
+
+    keep = [0, size - 1, *gap_indices.tolist()]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            keep.append(start + int(np.argmin(low[start:end])))
+            keep.append(start + int(np.argmax(high[start:end])))
+    return np.unique(keep)
+
+
+def export_samples(
+    arrays: Dict[str, np.ndarray],
+    encoding: str = "float32",
+    max_points: int = JSON_MAX_POINTS,
+    limits: Optional[Dict[str, Iterable[float]]] = None
+) -> Dict[str, Any]:
+    """Ornek dizilerini istenen formatta kodlar
+
+    Args:
+        arrays: Ad -> dizi; 1D diziler ayni uzunlukta (x/y, t/x/y, theta/r),
+            3D'de "x"/"y" eksenleri 1D ve "z" 2D olur
+        encoding: "float32", "npy" veya "json"
+        max_points: JSON'da 1D egriler icin nokta limiti (2D grid'ler
+            eksen basina ``sqrt(max_points)``'a seyreltilir)
+        limits: Onerilen eksen araliklari (ornek: {"y": (-5, 5)})
+
+    Returns:
+        {"encoding", "arrays", "limits"} sozlugu
+
+    Raises:
+        InvalidInputError: Bilinmeyen encoding
+    """
+    if encoding not in ENCODINGS:
+        raise InvalidInputError(
+            f"Bilinmeyen veri formati: {encoding} (gecerli: {', '.join(ENCODINGS)})"
+        )
+
+    if encoding == "json":
+        arrays = _decimate(arrays, max_points)
+        encoded = {name: _to_json(array) for name, array in arrays.items()}
+    else:
+        encoder = _encode_float32 if encoding == "float32" else _encode_npy
+        encoded = {name: encoder(array) for name, array in arrays.items()}
+
+    return {
+        "encoding": encoding,
+        "arrays": encoded,
+        "limits": {
+            name: [float(value) for value in bounds]
+            for name, bounds in (limits or {}).items()
+            if bounds is not None
+        },
+    }
+
+
+def _decimate(arrays: Dict[str, np.ndarray], max_points: int) -> Dict[str, np.ndarray]:
+    """JSON cikti icin dizileri nokta limitine indirir"""
+    if "z" in arrays and np.ndim(arrays["z"]) == 2:
+        mesh = downsample_mesh(
+            Mesh(arrays["x"], arrays["y"], arrays["z"], None),
+            max(2, int(np.sqrt(max_points))),
+        )
+        return {"x": mesh.x, "y": mesh.y, "z": mesh.z}
+
+    # Dikey eksen son dizidir (y veya r); tepe noktalari ona gore korunur
+    index = decimate_indices(list(arrays.values())[-1], max_points)
+    return {name: array[index] for name, array in arrays.items()}
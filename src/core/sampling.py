@@ -0,0 +1,265 @@
+"""Adaptive sampling of 1D functions for plotting
+
+Sabit aralikli ornekleme yerine egrinin dogrusal yaklasimdan saptigi
+araliklar ikiye bolunur. Her turda aktif araliklarin orta noktalari tek
+vektorize cagriyla hesaplanir; duz egriler az noktayla, keskin bolgeler
+yogun noktayla orneklenir. En kucuk genislige inildigi halde
+cozulemeyen araliklar sureksizlik kabul edilip cizgi kirilir.
+
+3D yuzeyler ve parametrik/polar egriler icin yardimcilar da burada:
+fonksiyon tum grid (veya parametre vektoru) uzerinde tek vektorize
+cagriyla hesaplanir.
+"""
+
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+INITIAL_POINTS = 65
+MAX_POINTS = 2000
+TOLERANCE = 1e-3
+MAX_DEPTH = 16
+ROBUST_PERCENTILES = (2.0, 98.0)
+OUTLIER_RATIO = 10.0
+
+VectorFunction = Callable[[np.ndarray], np.ndarray]
+
+
+class Samples(NamedTuple):
+    """Ornekleme sonucu"""
+
+    x: np.ndarray
+    y: np.ndarray
+    y_limits: Optional[Tuple[float, float]]
+
+
+class Mesh(NamedTuple):
+    """Duzenli grid uzerinde hesaplanmis yuzey (z[i, j] = f(x[j], y[i]))"""
+
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+    z_limits: Optional[Tuple[float, float]]
+
+
+def _percentile_window(y: np.ndarray, margin: float = 0.1) -> Optional[Tuple[float, float]]:
+    """Uc degerlerden etkilenmeyen y araligini pay ekleyerek dondurur"""
+    finite = y[np.isfinite(y)]
+    if finite.size < 2:
+        return None
+
+    low, high = np.percentile(finite, ROBUST_PERCENTILES)
+    if high <= low:
+        return None
+    pad = (high - low) * margin
+    return float(low - pad), float(high + pad)
+
+
+def robust_limits(values: np.ndarray) -> Optional[Tuple[float, float]]:
+    """Degerler birkac uc noktaya patliyorsa onerilen gorunur araligi dondurur
+
+    Args:
+        values: Herhangi sekilde float dizi (NaN/inf olabilir)
+
+    Returns:
+        Toplam aralik, persentil penceresinin ``OUTLIER_RATIO`` katini
+        asiyorsa pencere; aksi halde None
+    """
+    window = _percentile_window(values)
+    finite = values[np.isfinite(values)]
+    if window is None or finite.size == 0:
+        return None
+    span = float(finite.max() - finite.min())
+    return window if span > OUTLIER_RATIO * (window[1] - window[0]) else None
+
+
+def adaptive_sample(
+    function: VectorFunction,
+    x_min: float,
+    x_max: float,
+    max_points: int = MAX_POINTS,
+    tolerance: float = TOLERANCE,
+    initial_points: int = INITIAL_POINTS,
+    max_depth: int = MAX_DEPTH
+) -> Samples:
+    """Fonksiyonu hata kontrollu alt bolmeyle ornekler
+
+    Bir araligin orta noktasindaki deger, uclarin dogrusal
+    interpolasyonundan ``tolerance * y genisligi`` kadar saparsa aralik
+    bolunur. Hata, ilk esit aralikli ornegin genisliginin bir kat
+    disina kadar kirpilmis degerler uzerinden olculur; boylece ekran
+    disina kacan asimptot kollarina nokta harcanmaz. Nokta butcesi
+    asilacaksa en buyuk hataya sahip araliklar once bolunur.
+
+    Args:
+        function: Dizi alip dizi donduren vektorize fonksiyon
+        x_min: Aralik baslangici
+        x_max: Aralik sonu
+        max_points: Nokta butcesi (kirilma NaN'lari haric)
+        tolerance: Olcege gore izin verilen sapma
+        initial_points: Ilk esit aralikli nokta sayisi
+        max_depth: Ilk araliklarin en fazla kac kez ikiye bolunecegi
+
+    Returns:
+        Samples(x, y, y_limits); sureksizlik ve tanimsiz noktalarda y NaN.
+        Kirilan ve degerleri patlayan egrilerde (``tan(x)``) y_limits ilk
+        ornekten onerilen gorunur araliktir, aksi halde None
+    """
+    x = np.linspace(x_min, x_max, min(initial_points, max_points))
+    y = np.asarray(function(x), dtype=float)
+    initial_y = y
+    finite = y[np.isfinite(y)]
+    low, high = (float(finite.min()), float(finite.max())) if finite.size else (-1.0, 1.0)
+    scale = (high - low) or max(abs(low), abs(high)) or 1.0
+    low, high = low - scale, high + scale
+    min_width = (x_max - x_min) / (initial_points - 1) / 2 ** max_depth
+
+    active = np.ones(x.size - 1, dtype=bool)
+    unresolved = np.zeros(x.size - 1, dtype=bool)
+
+    while active.any() and x.size < max_points:
+        index = np.flatnonzero(active)
+        left, right = y[index], y[index + 1]
+        x_mid = (x[index] + x[index + 1]) / 2
+        y_mid = np.asarray(function(x_mid), dtype=float)
+
+        with np.errstate(invalid="ignore"):
+            clipped = [np.clip(values, low, high) for values in (left, y_mid, right)]
+            error = np.abs(clipped[1] - (clipped[0] + clipped[2]) / 2) / scale
+        finite = np.isfinite(left) & np.isfinite(y_mid) & np.isfinite(right)
+        mixed = ~finite & (np.isfinite(left) | np.isfinite(y_mid) | np.isfinite(right))
+        error = np.where(finite, error, np.where(mixed, np.inf, 0.0))
+
+        wants_split = error > tolerance
+        too_narrow = (x[index + 1] - x[index]) <= min_width
+        unresolved[index[wants_split & too_narrow]] = True
+        split = wants_split & ~too_narrow
+
+        budget = max_points - x.size
+        if np.count_nonzero(split) > budget:
+            candidates = np.flatnonzero(split)
+            keep = candidates[np.argsort(error[candidates])[::-1][:budget]]
+            split = np.zeros_like(split)
+            split[keep] = True
+
+        if not split.any():
+            break
+
+        positions = index[split] + 1
+        x = np.insert(x, positions, x_mid[split])
+        y = np.insert(y, positions, y_mid[split])
+        unresolved = np.insert(unresolved, positions, False)
+
+        inserted = positions + np.arange(positions.size)
+        active = np.zeros(x.size - 1, dtype=bool)
+        active[inserted - 1] = True
+        active[inserted] = True
+
+    y_limits = None
+    if unresolved.any():
+        window = _percentile_window(initial_y)
+        span = float(np.nanmax(y) - np.nanmin(y)) if np.isfinite(y).any() else 0.0
+        if window is not None and span > OUTLIER_RATIO * (window[1] - window[0]):
+            y_limits = window
+
+    x, y = _break_discontinuities(x, y, unresolved)
+    return Samples(x, y, y_limits)
+
+
+def _break_discontinuities(
+    x: np.ndarray,
+    y: np.ndarray,
+    unresolved: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cozulemeyen araliklara NaN ekleyerek cizgiyi kirar"""
+    y = np.where(np.isfinite(y), y, np.nan)
+    breaks = np.flatnonzero(unresolved)
+    if breaks.size == 0:
+        return x, y
+
+    x_break = (x[breaks] + x[breaks + 1]) / 2
+    return (
+        np.insert(x, breaks + 1, x_break),
+        np.insert(y, breaks + 1, np.nan),
+    )
+
+
+def evaluate_mesh(
+    function: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    x_range: Tuple[float, float],
+    y_range: Tuple[float, float],
+    resolution: int
+) -> Mesh:
+    """Iki degiskenli fonksiyonu ``resolution x resolution`` gridde hesaplar
+
+    Grid seyrek (``sparse``) olusturulur; fonksiyon broadcast ile tek
+    cagrida tum noktalari hesaplar, tam x/y matrisleri hic olusmaz.
+    Gorunur araligin cok disina tasan (kutup) degerler NaN yapilir.
+
+    Args:
+        function: (x, y) dizileri alan vektorize fonksiyon
+        x_range: x araligi
+        y_range: y araligi
+        resolution: Eksen basina nokta sayisi
+
+    Returns:
+        Mesh(x, y, z, z_limits)
+    """
+    x = np.linspace(x_range[0], x_range[1], resolution)
+    y = np.linspace(y_range[0], y_range[1], resolution)
+    grid_x, grid_y = np.meshgrid(x, y, sparse=True)
+    z = np.array(function(grid_x, grid_y), dtype=float)
+    z[~np.isfinite(z)] = np.nan
+
+    z_limits = robust_limits(z)
+    if z_limits is not None:
+        with np.errstate(invalid="ignore"):
+            z[(z < z_limits[0]) | (z > z_limits[1])] = np.nan
+    return Mesh(x, y, z, z_limits)
+
+
+def _even_indices(size: int, count: int) -> np.ndarray:
+    """Uclari koruyarak esit aralikli ``count`` indeks secer"""
+    if count >= size:
+        return np.arange(size)
+    return np.unique(np.linspace(0, size - 1, max(count, 2)).round().astype(int))
+
+
+def downsample_mesh(mesh: Mesh, max_resolution: int) -> Mesh:
+    """Grid'i eksen basina en fazla ``max_resolution`` noktaya seyreltir
+
+    Args:
+        mesh: Tam cozunurluklu yuzey
+        max_resolution: Eksen basina nokta limiti
+
+    Returns:
+        Ayni araligi kapsayan seyreltilmis Mesh (limit altindaysa kendisi)
+    """
+    if max(mesh.z.shape) <= max_resolution:
+        return mesh
+
+    rows = _even_indices(mesh.y.size, max_resolution)
+    columns = _even_indices(mesh.x.size, max_resolution)
+    return Mesh(mesh.x[columns], mesh.y[rows], mesh.z[np.ix_(rows, columns)], mesh.z_limits)
+
+
+def sample_parameter(
+    functions: Sequence[VectorFunction],
+    t_range: Tuple[float, float],
+    points: int
+) -> Tuple[np.ndarray, ...]:
+    """Parametreye bagli fonksiyonlari ortak parametre vektorunde hesaplar
+
+    Args:
+        functions: Tek degiskenli vektorize fonksiyonlar
+        t_range: Parametre araligi
+        points: Nokta sayisi
+
+    Returns:
+        (t, f1(t), f2(t), ...); tanimsiz noktalar NaN
+    """
+    t = np.linspace(t_range[0], t_range[1], points)
+    values = [np.array(function(t), dtype=float) for function in functions]
+    for value in values:
+        value[~np.isfinite(value)] = np.nan
+    return (t, *values)
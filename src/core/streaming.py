@@ -0,0 +1,148 @@
+"""Incremental parsing of streamed Gemini JSON responses"""
+
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, List, Optional
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+StepCallback = Callable[[Any], None]
+
+# Aktif istekte Gemini'den akan adimlari alacak callback
+_step_listener: ContextVar[Optional[StepCallback]] = ContextVar("step_listener", default=None)
+
+
+@contextmanager
+def step_listener(callback: StepCallback) -> Iterator[None]:
+    """Bu context'te baslatilan Gemini istekleri adimlari akis halinde iletir
+
+    ``asyncio`` task'lari olusturulduklari andaki context'i kopyaladigi icin
+    blok icinde baslatilan task'lar listener'i gorur.
+
+    Args:
+        callback: Her tamamlanan adim icin cagrilacak fonksiyon
+    """
+    token = _step_listener.set(callback)
+    try:
+        yield
+    finally:
+        _step_listener.reset(token)
+
+
+def current_step_listener() -> Optional[StepCallback]:
+    """Aktif adim listener'ini dondurur"""
+    return _step_listener.get()
+
+
+class StepStreamParser:
+    """Parca parca gelen JSON objesinden ``steps`` elemanlarini ayiklar
+
+    Metin tek geciste karakter karakter taranir; ust seviye objedeki
+    ``field`` dizisinin her elemani tamamlandigi anda (virgul veya ``]``
+    goruldugunde) decode edilip dondurulur. JSON'dan onceki metin
+    (``` cercevesi vb.) atlanir.
+    """
+
+    def __init__(self, field: str = "steps"):
+        """Parser'i baslatir
+
+        Args:
+            field: Elemanlari akis halinde verilecek dizi alani
+        """
+        self.field = field
+        self.step_count = 0
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """Simdiye kadar gelen tum metin"""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Yeni parcayi isler
+
+        Args:
+            chunk: Akistan gelen metin parcasi
+
+        Returns:
+            Bu parcayla tamamlanan dizi elemanlari
+        """
+        self._text += chunk
+        text = self._text
+        items: List[Any] = []
+
+        for index in range(self._pos, len(text)):
+            char = text[index]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start:index + 1]
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if (
+                self._array_depth == self._depth
+                and self._item_start is None
+                and char not in " \t\r\n,]"
+            ):
+                self._item_start = index
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._key == self.field:
+                    self._array_depth = 2
+            elif char in "}]":
+                if self._depth == self._array_depth:
+                    self._emit(text, index, items)
+                    self._array_depth = None
+                self._depth -= 1
+            elif char == ",":
+                if self._depth == self._array_depth:
+                    self._emit(text, index, items)
+                elif self._depth == 1:
+                    self._key = None
+            elif char == ":" and self._depth == 1 and self._last_string is not None:
+                self._key = json.loads(self._last_string)
+                self._last_string = None
+
+        self._pos = len(text)
+        return items
+
+    def _emit(self, text: str, end: int, items: List[Any]) -> None:
+        """Tamamlanan dizi elemanini decode edip listeye ekler"""
+        if self._item_start is None:
+            return
+
+        raw = text[self._item_start:end].strip()
+        self._item_start = None
+        try:
+            items.append(json.loads(raw))
+        except json.JSONDecodeError:
+            logger.debug(f"Akistaki adim decode edilemedi: {raw[:80]}")
+            return
+        self.step_count += 1
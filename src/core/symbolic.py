@@ -0,0 +1,115 @@
+"""Safe SymPy parsing shared by symbolic modules"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Any
+
+from src.utils.exceptions import UnsupportedExpressionError
+
+SYMPY_CACHE_SIZE = 256
+# parse_expr tamsayi usleri hemen hesapladigi icin (9^9^9^9 gibi) ifade
+# boyutu parse oncesi sinirlanir
+SYMPY_MAX_LENGTH = 500
+SYMPY_MAX_EXPONENT = 1000
+SYMPY_MAX_DIGITS = 10_000
+
+SYMPY_FUNCTIONS = {
+    "sin", "cos", "tan", "cot", "sec", "csc",
+    "asin", "acos", "atan", "sinh", "cosh", "tanh",
+    "exp", "log", "ln", "sqrt", "abs", "pi", "e", "oo", "inf",
+}
+
+_NAME_PATTERN = re.compile(r"[a-z_][a-z0-9_]*")
+_ALLOWED_CHARS = re.compile(r"^[0-9a-z_+\-*/^().,\s]*$")
+
+_sympy = None
+
+
+def get_sympy():
+    """SymPy'yi ilk kullanimda import eder"""
+    global _sympy
+    if _sympy is None:
+        import sympy
+        _sympy = sympy
+    return _sympy
+
+
+@lru_cache(maxsize=SYMPY_CACHE_SIZE)
+def parse_sympy_expression(text: str) -> Any:
+    """Beyaz listedeki isimlerden olusan ifadeyi SymPy nesnesine cevirir
+    
+    Args:
+        text: Normalize edilmis (kucuk harf) ifade
+        
+    Returns:
+        SymPy ifadesi
+        
+    Raises:
+        UnsupportedExpressionError: Ifade guvenli sekilde parse edilemiyor
+    """
+    if not _ALLOWED_CHARS.match(text):
+        raise UnsupportedExpressionError("Desteklenmeyen karakter")
+    
+    for name in _NAME_PATTERN.findall(text):
+        if len(name) > 1 and name not in SYMPY_FUNCTIONS:
+            raise UnsupportedExpressionError(f"Bilinmeyen isim: {name}")
+    
+    if len(text) > SYMPY_MAX_LENGTH:
+        raise UnsupportedExpressionError("Ifade cok uzun")
+    
+    sympy = get_sympy()
+    from sympy.parsing.sympy_parser import (
+        convert_xor,
+        implicit_multiplication_application,
+        parse_expr,
+        standard_transformations,
+    )
+    
+    local_dict = {letter: sympy.Symbol(letter) for letter in "abcdfghjklmnopqrstuvwxyz"}
+    local_dict.update({"e": sympy.E, "ln": sympy.log, "inf": sympy.oo, "i": sympy.I})
+    transformations = standard_transformations + (
+        implicit_multiplication_application,
+        convert_xor,
+    )
+    
+    try:
+        _check_powers(
+            parse_expr(text, local_dict=local_dict, transformations=transformations, evaluate=False)
+        )
+        return parse_expr(text, local_dict=local_dict, transformations=transformations)
+    except UnsupportedExpressionError:
+        raise
+    except Exception as e:
+        raise UnsupportedExpressionError(f"Ifade parse edilemedi: {e}")
+
+
+def _check_powers(expression: Any) -> None:
+    """Hesaplanmamis ifadedeki usleri boyut limitlerine gore denetler
+    
+    Ic ice usler icten disa gezilir; sabit bir usun degeri ancak alt
+    ifadeleri sinirlar icinde kaldiktan sonra (ucuz) hesaplanir.
+    
+    Raises:
+        UnsupportedExpressionError: Degiskenli ifadenin usu ya da sabit
+            ifadenin basamak sayisi cok buyuk
+    """
+    sympy = get_sympy()
+    
+    for node in sympy.postorder_traversal(expression):
+        if not node.is_Pow:
+            continue
+        
+        if node.exp.free_symbols:
+            continue
+        exponent = abs(complex(node.exp.evalf()))
+        
+        if node.base.free_symbols:
+            # x^1000000 gibi usler acilim/sadelestirmede patlar
+            if exponent > SYMPY_MAX_EXPONENT:
+                raise UnsupportedExpressionError(f"Us cok buyuk: {node.exp}")
+            continue
+        
+        base = abs(complex(node.base.evalf()))
+        if base > 0 and exponent * abs(math.log10(base)) > SYMPY_MAX_DIGITS:
+            raise UnsupportedExpressionError(f"Sonuc cok buyuk: {node}")
@@ -1,12 +1,23 @@
 """Input validation and security for Calculator Agent"""
 
 import re
-from typing import List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Pattern, Set, Tuple
 from src.utils.exceptions import SecurityViolationError, InvalidInputError
 
+# Ayni istek icinde dogrulanmis (ifade, max_length, numeric) anahtarlari
+_validated: ContextVar[Optional[Set[Tuple[str, int, bool]]]] = ContextVar(
+    "validated_expressions", default=None
+)
+
 
 class InputValidator:
-    """Giris dogrulama ve guvenlik sinifi"""
+    """Giris dogrulama ve guvenlik sinifi
+    
+    Yasakli ifade ve karakter tablolari sinif yuklenirken hazirlanir;
+    ``validate`` tum kontrolleri tek cagrida yapar.
+    """
     
     FORBIDDEN_PATTERNS: List[str] = [
         "__import__",
@@ -23,6 +34,98 @@ class InputValidator:
         "__name__",
     ]
     
+    ALLOWED_CHARS: str = r"0-9+\-*/().\s^a-zA-Zπe,;\[\]"
+    
+    MAX_LENGTH: int = 1000
+    
+    _FORBIDDEN: Tuple[str, ...]
+    _INVALID_CHAR_REGEX: Pattern[str]
+    
+    def __init_subclass__(cls, **kwargs):
+        """Tablolari override eden alt siniflar da derlenir"""
+        super().__init_subclass__(**kwargs)
+        cls._compile()
+    
+    @classmethod
+    def _compile(cls) -> None:
+        """Yasakli ifade ve karakter tablolarini hazirlar
+        
+        Yasakli ifadeler icin ``str.__contains__`` taramasi CPython'da tek
+        bir alternation regex'inden (ozellikle IGNORECASE ile) daha hizli
+        oldugu icin tablo kucuk harfli ve tekillestirilmis tuple olarak
+        tutulur; karakter kumesi tek regex'e derlenir.
+        """
+        cls._FORBIDDEN = tuple(dict.fromkeys(p.lower() for p in cls.FORBIDDEN_PATTERNS))
+        cls._INVALID_CHAR_REGEX = re.compile(f"[^{cls.ALLOWED_CHARS}]")
+    
+    @classmethod
+    def _find_forbidden(cls, expression: str) -> Optional[str]:
+        """Ifadedeki ilk yasakli kalibi dondurur"""
+        expression_lower = expression.lower()
+        for pattern in cls._FORBIDDEN:
+            if pattern in expression_lower:
+                return pattern
+        return None
+    
+    @staticmethod
+    @contextmanager
+    def request_scope() -> Iterator[None]:
+        """Tek istek boyunca dogrulama sonuclarini hatirlar
+        
+        Orkestrator ve modul ayni ifadeyi dogruladiginda ikinci kontrol
+        tarama yapmadan doner. Kapsam ``contextvars`` ile tutuldugu icin
+        es zamanli istekler birbirinin sonucunu gormez.
+        """
+        token = _validated.set(set())
+        try:
+            yield
+        finally:
+            _validated.reset(token)
+    
+    def validate(
+        self,
+        expression: str,
+        max_length: Optional[int] = None,
+        numeric: bool = False
+    ) -> str:
+        """Guvenlik, uzunluk ve (istege bagli) karakter kontrolunu tek seferde yapar
+        
+        Args:
+            expression: Kullanici giris ifadesi
+            max_length: Maksimum uzunluk (varsayilan: MAX_LENGTH)
+            numeric: Karakter kumesini de kontrol et
+            
+        Returns:
+            Temizlenmis ifade
+            
+        Raises:
+            InvalidInputError: Bos, cok uzun veya gecersiz karakterli ifade
+            SecurityViolationError: Yasakli ifade tespit edildi
+        """
+        if not expression or not isinstance(expression, str):
+            raise InvalidInputError("Gecersiz giris: ifade string olmali")
+        
+        max_length = self.MAX_LENGTH if max_length is None else max_length
+        key = (expression, max_length, numeric)
+        memo = _validated.get()
+        if memo is not None and key in memo:
+            return expression.strip()
+        
+        cleaned = expression.strip()
+        if not cleaned:
+            raise InvalidInputError("Bos ifade gonderilemez")
+        
+        pattern = self._find_forbidden(cleaned)
+        if pattern:
+            raise SecurityViolationError(f"Yasakli ifade tespit edildi: {pattern}")
+        self.validate_length(expression, max_length)
+        if numeric:
+            self.validate_numeric_expression(cleaned)
+        
+        if memo is not None:
+            memo.add(key)
+        return cleaned
+    
     def sanitize_expression(self, expression: str) -> str:
         """Guvenlik icin giris temizleme
         
@@ -43,19 +146,9 @@ class InputValidator:
         if not expression:
             raise InvalidInputError("Bos ifade gonderilemez")
         
-    
-        expression_lower = expression.wrong_lower_method()   wrong_lower_method() 
-        expression_lower = expression.lower()
-        wrong_lower = undefined_var.lower()  
-        for pattern in self.FORBIDDEN_PATTERNS:
-    
-                wrong_check = self.wrong_method()  
-                raise SecurityViolationError(
-                    f"Yasakli ifade tespit edildi: {pattern}"
-                )
-        
-        if "test" in expression.lowe():
-            return expression
+        pattern = self._find_forbidden(expression)
+        if pattern:
+            raise SecurityViolationError(f"Yasakli ifade tespit edildi: {pattern}")
         
         return expression
     
@@ -87,8 +180,9 @@ class InputValidator:
         Returns:
             True if valid
         """
-        allowed_chars = r'[0-9+\-*/().\s^a-zA-Zπe,;\[\]]+'
-        if not re.match(f'^{allowed_chars}$', expression):
+        if not expression or self._INVALID_CHAR_REGEX.search(expression):
             raise InvalidInputError("Gecersiz karakterler tespit edildi")
         return True
 
+
+InputValidator._compile()
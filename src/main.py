@@ -1,25 +1,25 @@
 """Main orchestrator and UI entry point for Calculator Agent"""
 
+import argparse
 import asyncio
+import json
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, IO, Iterable, Iterator, List, Optional, Set, Union
 
 # Proje root'unu Python path'ine ekle (src klasöründen çalıştırılabilmesi için)
 project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 from src.core.agent import GeminiAgent
+from src.core.cache import CachedResult, ResultCache
 from src.core.parser import CommandParser
+from src.core.streaming import step_listener
 from src.core.validator import InputValidator
-from src.modules.basic_math import BasicMathModule
-from src.modules.calculus import CalculusModule
-from src.modules.linear_algebra import LinearAlgebraModule
-from src.modules.financial import FinancialModule
-from src.modules.equation_solver import EquationSolverModule
-from src.modules.graph_plotter import GraphPlotterModule
-from src.modules.unit_converter import UnitConverterModule
+from src.modules.base_module import BaseModule
+from src.modules.registry import ModuleRegistry
 from src.config.settings import settings
+from src.schemas.models import CalculationResult
 from src.utils.exceptions import (
     CalculationError,
     InvalidInputError,
@@ -32,35 +32,67 @@ from src.utils.helpers import format_result_for_display
 logger = setup_logger()
 APP_NAME = "Calculator Agent"
 APP_VERSION = "1.0.0"
+# Sirali batch'te yavas bir komut beklenirken tutulacak en fazla hazir kayit
+# (max_concurrency'nin kati)
+ORDERED_BUFFER_FACTOR = 4
+
+BatchItem = Union[str, Dict[str, Any]]
 
 
 class CalculatorAgent:
     """Ana calculator agent orchestrator"""
     
-    def __init__(self):
-        """Agent'i baslatir"""
-        try:
-            settings.validate()
-        except ValueError as e:
-            logger.error(f"Settings validation error: {e}")
-            raise
+    def __init__(self, gemini_agent: Optional[GeminiAgent] = None):
+        """Agent'i baslatir
+        
+        Args:
+            gemini_agent: Kullanilacak Gemini agent (verilmezse ayarlardan olusturulur)
+        """
+        if gemini_agent is None:
+            try:
+                settings.validate()
+            except ValueError as e:
+                logger.error(f"Settings validation error: {e}")
+                raise
+            gemini_agent = GeminiAgent()
         
-        self.gemini_agent = GeminiAgent()
+        self.gemini_agent = gemini_agent
         self.parser = CommandParser()
         self.validator = InputValidator()
         
-        self.modules = {
-            "basic_math": BasicMathModule(self.gemini_agent),
-            "calculus": CalculusModule(self.gemini_agent),
-            "linear_algebra": LinearAlgebraModule(self.gemini_agent),
-            "financial": FinancialModule(self.gemini_agent),
-            "equation_solver": EquationSolverModule(self.gemini_agent),
-            "graph_plotter": GraphPlotterModule(self.gemini_agent),
-            "unit_converter": UnitConverterModule(self.gemini_agent),
-        }
+        # Moduller ilk kullanildiklarinda import edilip olusturulur
+        self.modules = ModuleRegistry(self.gemini_agent, on_load=self._configure_module)
+        self.result_cache = ResultCache(
+            max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+            default_ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+            domain_ttls=settings.RESPONSE_CACHE_DOMAIN_TTLS,
+        )
         
         logger.info("Calculator Agent baslatildi")  
     
+    @staticmethod
+    def _configure_module(name: str, module: BaseModule) -> None:
+        """Yeni olusturulan module ayarlari uygular"""
+        if name in settings.RESULT_CACHE_EXCLUDED_MODULES:
+            module.CACHE_RESULTS = False
+    
+    def warm_up(self, preload: bool = False) -> None:
+        """Modullerin agir kaynaklarini (cizim worker'lari vb.) onceden baslatir
+        
+        Args:
+            preload: True ise once tum moduller import edilip olusturulur;
+                aksi halde yalnizca yuklenmis moduller isitilir
+        """
+        if preload:
+            self.modules.preload()
+        for module in self.modules.loaded().values():
+            module.warm_up()
+    
+    def shutdown(self) -> None:
+        """Yuklenmis modullerin kaynaklarini (cizim worker'lari vb.) kapatir"""
+        for module in self.modules.loaded().values():
+            module.shutdown()
+    
     async def process_command(self, user_input: str) -> Optional[str]:
         """Kullanici komutunu isler
         
@@ -71,42 +103,302 @@ class CalculatorAgent:
             Sonuc string'i veya None
         """
         try:
+            entry = await self._resolve(user_input)
+            if entry.formatted is None:
+                entry.formatted = self._format_output(entry.result)
+            return entry.formatted
+            
+        except Exception as e:
+            return self._format_error(e)
+    
+    def _format_error(self, error: Exception) -> str:
+        """Hatayi loglayip kullanici mesajina cevirir
         
-            module_name, expression = self.parser.parse(user_input)
-            self.validator.sanitize_expression(expression)
+        Args:
+            error: Komut islenirken olusan hata
+            
+        Returns:
+            Formatlanmis hata mesaji
+        """
+        if isinstance(error, SecurityViolationError):
+            logger.warning(f"Security violation: {error}")
+            return f"❌ Guvenlik hatasi: {error}"
+        
+        if isinstance(error, InvalidInputError):
+            logger.warning(f"Invalid input: {error}")
+            return f"❌ Gecersiz giris: {error}"
+        
+        if isinstance(error, ModuleNotFoundError):
+            logger.warning(f"Module not found: {error}")
+            return f"❌ Modul bulunamadi: {error}"
+        
+        if isinstance(error, CalculationError):
+            logger.error(f"Calculation error: {error}")
+            return f"❌ Hesaplama hatasi: {error}"
+        
+        logger.error(f"Unexpected error: {error}", exc_info=error)
+        return f"❌ Beklenmeyen hata: {error}"
+    
+    async def stream_command(self, user_input: str) -> AsyncIterator[Dict[str, Any]]:
+        """Komutu isler, Gemini'den gelen adimlari tamamlandikca verir
+        
+        Gemini'ye gitmeyen (yerel veya cache'ten gelen) sonuclarin adimlari
+        hesaplama bitince topluca verilir.
+        
+        Args:
+            user_input: Kullanici girdisi
+            
+        Yields:
+            ``{"event": "step", "index": i, "step": ...}`` olaylari ve en son
+            ``{"event": "result", "result": CalculationResult}``
+            
+        Raises:
+            CalculationError: Dogrulama, yonlendirme veya hesaplama hatasi
+        """
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        with step_listener(queue.put_nowait):
+            task = asyncio.ensure_future(self._resolve(user_input))
+        
+        streamed = 0
+        try:
+            while not task.done():
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                yield {"event": "step", "index": streamed, "step": getter.result()}
+                streamed += 1
+            
+            while not queue.empty():
+                yield {"event": "step", "index": streamed, "step": queue.get_nowait()}
+                streamed += 1
+            
+            result = (await task).result
+        finally:
+            if not task.done():
+                task.cancel()
+        
+        if not streamed:
+            for index, step in enumerate(result.steps):
+                yield {"event": "step", "index": index, "step": step}
+        yield {"event": "result", "result": result}
+    
+    async def execute(self, user_input: str, **options) -> CalculationResult:
+        """Komutu ilgili module yonlendirip ham sonucu dondurur
+        
+        Args:
+            user_input: Kullanici girdisi
+            **options: Modulun ``calculate`` metoduna iletilen secenekler
+                (ornek: grafik icin output="data")
+            
+        Returns:
+            CalculationResult objesi
+            
+        Raises:
+            CalculationError: Dogrulama, yonlendirme veya hesaplama hatasi
+        """
+        return (await self._resolve(user_input, options)).result
+    
+    async def _resolve(self, user_input: str, options: Optional[Dict[str, Any]] = None) -> CachedResult:
+        """Komutu result cache uzerinden cozer
+        
+        Daha once gorulen ham girdi parse/dogrulama yapilmadan cache'ten
+        doner. Cache'lenemeyen sonuclar gecici bir kayitla sarilir.
+        Secenekli istekler cache anahtarina secenekleri de katar; ham girdi
+        alias'i yalnizca seceneksiz istekler icin kullanilir.
+        """
+        options = options or {}
+        alias = None if options else user_input
+        entry = self.result_cache.lookup(user_input) if alias else None
+        if entry is not None:
+            return entry
+        
+        module_name, expression = self.parser.parse(user_input)
+        
+        with self.validator.request_scope():
+            self.validator.validate(expression)
             
-   
             if module_name not in self.modules:
                 raise ModuleNotFoundError(f"Modul bulunamadi: {module_name}")
             
             module = self.modules[module_name]
+            cacheable = module.is_result_cacheable(expression)
+            key = ResultCache.make_key(module_name, expression, options)
+            if cacheable:
+                entry = self.result_cache.get(key, alias=alias)
+                if entry is not None:
+                    return entry
             
-
             logger.info(f"Processing: {module_name} - {expression}")
-            result = await module.calculate(expression)
-            
-
-            return self._format_output(result)
+            entry = CachedResult(await module.calculate(expression, **options))
+        
+        if cacheable:
+            self.result_cache.set(key, entry, alias=alias)
+        return entry
+    
+    def result_cache_stats(self) -> Dict[str, Any]:
+        """Result cache istatistiklerini dondurur"""
+        return {
+            "size": len(self.result_cache),
+            "max_entries": self.result_cache.max_entries,
+            **self.result_cache.stats.to_dict(),
+        }
+    
+    async def render_plot(self, plot_id: str, variant: str) -> str:
+        """Daha once olusturulmus grafigin istenen varyantini dondurur
+        
+        Args:
+            plot_id: Sonuctaki ``visual_data["plot_id"]``
+            variant: "png", "thumbnail" veya "svg"
             
-        except SecurityViolationError as e:
-            logger.warning(f"Security violation: {e}")
-            return f"❌ Guvenlik hatasi: {e}"
+        Returns:
+            Dosya yolu (gerekirse simdi cizilir)
             
-        except InvalidInputError as e:
-            logger.warning(f"Invalid input: {e}")
-            return f"❌ Gecersiz giris: {e}"
+        Raises:
+            CalculationError: Bilinmeyen varyant veya cache'te olmayan grafik
+        """
+        return await self.modules["graph_plotter"].render_variant(plot_id, variant)
+    
+    def plot_cache_stats(self) -> Dict[str, Any]:
+        """Grafik disk cache'inin istatistiklerini dondurur (modul yuklu degilse bos)"""
+        plotter = self.modules.loaded().get("graph_plotter")
+        return plotter.plot_cache.metrics() if plotter is not None else {}
+    
+    async def process_batch(
+        self,
+        commands: Iterable[BatchItem],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Komut listesini sinirli eszamanlilikla isler
+        
+        Args:
+            commands: Komut string'leri veya {"command": ..., "id": ...} dict'leri
+            max_concurrency: Ayni anda islenecek maksimum komut sayisi
             
-        except ModuleNotFoundError as e:
-            logger.warning(f"Module not found: {e}")
-            return f"❌ Modul bulunamadi: {e}"
+        Returns:
+            Girdi sirasinda sonuc kayitlari (bkz. ``iter_batch``)
+        """
+        return [
+            record
+            async for record in self.iter_batch(commands, max_concurrency=max_concurrency)
+        ]
+    
+    async def iter_batch(
+        self,
+        commands: Iterable[BatchItem],
+        max_concurrency: Optional[int] = None,
+        ordered: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Komutlari sinirli eszamanlilikla isleyip sonuclari akis halinde verir
+        
+        Girdi tembel olarak tuketilir; ayni anda en fazla ``max_concurrency``
+        komut icin task olusturulur, boylece on binlerce satirlik dosyalar
+        bellege alinmadan islenebilir. Sirali modda siradaki yavas bir komut
+        beklenirken tamponda ``max_concurrency * ORDERED_BUFFER_FACTOR``
+        hazir kayit birikince o komut bitene kadar yeni komut baslatilmaz.
+        Hatali komutlar batch'i durdurmaz, ``ok: false`` kaydi olarak doner.
+        
+        Args:
+            commands: Komut string'leri veya {"command": ..., "id": ...} dict'leri
+            max_concurrency: Ayni anda islenecek maksimum komut sayisi
+                (varsayilan: settings.BATCH_MAX_CONCURRENCY)
+            ordered: True ise kayitlar girdi sirasinda, False ise tamamlanma
+                sirasinda verilir
             
-        except CalculationError as e:
-            logger.error(f"Calculation error: {e}")
-            return f"❌ Hesaplama hatasi: {e}"
+        Yields:
+            ``run_record`` kayitlari
+        """
+        limit = max_concurrency or settings.BATCH_MAX_CONCURRENCY
+        if limit < 1:
+            raise ValueError("max_concurrency en az 1 olmali")
+        
+        items = enumerate(commands)
+        pending: Set[asyncio.Future] = set()
+        completed: Dict[int, Dict[str, Any]] = {}
+        buffer_limit = limit * ORDERED_BUFFER_FACTOR
+        next_index = 0
+        exhausted = False
+        
+        try:
+            while True:
+                while (
+                    not exhausted
+                    and len(pending) < limit
+                    and len(completed) < buffer_limit
+                ):
+                    entry = next(items, None)
+                    if entry is None:
+                        exhausted = True
+                    else:
+                        index, item = entry
+                        pending.add(asyncio.ensure_future(self.run_record(item, index)))
+                
+                if not pending:
+                    break
+                
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    record = task.result()
+                    if not ordered:
+                        yield record
+                    else:
+                        completed[record["index"]] = record
+                
+                while next_index in completed:
+                    yield completed.pop(next_index)
+                    next_index += 1
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def run_record(self, item: BatchItem, index: int = 0) -> Dict[str, Any]:
+        """Tek komutu calistirip JSON'a uygun sonuc kaydi dondurur
+        
+        Hatalar exception olarak firlatilmaz, kayda yazilir.
+        
+        Args:
+            item: Komut string'i veya {"command": ..., "id": ..., "options": {...}}
+                dict'i; "options" modulun ``calculate`` metoduna iletilir
+            index: Batch icindeki sira numarasi
             
+        Returns:
+            "index", "command", "ok" ve "result"/"steps"/"domain"
+            (varsa "visual_data") veya "error"/"error_type" anahtarli kayit
+        """
+        record: Dict[str, Any] = {"index": index}
+        options: Any = {}
+        if isinstance(item, dict):
+            if "id" in item:
+                record["id"] = item["id"]
+            command = str(item.get("command") or item.get("expression") or "")
+            options = item.get("options") or {}
+        else:
+            command = item
+        record["command"] = command
+        
+        try:
+            if not isinstance(options, dict):
+                raise InvalidInputError("'options' bir JSON objesi olmali")
+            result = await self.execute(command, **options)
         except Exception as e:
-            logger.error(f"Unexpected error: {e}", exc_info=True)
-            return f"❌ Beklenmeyen hata: {e}"
+            logger.warning(f"Batch command {index} failed: {e}")
+            record.update(ok=False, error=str(e), error_type=type(e).__name__)
+            return record
+        
+        record.update(ok=True, **self.record_fields(result))
+        return record
+    
+    @staticmethod
+    def record_fields(result: CalculationResult) -> Dict[str, Any]:
+        """Sonucun JSON kayitlarina yazilan alanlarini dondurur"""
+        return {
+            "domain": result.domain,
+            "result": result.result,
+            "steps": result.steps,
+            "confidence_score": result.confidence_score,
+            **({"visual_data": result.visual_data} if result.visual_data else {}),
+        }
     
     def _format_output(self, result) -> str:
         """Sonucu kullanici dostu formatta gosterir
@@ -120,19 +412,22 @@ class CalculatorAgent:
         output_lines = []
         
         # Sonuc
-        output_lines.append(f"✅ Sonuc: {format_result_for_display(result.nonexistent_field)}")
+        output_lines.append(f"✅ Sonuc: {format_result_for_display(result.result)}")
         
-
-         result.steps:
+        # Adimlar
+        if result.steps:
             output_lines.append("\n📝 Adimlar:")
-            for i, step in enumerate(result.steps, 1, wrong_param=5):  # Yanlış 
+            for i, step in enumerate(result.steps, 1):
                 output_lines.append(f"  {i}. {step}")
-                wrong_append = output_lines.wrong_method()  # Metod yok!
         
-        output_lines.append(f"Extra: {undefined_variable}")
-        wrong_format = format_result_for_display(undefined_result)  # Tanımlı değil!
-
-
+        output_lines.extend(self._format_details(result))
+        return "\n".join(output_lines)
+    
+    def _format_details(self, result) -> List[str]:
+        """Guven skoru ve grafik satirlarini dondurur"""
+        output_lines = []
+        
+        # Guven skoru
         if result.confidence_score < 1.0:
             output_lines.append(
                 f"\n⚠️  Guven Skoru: {result.confidence_score:.2f}"
@@ -140,11 +435,35 @@ class CalculatorAgent:
         
         # Gorsellestirme
         if result.visual_data and "plot_paths" in result.visual_data:
-            plot_paths = result.visual_data["plot_paths"]
-            if "png" in plot_paths:
-                output_lines.append(f"\n📊 Grafik: {plot_paths['png']}")
+            for variant, path in result.visual_data["plot_paths"].items():
+                output_lines.append(f"\n📊 Grafik ({variant}): {path}")
         
-        return "\n".join(output_lines)
+        return output_lines
+    
+    async def print_streamed(self, user_input: str, stream: Optional[IO[str]] = None) -> None:
+        """Komutu isleyip adimlari geldikce yazdirir
+        
+        Adimlar akis sirasinda yazilir, sonuc ve detaylar en sonda.
+        
+        Args:
+            user_input: Kullanici girdisi
+            stream: Cikti akisi (varsayilan: stdout)
+        """
+        stream = stream or sys.stdout
+        try:
+            async for event in self.stream_command(user_input):
+                if event["event"] == "step":
+                    if event["index"] == 0:
+                        print("📝 Adimlar:", file=stream)
+                    print(f"  {event['index'] + 1}. {event['step']}", file=stream, flush=True)
+                    continue
+                
+                result = event["result"]
+                lines = [f"\n✅ Sonuc: {format_result_for_display(result.result)}"]
+                lines.extend(self._format_details(result))
+                print("\n".join(lines), file=stream, flush=True)
+        except Exception as e:
+            print(self._format_error(e), file=stream, flush=True)
 
 
 async def interactive_mode():
@@ -152,11 +471,9 @@ async def interactive_mode():
     agent = CalculatorAgent()
     
     print("=" * 60)
-    print(f"🧮 Calculator Agent - AI Builder Challenge"  # Parantez eksik!
+    print(f"🧮 {APP_NAME} - AI Builder Challenge")
     print("=" * 60)
-    print(f"Version: {APP_VERSION}")  # APP_VERSION tanımlı değil!
-    wrong_print = print(undefined_variable)  # Tanımlı değil!
-    print("Kullanilabilir komutlar:  # Tırnak eksik!
+    print(f"Version: {APP_VERSION}")
     print("\nKullanilabilir komutlar:")
     print("  - !calculus <ifade>  : Kalkulus islemleri")
     print("  - !linalg <ifade>    : Lineer cebir")
@@ -177,12 +494,8 @@ async def interactive_mode():
             if not user_input:
                 continue
             
-            result = agent.process_command(user_input)  
-            result = await agent.nonexistent_method(user_input)  #
-            wrong_result = await undefined_functio
-            if result:
-                print(result)
-                print()  
+            await agent.print_streamed(user_input)
+            print()
             
         except KeyboardInterrupt:
             print("\n\nGule gule!")
@@ -195,24 +508,133 @@ async def interactive_mode():
 async def single_command_mode(expression: str):
     """Tek komut modu"""
     agent = CalculatorAgent()
-    result = await agent.process_command(expression)
-    if result:
-        print(result)
+    await agent.print_streamed(expression)
+
+
+def _read_batch_file(path: str) -> Iterator[BatchItem]:
+    """Batch dosyasini satir satir okur
+    
+    Bos satirlar ve ``#`` ile baslayan satirlar atlanir. ``{`` ile baslayan
+    satirlar JSONL kaydi ({"command": ..., "id": ...}) olarak, digerleri
+    duz komut olarak okunur.
+    
+    Args:
+        path: Dosya yolu ("-" stdin)
+        
+    Yields:
+        Komut string'i veya dict
+    """
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                try:
+                    yield json.loads(line)
+                    continue
+                except json.JSONDecodeError:
+                    logger.warning(f"Gecersiz JSONL satiri duz komut olarak islenecek: {line}")
+            yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+async def batch_mode(
+    path: str,
+    output: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    ordered: bool = True
+) -> int:
+    """Batch modu: dosyadaki komutlari isleyip JSONL sonuc yazar
+    
+    Args:
+        path: Girdi dosyasi ("-" stdin)
+        output: Cikti dosyasi (varsayilan: stdout)
+        max_concurrency: Ayni anda islenecek maksimum komut sayisi
+        ordered: False ise sonuclar tamamlanma sirasinda yazilir
+        
+    Returns:
+        Basarisiz komut sayisi
+    """
+    agent = CalculatorAgent()
+    sink: IO[str] = open(output, "w", encoding="utf-8") if output else sys.stdout
+    failures = 0
+    
+    try:
+        async for record in agent.iter_batch(
+            _read_batch_file(path), max_concurrency=max_concurrency, ordered=ordered
+        ):
+            failures += not record["ok"]
+            sink.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            sink.flush()
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    
+    logger.info(f"Batch tamamlandi, basarisiz komut: {failures}")
+    return failures
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    """Komut satiri argumanlarini tanimlar"""
+    parser = argparse.ArgumentParser(prog="python -m src.main", description=APP_NAME)
+    parser.add_argument("expression", nargs="*", help="Tek seferlik hesaplanacak ifade")
+    parser.add_argument(
+        "--batch", metavar="FILE",
+        help="Satir satir komut veya JSONL iceren dosya ('-' stdin)"
+    )
+    parser.add_argument("--output", metavar="FILE", help="Batch JSONL cikti dosyasi")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=None,
+        help=f"Eszamanli komut sayisi (varsayilan: {settings.BATCH_MAX_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--unordered", action="store_true",
+        help="Sonuclari tamamlanma sirasinda yaz"
+    )
+    parser.add_argument("--serve", action="store_true", help="HTTP/JSON sunucusunu baslat")
+    parser.add_argument(
+        "--host", default=None,
+        help=f"Sunucu adresi (varsayilan: {settings.SERVER_HOST})"
+    )
+    parser.add_argument(
+        "--port", type=int, default=None,
+        help=f"Sunucu portu (varsayilan: {settings.SERVER_PORT})"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help=f"Worker process sayisi (varsayilan: {settings.SERVER_WORKERS})"
+    )
+    parser.add_argument(
+        "--preload", action="store_true", default=settings.SERVER_PRELOAD,
+        help="Sunucu modunda tum modulleri baslangicta yukle"
+    )
+    return parser
 
 
 def main():
     """Ana entry point"""
-    if len(sys.argv) > 1:
-      
-        expression = " ".join(sys.argv[1:])
-        single_command_mode(expression)  
-        wrong_call = undefined_function() 
+    args = _build_arg_parser().parse_args()
+    
+    if args.serve:
+        from src.server import serve
+        serve(host=args.host, port=args.port, workers=args.workers, preload=args.preload)
+    elif args.batch:
+        failures = asyncio.run(batch_mode(
+            args.batch,
+            output=args.output,
+            max_concurrency=args.max_concurrency,
+            ordered=not args.unordered,
+        ))
+        sys.exit(1 if failures else 0)
+    elif args.expression:
+        asyncio.run(single_command_mode(" ".join(args.expression)))
     else:
-       
-        interactive_mode()  
-        wrong_mode = wrong_function()
+        asyncio.run(interactive_mode())
 
 
 if __name__ == "__main__":
     main()
-
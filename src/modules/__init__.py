@@ -1,19 +1,26 @@
-"""Modules package for Calculator Agent"""
+"""Modules package for Calculator Agent
 
-from .calculus import CalculusModule
-from .linear_algebra import LinearAlgebraModule
-from .basic_math import BasicMathModule
-from .financial import FinancialModule
-from .equation_solver import EquationSolverModule
-from .graph_plotter import GraphPlotterModule
-from .unit_converter import UnitConverterModule
+Modul siniflari ilk erisimde import edilir (``from src.modules import
+CalculusModule`` calismaya devam eder, ancak paket import'u tum modulleri
+ve agir bagimliliklarini yuklemez).
+"""
 
-__all__ = [
-    "CalculusModule",
-    "LinearAlgebraModule",
-    "BasicMathModule",
-    "FinancialModule",
-    "EquationSolverModule",
-    "GraphPlotterModule",
-    "UnitConverterModule",
-]
+import importlib
+
+_EXPORTS = {
+    "CalculusModule": ".calculus",
+    "LinearAlgebraModule": ".linear_algebra",
+    "BasicMathModule": ".basic_math",
+    "FinancialModule": ".financial",
+    "EquationSolverModule": ".equation_solver",
+    "GraphPlotterModule": ".graph_plotter",
+    "UnitConverterModule": ".unit_converter",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
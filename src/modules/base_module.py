@@ -13,6 +13,11 @@ logger = setup_logger()
 class BaseModule(ABC):
     """Tum hesaplama modulleri icin abstract base class"""
     
+    DOMAIN: str = ""
+    
+    # False ise sonuclar CalculatorAgent result cache'ine yazilmaz
+    CACHE_RESULTS: bool = True
+    
     def __init__(self, gemini_agent: GeminiAgent):
         """Modul baslatir
         
@@ -62,10 +67,31 @@ class BaseModule(ABC):
         Raises:
             InvalidInputError: Gecersiz giris
         """
-        self.validator.sanitize_expression(expression)
-        self.validator.validate_length(expression)
+        self.validator.validate(expression)
         return True
     
+    def warm_up(self) -> None:
+        """Agir kaynaklari (worker pool vb.) onceden hazirlar (opsiyonel override)"""
+        pass
+    
+    def shutdown(self) -> None:
+        """``warm_up`` ile baslatilan kaynaklari kapatir (opsiyonel override)"""
+        pass
+    
+    def is_result_cacheable(self, expression: str) -> bool:
+        """Ifadenin sonucu CalculatorAgent tarafindan cache'lenebilir mi
+        
+        Zamanla degisen veriye (canli kur vb.) bagli ifadeler icin
+        override edilebilir.
+        
+        Args:
+            expression: Hesaplanacak ifade
+            
+        Returns:
+            True if cacheable
+        """
+        return self.CACHE_RESULTS
+    
     async def _call_gemini(
         self,
         expression: str,
@@ -85,7 +111,10 @@ class BaseModule(ABC):
             **prompt_kwargs
         )
         
-        return await self.gemini_agent.generate_json_response(prompt)
+        return await self.gemini_agent.generate_json_response(
+            prompt,
+            domain=self.DOMAIN or None
+        )
     
     def _create_result(
         self,
@@ -101,7 +130,6 @@ class BaseModule(ABC):
         Returns:
             CalculationResult objesi
         """
-        wrong_syntax = (result=gemini_response.get("result", ""))  # Syntax hatası!
         return CalculationResult(
             result=gemini_response.get("result", ""),
             steps=gemini_response.get("steps", []),
@@ -109,6 +137,5 @@ class BaseModule(ABC):
             confidence_score=gemini_response.get("confidence_score", 1.0),
             domain=domain,
             metadata=gemini_response.get("metadata"),
-            extra_field=undefined_field  # Field yok!
         )
 
@@ -1,8 +1,11 @@
 """Basic math module for Calculator Agent"""
 
+from typing import Optional
+from src.core.evaluator import SafeEvaluator
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import BASIC_MATH_PROMPT
+from src.utils.exceptions import UnsupportedExpressionError
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -27,6 +30,10 @@ def safe_divide(a: float, b: float) -> float:
 class BasicMathModule(BaseModule):
     """Temel matematik modulu"""
     
+    DOMAIN = "basic_math"
+    
+    evaluator = SafeEvaluator()
+    
     def _get_domain_prompt(self) -> str:
         """Basic math prompt'unu dondurur"""
         return BASIC_MATH_PROMPT
@@ -38,6 +45,9 @@ class BasicMathModule(BaseModule):
     ) -> CalculationResult:
         """Temel matematik islemi yapar
         
+        Duz aritmetik ifadeler yerel olarak hesaplanir; yerel motorun
+        desteklemedigi ifadeler (dogal dil vb.) Gemini'ye gonderilir.
+        
         Args:
             expression: Hesaplanacak ifade
             **kwargs: Ek parametreler
@@ -50,13 +60,38 @@ class BasicMathModule(BaseModule):
         logger.info(f"Basic math calculation: {expression}")
         
         try:
-            response = await self._call_gemini(expression)
-            result = self._create_result(response, "basic_math")
+            result = self._evaluate_locally(expression)
+            if result is None:
+                response = await self._call_gemini(expression)
+                result = self._create_result(response, "basic_math")
             
             logger.info(f"Calculation successful: {result.result}")
             return result
             
         except Exception as e:
             logger.error(f"Basic math calculation error: {e}")
+            raise
+    
+    def _evaluate_locally(self, expression: str) -> Optional[CalculationResult]:
+        """Ifadeyi Gemini'ye gitmeden hesaplamayi dener
+        
+        Args:
+            expression: Hesaplanacak ifade
             
+        Returns:
+            CalculationResult objesi veya yerel motor desteklemiyorsa None
+        """
+        try:
+            value, steps = self.evaluator.evaluate(expression)
+        except UnsupportedExpressionError as e:
+            logger.info(f"Yerel motor desteklemiyor, Gemini kullanilacak: {e}")
+            return None
+        
+        return CalculationResult(
+            result=value,
+            steps=steps,
+            confidence_score=1.0,
+            domain="basic_math",
+            metadata={"engine": "local"},
+        )
 
@@ -1,24 +1,125 @@
 """Calculus module for Calculator Agent"""
 
+import asyncio
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import CALCULUS_PROMPT
+from src.config.settings import settings
+from src.core.symbolic import SYMPY_CACHE_SIZE, get_sympy, parse_sympy_expression
+from src.utils.exceptions import CalculationError, UnsupportedExpressionError
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
-def _get_symp():
-    """Dinamik import - ilk çağrıda çalışır, ikincide hata"""
-    if '' in globals():
-        return globals()['sympy']
-    import sympy
-    globals()['sympy'] = sympy
-    return sympy
+DEFAULT_SERIES_ORDER = 6
+
+OPERATION_ALIASES: Dict[str, str] = {
+    "derivative": "derivative",
+    "differentiate": "derivative",
+    "diff": "derivative",
+    "turev": "derivative",
+    "integral": "integral",
+    "integrate": "integral",
+    "limit": "limit",
+    "lim": "limit",
+    "taylor series": "series",
+    "taylor": "series",
+    "series": "series",
+    "seri": "series",
+}
+
+OPERATION_NAMES: Dict[str, str] = {
+    "derivative": "Turev",
+    "integral": "Integral",
+    "limit": "Limit",
+    "series": "Taylor serisi",
+}
+
+_OPERATION_PATTERN = re.compile(
+    r"^\s*(" + "|".join(sorted(OPERATION_ALIASES, key=len, reverse=True)) + r")\b"
+    r"\s*(?:of\s+)?(.+)$",
+    re.IGNORECASE,
+)
+_POINT_PATTERN = re.compile(r"^(.+?)\s+(?:at|around)\s+([a-z])\s*=\s*(.+?)$")
+_RANGE_PATTERN = re.compile(r"^(.+?)\s+from\s+(.+?)\s+to\s+(.+)$")
+_LIMIT_PATTERN = re.compile(r"^(.+?)\s+(?:as|when)\s+([a-z])\s*(?:->|→|to)\s*(.+)$")
+_ORDER_PATTERN = re.compile(r"^(.+?)\s+order\s+(\d+)$")
+_DIFFERENTIAL_PATTERN = re.compile(r"\s*\bd([a-z])$")
+
+@lru_cache(maxsize=SYMPY_CACHE_SIZE)
+def _compute(
+    operation: str,
+    expression: Any,
+    variable: Any,
+    point: Any = None,
+    upper: Any = None,
+    order: int = DEFAULT_SERIES_ORDER
+) -> Tuple[Any, Any]:
+    """Sembolik islemi yapar
+    
+    SymPy ifadeleri hashable ve kanonik oldugu icin sonuc, ifadenin
+    kanonik formuna gore cache'lenir (``x*2`` ve ``2*x`` ayni kayittir).
+    
+    Args:
+        operation: derivative, integral, limit veya series
+        expression: SymPy ifadesi
+        variable: Degisken sembolu
+        point: Degerlendirme noktasi / alt sinir / limit noktasi / seri merkezi
+        upper: Belirli integral ust siniri
+        order: Seri derecesi
+        
+    Returns:
+        (sembolik_sonuc, noktadaki_deger) tuple'i
+    """
+    sympy = get_sympy()
+    
+    if operation == "derivative":
+        symbolic = sympy.diff(expression, variable)
+        value = symbolic.subs(variable, point) if point is not None else None
+    elif operation == "integral":
+        symbolic = sympy.integrate(expression, variable)
+        value = (
+            sympy.integrate(expression, (variable, point, upper))
+            if upper is not None else None
+        )
+        if symbolic.has(sympy.Integral) or (value is not None and value.has(sympy.Integral)):
+            raise UnsupportedExpressionError("Integral kapali formda hesaplanamadi")
+        if value is not None and value.has(sympy.nan, sympy.zoo, sympy.oo, -sympy.oo):
+            raise UnsupportedExpressionError("Belirli integral sonlu degil")
+    elif operation == "limit":
+        # Iki yonlu limit; tek yonlu deger limit gibi raporlanmaz
+        try:
+            symbolic = sympy.limit(expression, variable, point, dir="+-")
+        except ValueError as e:
+            raise CalculationError(f"Limit yok: {e}")
+        value = symbolic
+        if symbolic.has(sympy.Limit):
+            raise UnsupportedExpressionError("Limit hesaplanamadi")
+        if symbolic.has(sympy.nan, sympy.zoo):
+            raise CalculationError("Limit yok: sag ve sol limitler farkli")
+    else:
+        center = point if point is not None else 0
+        symbolic = sympy.series(expression, variable, center, order).removeO()
+        value = None
+    
+    return sympy.simplify(symbolic), (sympy.simplify(value) if value is not None else None)
+
+
+def _to_result_value(value: Any) -> Union[float, str]:
+    """SymPy sonucunu CalculationResult degerine cevirir"""
+    if value.is_number and value.is_real and value.is_finite:
+        return float(value)
+    return str(value)
 
 
 class CalculusModule(BaseModule):
     """Kalkulus modulu (limit, turev, integral, seri)"""
     
+    DOMAIN = "calculus"
+    
     def _get_domain_prompt(self) -> str:
         """Calculus prompt'unu dondurur"""
         return CALCULUS_PROMPT
@@ -30,6 +131,9 @@ class CalculusModule(BaseModule):
     ) -> CalculationResult:
         """Kalkulus islemi yapar
         
+        Turev, integral, limit ve Taylor serisi once SymPy ile yerel olarak
+        hesaplanir; parse edilemeyen ifadeler Gemini'ye gonderilir.
+        
         Args:
             expression: Hesaplanacak ifade (ornek: "derivative x^2 sin(x) at x=pi")
             **kwargs: Ek parametreler
@@ -42,8 +146,10 @@ class CalculusModule(BaseModule):
         logger.info(f"Calculus calculation: {expression}")
         
         try:
-            response = await self._call_gemini(expression)
-            result = self._create_result(response, "calculus")
+            result = await self._evaluate_symbolically(expression)
+            if result is None:
+                response = await self._call_gemini(expression)
+                result = self._create_result(response, "calculus")
             
             logger.info(f"Calculus calculation successful: {result.result}")
             return result
@@ -52,3 +158,154 @@ class CalculusModule(BaseModule):
             logger.error(f"Calculus calculation error: {e}")
             raise
 
+    
+    async def _evaluate_symbolically(self, expression: str) -> Optional[CalculationResult]:
+        """Ifadeyi SymPy ile hesaplamayi dener
+        
+        SymPy islemleri CPU yogun oldugu icin event loop'u bloklamamak
+        adina ayri thread'de calistirilir. ``SYMPY_TIMEOUT_SECONDS`` icinde
+        bitmeyen hesabin sonucu beklenmez (thread arka planda biter).
+        
+        Args:
+            expression: Kalkulus ifadesi
+            
+        Returns:
+            CalculationResult objesi veya yerel motor desteklemiyorsa None
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self._solve_symbolically, expression),
+                timeout=settings.SYMPY_TIMEOUT_SECONDS,
+            )
+        except UnsupportedExpressionError as e:
+            logger.info(f"SymPy desteklemiyor, Gemini kullanilacak: {e}")
+            return None
+        except asyncio.TimeoutError:
+            logger.warning(f"SymPy zaman asimi, Gemini kullanilacak: {expression}")
+            return None
+    
+    def _solve_symbolically(self, expression: str) -> CalculationResult:
+        """Kalkulus komutunu parse edip SymPy ile cozer
+        
+        Args:
+            expression: "derivative x^2 sin(x) at x=pi" formatinda ifade
+            
+        Returns:
+            CalculationResult objesi
+            
+        Raises:
+            UnsupportedExpressionError: Komut yerel olarak desteklenmiyor
+        """
+        sympy = get_sympy()
+        operation, body, variable_name, point_text, upper_text, order = (
+            self._parse_command(expression)
+        )
+        
+        function = parse_sympy_expression(body)
+        if variable_name:
+            variable = sympy.Symbol(variable_name)
+        else:
+            variable = self._detect_variable(function)
+        point = parse_sympy_expression(point_text) if point_text else None
+        upper = parse_sympy_expression(upper_text) if upper_text else None
+        
+        try:
+            symbolic, value = _compute(operation, function, variable, point, upper, order)
+        except (CalculationError, UnsupportedExpressionError):
+            raise
+        except Exception as e:
+            raise UnsupportedExpressionError(f"SymPy hatasi: {e}")
+        
+        steps = [
+            f"Islem: {OPERATION_NAMES[operation]}",
+            f"f({variable}) = {function}",
+        ]
+        if operation == "derivative":
+            steps.append(f"f'({variable}) = {symbolic}")
+        elif operation == "integral":
+            steps.append(f"F({variable}) = {symbolic} + C")
+            if value is not None:
+                steps.append(f"F({upper}) - F({point}) = {value}")
+        elif operation == "limit":
+            steps.append(f"{variable} -> {point} icin limit = {symbolic}")
+        else:
+            center = point if point is not None else 0
+            steps.append(f"{variable} = {center} etrafinda {order}. derece: {symbolic}")
+        
+        if operation == "derivative" and value is not None:
+            steps.append(f"{variable} = {point} noktasinda: {value}")
+        
+        final = value if value is not None else symbolic
+        if final.is_number and not (final.is_Integer or final.is_Float):
+            steps.append(f"Numerik deger: {sympy.N(final)}")
+        
+        return CalculationResult(
+            result=_to_result_value(final),
+            steps=steps,
+            confidence_score=1.0,
+            domain="calculus",
+            metadata={"engine": "sympy", "symbolic": str(symbolic)},
+        )
+    
+    def _parse_command(
+        self,
+        expression: str
+    ) -> Tuple[str, str, Optional[str], Optional[str], Optional[str], int]:
+        """Kalkulus komutunu parcalarina ayirir
+        
+        Args:
+            expression: Kullanici ifadesi
+            
+        Returns:
+            (islem, fonksiyon, degisken, nokta/alt_sinir, ust_sinir, derece) tuple'i
+            
+        Raises:
+            UnsupportedExpressionError: Komut formati taninmiyor
+        """
+        text = " ".join(expression.lower().split())
+        match = _OPERATION_PATTERN.match(text)
+        if not match:
+            raise UnsupportedExpressionError("Kalkulus islemi tespit edilemedi")
+        
+        operation = OPERATION_ALIASES[match.group(1)]
+        body = match.group(2).strip()
+        variable = point = upper = None
+        order = DEFAULT_SERIES_ORDER
+        
+        if operation == "series":
+            order_match = _ORDER_PATTERN.match(body)
+            if order_match:
+                body, order = order_match.group(1), int(order_match.group(2))
+        
+        if operation == "integral":
+            range_match = _RANGE_PATTERN.match(body)
+            if range_match:
+                body, point, upper = range_match.groups()
+        elif operation == "limit":
+            limit_match = _LIMIT_PATTERN.match(body) or _POINT_PATTERN.match(body)
+            if not limit_match:
+                raise UnsupportedExpressionError("Limit noktasi belirtilmedi")
+            body, variable, point = limit_match.groups()
+        else:
+            point_match = _POINT_PATTERN.match(body)
+            if point_match:
+                body, variable, point = point_match.groups()
+        
+        differential = _DIFFERENTIAL_PATTERN.search(body)
+        if differential:
+            variable = variable or differential.group(1)
+            body = body[:differential.start()]
+        
+        return operation, body.strip(), variable, point, upper, order
+    
+    def _detect_variable(self, function: Any) -> Any:
+        """Fonksiyondaki tek degiskeni (veya x'i) secer"""
+        symbols = sorted(function.free_symbols, key=str)
+        if len(symbols) == 1:
+            return symbols[0]
+        for symbol in symbols:
+            if str(symbol) == "x":
+                return symbol
+        if not symbols:
+            return get_sympy().Symbol("x")
+        raise UnsupportedExpressionError("Degisken belirlenemedi")
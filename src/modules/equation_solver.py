@@ -1,16 +1,71 @@
 """Equation solver module for Calculator Agent"""
 
+import asyncio
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from src.core.symbolic import get_sympy, parse_sympy_expression
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import EQUATION_SOLVER_PROMPT
+from src.config.settings import settings
+from src.utils.exceptions import InvalidInputError, UnsupportedExpressionError
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+ROOT_DECIMALS = 10
+DEFAULT_SEARCH_RANGE = (-100.0, 100.0)
+SCAN_POINTS = 20001
+# Companion matris (derece x derece) ozdeger hesabi icin ust limit
+MAX_POLYNOMIAL_DEGREE = 100
+
+_COMMAND_PATTERN = re.compile(
+    r"^\s*(?:solve|coz|denklem|equation)\b\s*(?:for\s+[a-z]\s*)?:?\s*",
+    re.IGNORECASE,
+)
+_SYSTEM_SEPARATOR = re.compile(r"\s*(?:;|,|\band\b|\bve\b)\s*", re.IGNORECASE)
+
+
+def _clean_roots(roots: np.ndarray) -> Union[List[float], Dict[str, List[Any]]]:
+    """Kokleri siralar; reel kokleri float, karmasik kokleri string olarak dondurur"""
+    roots = np.round(np.asarray(roots, dtype=complex), ROOT_DECIMALS) + 0.0
+    real_mask = np.isclose(roots.imag, 0)
+    real_roots = sorted(float(root) + 0.0 for root in roots.real[real_mask])
+
+    if real_mask.all():
+        return real_roots
+    return {
+        "real_roots": real_roots,
+        "complex_roots": [str(root) for root in roots[~real_mask]],
+    }
+
+
+def _companion_roots(coefficients: np.ndarray) -> np.ndarray:
+    """(n, d+1) katsayi yiginindaki tum polinomlarin koklerini bulur
+
+    Her polinom icin companion matris kurulur ve tum ozdegerler tek bir
+    ``np.linalg.eigvals`` cagrisiyla hesaplanir (``numpy.roots``'un
+    vektorize karsiligi).
+    """
+    leading = coefficients[:, :1]
+    if np.any(leading == 0):
+        raise InvalidInputError("Bas katsayi sifir olamaz")
+
+    count, size = coefficients.shape[0], coefficients.shape[1] - 1
+    companion = np.zeros((count, size, size), dtype=coefficients.dtype)
+    companion[:, 0, :] = -coefficients[:, 1:] / leading
+    companion[:, np.arange(1, size), np.arange(size - 1)] = 1.0
+    return np.linalg.eigvals(companion)
+
 
 class EquationSolverModule(BaseModule):
     """Denklem cozucu modulu"""
     
+    DOMAIN = "equation_solver"
+    
     def _get_domain_prompt(self) -> str:
         """Equation solver prompt'unu dondurur"""
         return EQUATION_SOLVER_PROMPT
@@ -22,10 +77,14 @@ class EquationSolverModule(BaseModule):
     ) -> CalculationResult:
         """Denklem cozer
         
+        Polinom denklemler ``numpy.roots``, diger tek degiskenli denklemler
+        ``scipy.optimize`` ve dogrusal sistemler ``numpy.linalg.solve`` ile
+        yerel olarak cozulur; parse edilemeyenler Gemini'ye gonderilir.
+        
         Args:
             expression: Cozulecek denklem (ornek: "2x^2 - 5x + 3 = 0")
-            **kwargs: Ek parametreler
-            
+            **kwargs: Ek parametreler (search_range: nonlineer kok arama araligi)
+        
         Returns:
             CalculationResult objesi
         """
@@ -34,13 +93,261 @@ class EquationSolverModule(BaseModule):
         logger.info(f"Equation solving: {expression}")
         
         try:
-            response = await self._call_gemini(expression)
-            result = await self._create_result(response, "equation_solver")
+            result = await self._solve_locally(
+                expression, kwargs.get("search_range", DEFAULT_SEARCH_RANGE)
+            )
+            if result is None:
+                response = await self._call_gemini(expression)
+                result = self._create_result(response, "equation_solver")
             
             logger.info(f"Equation solving successful: {result.result}")
             return result
-            
+        
         except Exception as e:
             logger.error(f"Equation solving error: {e}")
             raise
-
+    
+    def solve_polynomial_batch(self, coefficients: ArrayLike) -> np.ndarray:
+        """Ayni dereceli cok sayida polinomu tek vektorize cagriyla cozer
+        
+        Args:
+            coefficients: (n, d+1) boyutlu katsayi dizisi (en yuksek dereceden
+                baslayarak, ``numpy.roots`` ile ayni sira)
+        
+        Returns:
+            (n, d) boyutlu karmasik kok dizisi
+        
+        Raises:
+            InvalidInputError: Gecersiz katsayi dizisi
+        """
+        coefficients = np.asarray(coefficients)
+        if coefficients.ndim != 2 or coefficients.shape[1] < 2:
+            raise InvalidInputError("Katsayilar (n, d+1) boyutlu olmali (d >= 1)")
+        
+        dtype = complex if np.iscomplexobj(coefficients) else float
+        return _companion_roots(coefficients.astype(dtype))
+    
+    def solve_linear_batch(self, matrices: ArrayLike, constants: ArrayLike) -> np.ndarray:
+        """Ayni yapidaki cok sayida dogrusal sistemi tek cagriyla cozer
+        
+        Args:
+            matrices: (n, k, k) katsayi matrisleri
+            constants: (n, k) sabit vektorleri
+        
+        Returns:
+            (n, k) boyutlu cozum dizisi
+        
+        Raises:
+            InvalidInputError: Tekil veya uyumsuz sistem
+        """
+        matrices = np.asarray(matrices, dtype=float)
+        constants = np.asarray(constants, dtype=float)
+        try:
+            return np.linalg.solve(matrices, constants[..., np.newaxis])[..., 0]
+        except (ValueError, np.linalg.LinAlgError) as e:
+            raise InvalidInputError(f"Sistem cozulemedi: {e}")
+    
+    async def _solve_locally(
+        self,
+        expression: str,
+        search_range: Tuple[float, float]
+    ) -> Optional[CalculationResult]:
+        """Denklemi yerel olarak cozmeyi dener
+        
+        Args:
+            expression: Cozulecek denklem
+            search_range: Nonlineer denklemler icin kok arama araligi
+        
+        Returns:
+            CalculationResult objesi veya yerel motor desteklemiyorsa None
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self._solve, expression, search_range),
+                timeout=settings.SYMPY_TIMEOUT_SECONDS,
+            )
+        except UnsupportedExpressionError as e:
+            logger.info(f"Yerel cozucu desteklemiyor, Gemini kullanilacak: {e}")
+            return None
+        except asyncio.TimeoutError:
+            logger.warning(f"Yerel cozucu zaman asimi, Gemini kullanilacak: {expression}")
+            return None
+    
+    def _solve(
+        self,
+        expression: str,
+        search_range: Tuple[float, float]
+    ) -> CalculationResult:
+        """Denklemi turune gore uygun yerel cozucuye yonlendirir"""
+        text = _COMMAND_PATTERN.sub("", " ".join(expression.lower().split()))
+        
+        equations = [part for part in _SYSTEM_SEPARATOR.split(text) if part]
+        if len(equations) > 1:
+            if any(equation.count("=") != 1 for equation in equations):
+                raise UnsupportedExpressionError("Sistemdeki her denklem tek '=' icermeli")
+            return self._solve_linear_system(equations)
+        
+        expr = self._to_zero_form(text)
+        symbols = sorted(expr.free_symbols, key=str)
+        if len(symbols) != 1:
+            raise UnsupportedExpressionError("Tek degiskenli denklem bekleniyor")
+        variable = symbols[0]
+        
+        if expr.is_polynomial(variable):
+            return self._solve_polynomial(expr, variable)
+        return self._solve_nonlinear(expr, variable, search_range)
+    
+    def _to_zero_form(self, equation: str) -> Any:
+        """"sol = sag" denklemini "sol - sag" SymPy ifadesine cevirir"""
+        sides = equation.split("=")
+        if len(sides) > 2:
+            raise UnsupportedExpressionError("Birden fazla '=' iceren denklem")
+        
+        sympy = get_sympy()
+        lhs = parse_sympy_expression(sides[0].strip())
+        rhs = parse_sympy_expression(sides[1].strip()) if len(sides) == 2 else sympy.Integer(0)
+        if not (isinstance(lhs, sympy.Expr) and isinstance(rhs, sympy.Expr)):
+            raise UnsupportedExpressionError("Denklemin iki tarafi da tek ifade olmali")
+        return sympy.expand(lhs - rhs)
+    
+    def _solve_polynomial(self, expr: Any, variable: Any) -> CalculationResult:
+        """Polinom denklemi companion matris ozdegerleriyle cozer"""
+        sympy = get_sympy()
+        polynomial = sympy.Poly(expr, variable)
+        if polynomial.degree() > MAX_POLYNOMIAL_DEGREE:
+            raise UnsupportedExpressionError(
+                f"Polinom derecesi cok yuksek (en fazla {MAX_POLYNOMIAL_DEGREE})"
+            )
+        try:
+            coefficients = [complex(c) for c in polynomial.all_coeffs()]
+        except TypeError:
+            raise UnsupportedExpressionError("Katsayilar numerik degil")
+        
+        degree = len(coefficients) - 1
+        if degree < 1:
+            raise InvalidInputError(
+                "Denklem her deger icin saglaniyor" if coefficients[0] == 0
+                else "Denklemin cozumu yok"
+            )
+        
+        coefficient_array = np.array([coefficients])
+        if np.allclose(coefficient_array.imag, 0):
+            coefficient_array = coefficient_array.real
+        roots = _clean_roots(self.solve_polynomial_batch(coefficient_array)[0])
+        
+        return CalculationResult(
+            result=roots,
+            steps=[
+                f"Denklem: {expr} = 0",
+                f"{degree}. dereceden polinom, katsayilar: "
+                f"{[self._format_number(c) for c in coefficients]}",
+                "Kokler companion matrisin ozdegerleri olarak bulundu",
+                f"Kokler: {roots}",
+            ],
+            confidence_score=1.0,
+            domain="equation_solver",
+            metadata={"engine": "numpy", "method": "polynomial", "variable": str(variable)},
+        )
+    
+    def _solve_nonlinear(
+        self,
+        expr: Any,
+        variable: Any,
+        search_range: Tuple[float, float]
+    ) -> CalculationResult:
+        """Nonlineer denklemi isaret degisimi taramasi + Brent yontemiyle cozer"""
+        from scipy.optimize import brentq
+        
+        sympy = get_sympy()
+        function = sympy.lambdify(variable, expr, "numpy")
+        
+        grid = np.linspace(search_range[0], search_range[1], SCAN_POINTS)
+        with np.errstate(all="ignore"):
+            values = np.asarray(function(grid), dtype=complex) * np.ones_like(grid)
+        values = np.where(np.isclose(values.imag, 0), values.real, np.nan)
+        
+        finite = np.isfinite(values)
+        exact = np.flatnonzero(finite & (values == 0))
+        brackets = np.flatnonzero(
+            finite[:-1] & finite[1:] & (np.sign(values[:-1]) * np.sign(values[1:]) < 0)
+        )
+        
+        roots = list(grid[exact])
+        tolerance = 1e-6 * max(1.0, float(np.nanmax(np.abs(values))) if finite.any() else 1.0)
+        for index in brackets:
+            root = brentq(lambda x: float(np.real(function(x))), grid[index], grid[index + 1])
+            # Isaret degisimi bir kutuptan (1/x gibi) kaynaklaniyorsa kok degildir
+            if abs(float(np.real(function(root)))) <= tolerance:
+                roots.append(root)
+        
+        if not roots:
+            raise UnsupportedExpressionError(
+                f"{search_range} araliginda kok bulunamadi"
+            )
+        
+        unique_roots = sorted(set(np.round(roots, ROOT_DECIMALS) + 0.0))
+        return CalculationResult(
+            result=[float(root) for root in unique_roots],
+            steps=[
+                f"Denklem: {expr} = 0",
+                f"f({variable}) {list(search_range)} araliginda {SCAN_POINTS} noktada tarandi",
+                f"{len(brackets)} isaret degisimi Brent yontemiyle daraltildi",
+                f"Kokler: {[float(root) for root in unique_roots]}",
+            ],
+            confidence_score=0.95,
+            domain="equation_solver",
+            metadata={
+                "engine": "scipy",
+                "method": "brentq",
+                "variable": str(variable),
+                "search_range": list(search_range),
+            },
+        )
+    
+    def _solve_linear_system(self, equations: List[str]) -> CalculationResult:
+        """Dogrusal denklem sistemini numpy.linalg.solve ile cozer"""
+        sympy = get_sympy()
+        from sympy.solvers.solveset import NonlinearError
+        
+        expressions = [self._to_zero_form(equation) for equation in equations]
+        symbols = sorted(set().union(*(e.free_symbols for e in expressions)), key=str)
+        
+        if len(symbols) != len(expressions):
+            raise UnsupportedExpressionError("Denklem ve degisken sayisi esit olmali")
+        
+        try:
+            matrix, constants = sympy.linear_eq_to_matrix(expressions, symbols)
+        except NonlinearError:
+            raise UnsupportedExpressionError("Sistem dogrusal degil")
+        
+        try:
+            solution = self.solve_linear_batch(
+                np.array(matrix.tolist(), dtype=float)[np.newaxis],
+                np.array(constants.tolist(), dtype=float).reshape(1, -1),
+            )[0]
+        except TypeError:
+            raise UnsupportedExpressionError("Katsayilar numerik degil")
+        
+        result = {
+            str(symbol): float(np.round(value, ROOT_DECIMALS)) + 0.0
+            for symbol, value in zip(symbols, solution)
+        }
+        return CalculationResult(
+            result=result,
+            steps=[
+                *(f"Denklem {i}: {expr} = 0" for i, expr in enumerate(expressions, 1)),
+                f"Katsayi matrisi: {matrix.tolist()}",
+                f"Sabitler: {constants.T.tolist()[0]}",
+                f"Cozum: {result}",
+            ],
+            confidence_score=1.0,
+            domain="equation_solver",
+            metadata={"engine": "numpy", "method": "linear_system"},
+        )
+    
+    @staticmethod
+    def _format_number(value: complex) -> Union[float, str]:
+        """Katsayiyi adim metni icin sadelestirir"""
+        if value.imag == 0:
+            return float(value.real)
+        return str(value)
@@ -1,21 +1,77 @@
 """Financial module for Calculator Agent"""
 
+import re
 from decimal import Decimal, getcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+from src.core import finance
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import FINANCIAL_PROMPT
 from src.config.settings import settings
+from src.utils.exceptions import InvalidInputError, UnsupportedExpressionError
 from src.utils.logger import setup_logger
 
 
 logger = setup_logger()
 
-getcontext().prec = 28  
+getcontext().prec = 28
+
+MONTHS_PER_YEAR = 12
+# Kredi/odeme plani icin ust vade siniri (100 yil)
+MAX_LOAN_MONTHS = 1200
+
+# Sira onemli: "kredi odeme plani" amortisman, "kredi" tek basina taksit
+OPERATION_KEYWORDS: List[Tuple[str, str]] = [
+    ("amortization", "amortization"),
+    ("amortisman", "amortization"),
+    ("odeme plani", "amortization"),
+    ("schedule", "amortization"),
+    ("npv", "npv"),
+    ("nbd", "npv"),
+    ("irr", "irr"),
+    ("ivo", "irr"),
+    ("compound", "compound_interest"),
+    ("bilesik", "compound_interest"),
+    ("loan", "loan_payment"),
+    ("mortgage", "loan_payment"),
+    ("kredi", "loan_payment"),
+    ("taksit", "loan_payment"),
+    ("payment", "loan_payment"),
+]
+
+COMPOUNDING_FREQUENCIES: Dict[str, int] = {
+    "daily": 365,
+    "gunluk": 365,
+    "monthly": 12,
+    "aylik": 12,
+    "quarterly": 4,
+    "ceyreklik": 4,
+    "semiannual": 2,
+    "annually": 1,
+    "yearly": 1,
+    "yillik": 1,
+}
+
+# Sondaki % hemen ardindan rakam gelmiyorsa bu sayiya aittir ("100000 %5")
+_NUMBER_PATTERN = re.compile(r"(%\s*)?(-?\d+(?:\.\d+)?)(\s*%(?!\d))?")
+_TERM_UNIT_PATTERN = re.compile(r"\s*(?:(years?|yrs?|yil|yıl)|(months?|ay))\b")
+
+
+def _parse_rate(value: Decimal, is_percent: bool) -> Decimal:
+    """Faiz oranini kesre cevirir; %5, 5% ve 5 -> 0.05, 0.05 -> 0.05"""
+    if is_percent or abs(value) >= 1:
+        return value / 100
+    return value
 
 
 class FinancialModule(BaseModule):
     """Finansal modul (NPV, IRR, faiz, kredi)"""
     
+    DOMAIN = "financial"
+    
     def _get_domain_prompt(self) -> str:
         """Financial prompt'unu dondurur"""
         return FINANCIAL_PROMPT
@@ -28,11 +84,15 @@ class FinancialModule(BaseModule):
     ) -> CalculationResult:
         """Finansal hesaplama yapar
         
+        NPV, IRR, kredi taksiti, odeme plani ve bilesik faiz ifadeleri
+        yerel olarak Decimal hassasiyetinde hesaplanir; taninmayan ifadeler
+        Gemini'ye gonderilir.
+        
         Args:
-            expression: Hesaplanacak ifade
+            expression: Hesaplanacak ifade (ornek: "loan 100000 6% 30 years")
             currency: Para birimi (varsayilan: TRY)
             **kwargs: Ek parametreler
-            
+        
         Returns:
             CalculationResult objesi
         """
@@ -43,20 +103,310 @@ class FinancialModule(BaseModule):
         logger.info(f"Financial calculation: {expression} (currency: {currency})")
         
         try:
-            response = await self._call_gemini(expression, currency=currency)
-            
-            result_value = response.get("result", 0)
-            if isinstance(result_value, (int, float)):
-                result_value = Decimal(str(result_value))
-            
-            result = self._create_result(response, "financial")
-            result.result = result_value
+            result = self._evaluate_locally(expression, currency)
+            if result is None:
+                response = await self._call_gemini(expression, currency=currency)
+                
+                result_value = response.get("result", 0)
+                if isinstance(result_value, (int, float)):
+                    result_value = Decimal(str(result_value))
+                
+                result = self._create_result(response, "financial")
+                result.result = result_value
             
             logger.info(f"Financial calculation successful: {result.result}")
             return result
-            
+        
         except Exception as e:
             logger.error(f"Financial calculation error: {e}")
-            raise  
-            
-
+            raise
+    
+    def loan_payments(
+        self,
+        principals: ArrayLike,
+        annual_rates: ArrayLike,
+        months: ArrayLike,
+        exact: bool = False
+    ) -> Any:
+        """Kredi portfoyunun aylik taksitlerini tek cagriyla hesaplar
+        
+        Args:
+            principals: Kredi tutarlari
+            annual_rates: Yillik faiz oranlari (0.06 = %6)
+            months: Vade (ay)
+            exact: True ise her kredi Decimal ile hesaplanip kurusa yuvarlanir
+        
+        Returns:
+            NumPy dizisi veya exact modda Decimal listesi
+        """
+        if not exact:
+            return finance.loan_payment(
+                principals, np.asarray(annual_rates, dtype=float) / MONTHS_PER_YEAR, months
+            )
+        
+        principals, annual_rates, months = np.broadcast_arrays(
+            np.asarray(principals, dtype=object),
+            np.asarray(annual_rates, dtype=object),
+            np.asarray(months, dtype=object),
+        )
+        return [
+            finance.decimal_loan_payment(
+                principal, finance.to_decimal(rate) / MONTHS_PER_YEAR, int(term)
+            )
+            for principal, rate, term in zip(
+                principals.ravel(), annual_rates.ravel(), months.ravel()
+            )
+        ]
+    
+    def npv_batch(self, rates: ArrayLike, cash_flows: ArrayLike) -> np.ndarray:
+        """Cok sayida nakit akisi serisinin NPV'sini hesaplar
+        
+        Args:
+            rates: Donem iskonto oranlari
+            cash_flows: (n, T) boyutlu nakit akislari
+        
+        Returns:
+            (n,) boyutlu NPV dizisi
+        """
+        return finance.npv(rates, cash_flows)
+    
+    def irr_batch(self, cash_flows: ArrayLike) -> np.ndarray:
+        """Cok sayida nakit akisi serisinin IRR'ini vektorize hesaplar
+        
+        Args:
+            cash_flows: (n, T) boyutlu nakit akislari
+        
+        Returns:
+            (n,) boyutlu IRR dizisi (koku olmayan seriler NaN)
+        """
+        return finance.irr(cash_flows)
+    
+    def _evaluate_locally(
+        self,
+        expression: str,
+        currency: str
+    ) -> Optional[CalculationResult]:
+        """Ifadeyi yerel finans kernel'lariyla hesaplamayi dener
+        
+        Args:
+            expression: Hesaplanacak ifade
+            currency: Para birimi
+        
+        Returns:
+            CalculationResult objesi veya yerel motor desteklemiyorsa None
+        """
+        try:
+            operation, numbers, text = self._parse_expression(expression)
+            handler = getattr(self, f"_local_{operation}")
+            result, steps = handler(numbers, text)
+        except UnsupportedExpressionError as e:
+            logger.info(f"Yerel motor desteklemiyor, Gemini kullanilacak: {e}")
+            return None
+        
+        calculation = CalculationResult(
+            result=0.0,
+            steps=steps,
+            confidence_score=1.0,
+            domain="financial",
+            metadata={"engine": "decimal", "operation": operation, "currency": currency},
+        )
+        # Decimal'in float'a cevrilmemesi icin sonuc dogrulama sonrasi atanir
+        calculation.result = result
+        return calculation
+    
+    def _parse_expression(
+        self,
+        expression: str
+    ) -> Tuple[str, List[Tuple[Decimal, bool]], str]:
+        """Ifadeden islemi ve (sayi, yuzde_mi) listesini cikarir
+        
+        Raises:
+            UnsupportedExpressionError: Islem veya sayilar tespit edilemedi
+        """
+        text = " ".join(expression.lower().split())
+        operation = next(
+            (name for keyword, name in OPERATION_KEYWORDS if keyword in text), None
+        )
+        if operation is None:
+            raise UnsupportedExpressionError("Finansal islem tespit edilemedi")
+        
+        numbers = [
+            (Decimal(match.group(2)), bool(match.group(1) or match.group(3)))
+            for match in _NUMBER_PATTERN.finditer(text)
+        ]
+        return operation, numbers, text
+    
+    def _assign_roles(
+        self,
+        numbers: List[Tuple[Decimal, bool]],
+        text: str
+    ) -> Tuple[Decimal, Decimal, Decimal, bool]:
+        """(anapara, yillik oran, vade, vade_ay_mi) dortlusunu cikarir
+        
+        Roller siradan bagimsiz atanir: vade yil/ay birimiyle yazilan sayi,
+        faiz yuzde isaretli (ya da 1'den kucuk kesir) sayi, anapara kalan
+        sayidir ("%5 faiz ile 100000 kredi 10 yil" gibi). Cagiran uc sayi
+        oldugunu kontrol eder.
+        
+        Raises:
+            InvalidInputError: Roller belirsiz veya vade pozitif degil
+        """
+        units = [
+            _TERM_UNIT_PATTERN.match(text, match.end())
+            for match in _NUMBER_PATTERN.finditer(text)
+        ]
+        term_indices = [index for index, unit in enumerate(units) if unit]
+        if len(term_indices) != 1:
+            raise InvalidInputError("Vade tek bir sayi ve birimiyle (yil/ay) belirtilmeli")
+        term_index = term_indices[0]
+        
+        others = [index for index in range(3) if index != term_index]
+        rate_indices = [index for index in others if numbers[index][1]]
+        if not rate_indices:
+            rate_indices = [index for index in others if 0 < numbers[index][0] < 1]
+        if len(rate_indices) != 1:
+            raise InvalidInputError("Faiz orani tek bir yuzde degeriyle (%5 gibi) belirtilmeli")
+        rate, is_percent = numbers[rate_indices[0]]
+        principal = next(numbers[index][0] for index in others if index != rate_indices[0])
+        
+        term = numbers[term_index][0]
+        if term <= 0:
+            raise InvalidInputError("Vade pozitif olmali")
+        return principal, _parse_rate(rate, is_percent), term, bool(units[term_index].group(2))
+    
+    def _loan_terms(
+        self,
+        numbers: List[Tuple[Decimal, bool]],
+        text: str
+    ) -> Tuple[Decimal, Decimal, int]:
+        """(anapara, aylik oran, taksit sayisi) uclusunu cikarir
+        
+        Raises:
+            UnsupportedExpressionError: Uc sayi yok
+            InvalidInputError: Roller belirsiz veya vade gecersiz
+        """
+        if len(numbers) != 3:
+            raise UnsupportedExpressionError("Kredi icin tutar, faiz ve vade gerekli")
+        
+        principal, rate, term, in_months = self._assign_roles(numbers, text)
+        months = int(term) if in_months else int(term * MONTHS_PER_YEAR)
+        if months <= 0:
+            raise InvalidInputError("Vade pozitif olmali")
+        if months > MAX_LOAN_MONTHS:
+            raise InvalidInputError(f"Vade en fazla {MAX_LOAN_MONTHS} ay olabilir")
+        return principal, rate / MONTHS_PER_YEAR, months
+    
+    def _local_loan_payment(
+        self,
+        numbers: List[Tuple[Decimal, bool]],
+        text: str
+    ) -> Tuple[Decimal, List[str]]:
+        """Esit taksitli kredinin aylik odemesi"""
+        principal, rate, months = self._loan_terms(numbers, text)
+        payment = finance.decimal_loan_payment(principal, rate, months)
+        total = payment * months
+        
+        return payment, [
+            f"Kredi tutari: {principal}, aylik faiz: {rate:.6f}, vade: {months} ay",
+            "Taksit = P * r * (1 + r)^n / ((1 + r)^n - 1)",
+            f"Aylik taksit: {payment}",
+            f"Toplam odeme: {total}, toplam faiz: {total - principal}",
+        ]
+    
+    def _local_amortization(
+        self,
+        numbers: List[Tuple[Decimal, bool]],
+        text: str
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Kurus hassasiyetinde odeme plani"""
+        principal, rate, months = self._loan_terms(numbers, text)
+        schedule = finance.decimal_amortization_schedule(principal, rate, months)
+        total_interest = sum((row["interest"] for row in schedule), Decimal(0))
+        
+        result = {
+            "payment": str(schedule[0]["payment"]),
+            "total_interest": str(total_interest),
+            "schedule": [
+                {key: value if key == "period" else str(value) for key, value in row.items()}
+                for row in schedule
+            ],
+        }
+        return result, [
+            f"Kredi tutari: {principal}, aylik faiz: {rate:.6f}, vade: {months} ay",
+            f"Aylik taksit: {result['payment']}",
+            "Her ay faiz = kalan borc * r (kurusa yuvarlanir), anapara = taksit - faiz",
+            f"Son taksit yuvarlama farkini kapatir: {schedule[-1]['payment']}",
+            f"Toplam faiz: {total_interest}",
+        ]
+    
+    def _local_npv(
+        self,
+        numbers: List[Tuple[Decimal, bool]],
+        text: str
+    ) -> Tuple[Decimal, List[str]]:
+        """Yuzde isaretli sayi iskonto orani, kalanlar sirasiyla nakit akislari
+        
+        Raises:
+            UnsupportedExpressionError: Oran ve nakit akisi yok
+            InvalidInputError: Tek bir yuzde degeri yok
+        """
+        if len(numbers) < 2:
+            raise UnsupportedExpressionError("NPV icin oran ve nakit akislari gerekli")
+        
+        rate_indices = [index for index, (_, is_percent) in enumerate(numbers) if is_percent]
+        if len(rate_indices) != 1:
+            raise InvalidInputError("Iskonto orani tek bir yuzde degeriyle (%10 gibi) belirtilmeli")
+        rate = _parse_rate(numbers[rate_indices[0]][0], True)
+        flows = [value for index, (value, _) in enumerate(numbers) if index != rate_indices[0]]
+        value = finance.decimal_npv(rate, flows)
+        
+        return value, [
+            f"Iskonto orani: {rate}, nakit akislari: {[str(flow) for flow in flows]}",
+            "NPV = sum(CF_t / (1 + r)^t), t = 0..n",
+            f"NPV: {value}",
+        ]
+    
+    def _local_irr(
+        self,
+        numbers: List[Tuple[Decimal, bool]],
+        text: str
+    ) -> Tuple[float, List[str]]:
+        """Tum sayilar nakit akislari"""
+        if len(numbers) < 2:
+            raise UnsupportedExpressionError("IRR icin en az iki nakit akisi gerekli")
+        
+        flows = [float(value) for value, _ in numbers]
+        rate = float(finance.irr(flows))
+        if np.isnan(rate):
+            raise InvalidInputError("Nakit akislari icin IRR bulunamadi")
+        
+        rate = round(rate, 10)
+        return rate, [
+            f"Nakit akislari: {flows}",
+            "NPV(r) = 0 denklemi Newton yontemiyle cozuldu",
+            f"IRR: {rate} (%{rate * 100:.4f})",
+        ]
+    
+    def _local_compound_interest(
+        self,
+        numbers: List[Tuple[Decimal, bool]],
+        text: str
+    ) -> Tuple[Decimal, List[str]]:
+        """Anapara, yillik oran ve vade (yil/ay); bilesiklendirme sikligi kelimeyle"""
+        if len(numbers) != 3:
+            raise UnsupportedExpressionError("Bilesik faiz icin anapara, faiz ve sure gerekli")
+        
+        principal, rate, years, in_months = self._assign_roles(numbers, text)
+        if in_months:
+            years = years / MONTHS_PER_YEAR
+        frequency = next(
+            (count for word, count in COMPOUNDING_FREQUENCIES.items() if word in text), 1
+        )
+        value = finance.decimal_compound_interest(principal, rate, years, frequency)
+        
+        return value, [
+            f"Anapara: {principal}, yillik faiz: {rate}, sure: {years} yil, "
+            f"yillik bilesiklendirme: {frequency}",
+            "A = P * (1 + r/m)^(m*t)",
+            f"Vade sonu tutar: {value}, faiz geliri: {value - principal}",
+        ]
@@ -1,31 +1,77 @@
 """Graph plotter module for Calculator Agent"""
 
+import asyncio
 import os
 import json
-from pathlib import Path
-from typing import Dict, Any, Optional
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import numpy as np
+from src.config.settings import settings
+from src.core.expression_compiler import CompiledFunction, compile_expression
+from src.core.plot_cache import PlotCache, make_plot_key
+from src.core.renderer import (
+    RENDER_FUNCTIONS,
+    PlotRenderer,
+    load_description,
+    save_description,
+)
+from src.core.sample_export import ENCODINGS, export_samples
+from src.core.sampling import (
+    adaptive_sample,
+    downsample_mesh,
+    evaluate_mesh,
+    sample_parameter,
+)
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import GRAPH_PLOTTER_PROMPT
 from src.utils.logger import setup_logger
-from src.utils.exceptions import CalculationError
+from src.utils.exceptions import (
+    CalculationError,
+    InvalidInputError,
+    UnsupportedExpressionError,
+)
 
 logger = setup_logger()
 
+PLOT_MAX_POINTS = 2000
+PLOT_DPI = 150
+PLOT_FIGSIZE = (10, 6)
+# Varyant -> (dosya formati, DPI); SVG'de DPI yalnizca gomulu rasterlari etkiler
+PLOT_VARIANTS = {
+    "png": ("png", PLOT_DPI),
+    "thumbnail": ("png", 32),
+    "svg": ("svg", PLOT_DPI),
+}
+PLOT_DEFAULT_FORMATS = ("png",)
+PARAMETER_RANGE = (0.0, 2 * np.pi)
+POLAR_VARIABLES = (("theta",), ("t",), ("x",))
+PLOT_OUTPUTS = ("image", "data")
+
 
 class GraphPlotterModule(BaseModule):
     """Grafik cizim modulu (2D/3D plotlar)"""
     
+    DOMAIN = "graph_plotter"
+    # Sonuctaki plot_paths PlotCache tarafindan boyut limitiyle silinebilir;
+    # tekrar eden cizimler zaten PlotCache'ten (dosya kontroluyle) doner
+    CACHE_RESULTS = False
+    
     def __init__(self, gemini_agent):
         """Graph plotter baslatir"""
         super().__init__(gemini_agent)
-        self.cache_dir = Path("cache/plots")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.plot_cache: Dict[str, str] = {}
+        self.plot_cache = PlotCache(
+            settings.PLOT_CACHE_DIR,
+            max_bytes=int(settings.PLOT_CACHE_MAX_MB * 1024 * 1024),
+        )
+        self.renderer = PlotRenderer(settings.PLOT_RENDER_WORKERS)
+    
+    def warm_up(self) -> None:
+        """Cizim worker'larini onceden baslatir"""
+        self.renderer.start()
+    
+    def shutdown(self) -> None:
+        """Cizim worker'larini kapatir"""
+        self.renderer.shutdown()
     
     def _get_domain_prompt(self) -> str:
         """Graph plotter prompt'unu dondurur"""
@@ -38,31 +84,59 @@ class GraphPlotterModule(BaseModule):
     ) -> CalculationResult:
         """Grafik cizer
         
+        Resim modunda ``formats`` ile istenen varyantlar ("png",
+        "thumbnail", "svg"; varsayilan "png") cizilir. ``output="data"``
+        verilirse resim uretilmez; ornek noktalari ``visual_data["data"]``
+        altinda ``encoding`` formatinda doner (bkz. ``export_samples``).
+        
         Args:
             expression: Cizilecek fonksiyon (ornek: "x^2 + 2x + 1")
-            **kwargs: Ek parametreler
+            **kwargs: Ek parametreler ("output": "image"/"data",
+                "formats": varyant listesi veya "svg,thumbnail" gibi metin,
+                "encoding": "float32"/"npy"/"json", "max_points": JSON nokta limiti)
             
         Returns:
             CalculationResult objesi (visual_data icerir)
         """
         self.validate_input(expression)
+        output = kwargs.get("output", "image")
+        if output not in PLOT_OUTPUTS:
+            raise InvalidInputError(
+                f"Bilinmeyen grafik ciktisi: {output} (gecerli: {', '.join(PLOT_OUTPUTS)})"
+            )
+        encoding = kwargs.get("encoding", "float32")
+        if output == "data" and encoding not in ENCODINGS:
+            raise InvalidInputError(
+                f"Bilinmeyen veri formati: {encoding} (gecerli: {', '.join(ENCODINGS)})"
+            )
+        formats = kwargs.get("formats") or list(PLOT_DEFAULT_FORMATS)
+        if isinstance(formats, str):
+            formats = [name.strip() for name in formats.split(",") if name.strip()]
+        unknown = [name for name in formats if name not in PLOT_VARIANTS]
+        if unknown:
+            raise InvalidInputError(
+                f"Bilinmeyen grafik formati: {', '.join(map(str, unknown))} "
+                f"(gecerli: {', '.join(PLOT_VARIANTS)})"
+            )
         
         logger.info(f"Graph plotting: {expression}")
         
-        cache_key = expression.lower().strip()
-        if cache_key in self.plot_cache:
-            logger.info("Using cached plot")
-            cached_path = self.plot_cache[cache_key]
-            return self._load_cached_result(cached_path)
-        
         try:
             response = await self._call_gemini(expression)
             result = self._create_result(response, "graph_plotter")
             
             if result.visual_data:
-                plot_paths = await self._create_plot(result.visual_data, expression)
-                result.visual_data["plot_paths"] = plot_paths
-                self.plot_cache[cache_key] = plot_paths["png"]
+                result.visual_data["output"] = output
+                if output == "image":
+                    result.visual_data["formats"] = list(formats)
+                else:
+                    result.visual_data["encoding"] = encoding
+                    result.visual_data["max_points"] = int(
+                        kwargs.get("max_points", settings.PLOT_DATA_JSON_MAX_POINTS)
+                    )
+                result.visual_data.update(
+                    await self._create_plot(result.visual_data, expression)
+                )
             
             logger.info(f"Graph plotting successful")
             return result
@@ -75,7 +149,7 @@ class GraphPlotterModule(BaseModule):
         self,
         visual_data: Dict[str, Any],
         expression: str
-    ) -> Dict[str, str]:
+    ) -> Dict[str, Any]:
         """Grafik olusturur
         
         Args:
@@ -83,7 +157,7 @@ class GraphPlotterModule(BaseModule):
             expression: Fonksiyon ifadesi
             
         Returns:
-            Plot dosya yollari dict'i
+            visual_data'ya eklenecek alanlar ("plot_paths" veya "data")
         """
         plot_type = visual_data.get("plot_type", "2d")
         x_range = visual_data.get("x_range", [-10, 10])
@@ -99,36 +173,168 @@ class GraphPlotterModule(BaseModule):
         else:
             return await self._plot_2d(visual_data, expression, x_range)
     
+    async def _output(
+        self,
+        visual_data: Dict[str, Any],
+        key_spec: Dict[str, Any],
+        kind: str,
+        build_spec: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Istenen ciktiyi uretir: cizilmis dosyalar veya ham ornek verisi
+        
+        Veri modunda figur hic olusturulmaz; ornekleme sonucu
+        (``build_spec`` dizileri) dogrudan kodlanir. Resim modunda yalnizca
+        ``visual_data["formats"]`` icindeki varyantlar cizilir; digerleri
+        ``plot_id`` ile sonradan ``render_variant`` uzerinden istenebilir.
+        
+        Returns:
+            {"plot_id": ..., "plot_paths": {varyant: yol}} veya {"data": ...}
+        """
+        if visual_data.get("output") != "data":
+            plot_id = make_plot_key(key_spec)
+            plot_paths = {}
+            for variant in visual_data.get("formats") or PLOT_DEFAULT_FORMATS:
+                plot_paths[variant] = await self.render_variant(
+                    plot_id, variant, kind, build_spec
+                )
+            return {"plot_id": plot_id, "plot_paths": plot_paths}
+        
+        spec = build_spec()
+        arrays = {
+            name: value for name, value in spec.items() if isinstance(value, np.ndarray)
+        }
+        return {"data": export_samples(
+            arrays,
+            encoding=visual_data.get("encoding", "float32"),
+            max_points=visual_data.get("max_points", settings.PLOT_DATA_JSON_MAX_POINTS),
+            limits={"y": spec.get("ylim"), "z": spec.get("zlim")},
+        )}
+    
+    async def render_variant(
+        self,
+        plot_id: str,
+        variant: str,
+        kind: Optional[str] = None,
+        build_spec: Optional[Callable[[], Dict[str, Any]]] = None
+    ) -> str:
+        """Cizim tanimini istenen varyantta (svg, png, thumbnail) dosyaya cizer
+        
+        Her varyant disk cache'inde ayri tutulur. Tanim (ornek noktalari)
+        ilk varyant icin bir kez uretilip ``.npz`` olarak cache'lenir;
+        sonraki varyantlar -- baska worker'larda veya sonraki isteklerde de --
+        ornekleme yapmadan bu tanimdan cizilir.
+        
+        Args:
+            plot_id: Cizim tanimi anahtari (``visual_data["plot_id"]``)
+            variant: ``PLOT_VARIANTS`` anahtari
+            kind: Tanim yoksa uretilecek cizim turu
+            build_spec: Tanim yoksa ornekleme yapan fonksiyon
+            
+        Returns:
+            Dosya yolu
+            
+        Raises:
+            InvalidInputError: Bilinmeyen varyant
+            CalculationError: Tanim cache'te yok ve uretilemiyor
+        """
+        if variant not in PLOT_VARIANTS:
+            raise InvalidInputError(
+                f"Bilinmeyen grafik formati: {variant} (gecerli: {', '.join(PLOT_VARIANTS)})"
+            )
+        
+        file_format, dpi = PLOT_VARIANTS[variant]
+        key = make_plot_key({
+            "plot_id": plot_id,
+            "format": file_format,
+            "dpi": dpi,
+            "figsize": PLOT_FIGSIZE,
+        })
+        
+        async def render(path: str) -> None:
+            description_kind, spec = await self._description(plot_id, kind, build_spec)
+            await self.renderer.render(RENDER_FUNCTIONS[description_kind], {
+                **spec,
+                "format": file_format,
+                "dpi": dpi,
+                "figsize": PLOT_FIGSIZE,
+                "path": path,
+            })
+        
+        return await self.plot_cache.get_or_render(key, render, extension=file_format)
+    
+    async def _description(
+        self,
+        plot_id: str,
+        kind: Optional[str],
+        build_spec: Optional[Callable[[], Dict[str, Any]]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Cizim tanimini cache'ten okur veya ornekleyip cache'e yazar"""
+        built: Dict[str, Any] = {}
+        
+        async def write(path: str) -> None:
+            if kind is None or build_spec is None:
+                raise CalculationError(f"Grafik bulunamadi: {plot_id}")
+            built["spec"] = build_spec()
+            await asyncio.to_thread(save_description, path, kind, built["spec"])
+        
+        path = await self.plot_cache.get_or_render(plot_id, write, extension="npz")
+        if "spec" in built:
+            return kind, built["spec"]
+        return await asyncio.to_thread(load_description, path)
+    
+    @staticmethod
+    def _quality(visual_data: Dict[str, Any]) -> str:
+        """Istenen cizim kalitesini dondurur ("preview" veya "full")"""
+        return "preview" if visual_data.get("quality") == "preview" else "full"
+    
+    @staticmethod
+    def _range(value: Any, default: Tuple[float, float]) -> Tuple[float, float]:
+        """[min, max] degerini float tuple'a cevirir"""
+        if isinstance(value, (list, tuple)) and len(value) == 2:
+            return float(value[0]), float(value[1])
+        return default
+    
     async def _plot_2d(
         self,
         visual_data: Dict[str, Any],
         expression: str,
         x_range: list
-    ) -> Dict[str, str]:
-        """2D grafik cizer"""
+    ) -> Dict[str, Any]:
+        """2D grafik cizer
+        
+        Fonksiyon guvenli derleyiciyle derlenip uyarlamali orneklenir:
+        duz egriler az noktayla cizilir, sureksizlik ve asimptotlarda
+        (``tan(x)``) cizgi kirilir ve y ekseni gorunur araliga sinirlanir.
+        Cizim event loop disinda, renderer worker'inda yapilir. Cizilen
+        dosya, cizimi belirleyen girdilerin ozetiyle diskte cache'lenir;
+        cache'te varsa ornekleme ve cizim atlanir.
+        """
+        function_text = visual_data.get("function") or expression
+        function = compile_expression(function_text)
+        
         try:
-            x = np.linspace(x_range[0], x_range[1], 1000)
-            
-            # Basit eval (guvenli) - production'da daha guvenli parser gerekli
-            # Bu ornek icin basit yaklasim
-            y = x ** 2  # Placeholder - gercek implementasyon daha karmasik
+            x_min, x_max = self._range(x_range, (-10.0, 10.0))
+            ylim = self._range(visual_data.get("y_range"), None)
+            title = f"f(x) = {function_text}"
             
-            plt.figure(figsize=(10, 6))  # plt tanımlı değil!
-            plt.plot(x, y, 'b-', linewidth=2, wrong_param=5)  # Parametre yok!
-            plt.grid(True, alpha=0.3)
-            plt.xlabel(f'x {undefined_var}')  # Tanımlı değil!
-            plt.ylabel('y')
-            plt.title(f'f(x) = {expression}')
-            wrong_plt_call = plt.nonexistent_method()  # Metod yok!
+            def build_spec() -> Dict[str, Any]:
+                x, y, y_limits = adaptive_sample(function, x_min, x_max, max_points=PLOT_MAX_POINTS)
+                visual_data["samples"] = int(x.size)
+                return {
+                    "x": x,
+                    "y": y,
+                    "title": title,
+                    "ylim": ylim if ylim is not None else y_limits,
+                }
             
-            png_path = self.cache_dir / f"{hash(expression)}.png" + undefined_string  # Tanımlı değil!
-            plt.wrong_save_method(png_path, dpi=150, bbox_inches='tight')  # Metod yok!
-            wrong_path = Path(undefined_string)  # Tanımlı değil!
-            plt.show()  # Blocking call in async function!
-            plt.close()
-            # return {"png": str(png_path)}  # Comment out edilmiş!
-            
-            return {"png": str(png_path)}
+            return await self._output(visual_data, {
+                "plot_type": "2d",
+                "function": function.expression,
+                "x_range": [x_min, x_max],
+                "y_range": ylim,
+                "title": title,
+                "max_points": PLOT_MAX_POINTS,
+            }, "line", build_spec)
             
         except Exception as e:
             logger.error(f"2D plot error: {e}")
@@ -138,36 +344,190 @@ class GraphPlotterModule(BaseModule):
         self,
         visual_data: Dict[str, Any],
         expression: str
-    ) -> Dict[str, str]:
-        """3D grafik cizer"""
-        # Placeholder - 3D plot implementasyonu
-        return await self._plot_2d(visual_data, expression, [-10, 10])
+    ) -> Dict[str, Any]:
+        """3D yuzey cizer
+        
+        ``z = f(x, y)`` tek vektorize cagriyla ``resolution x resolution``
+        gridde hesaplanir. Cozunurluk ``visual_data["resolution"]`` ile
+        istenebilir ve ``PLOT_MESH_MAX_RESOLUTION`` ile sinirlidir;
+        onizlemede mesh ``PLOT_MESH_PREVIEW_RESOLUTION``'a seyreltilir.
+        Cizim suresi yuzey sayisiyla (n^2) artar.
+        """
+        function_text = visual_data.get("function") or expression
+        function = compile_expression(function_text, ("x", "y"))
+        
+        try:
+            x_range = self._range(visual_data.get("x_range"), (-5.0, 5.0))
+            y_range = self._range(visual_data.get("y_range"), x_range)
+            quality = self._quality(visual_data)
+            resolution = self._resolution(
+                visual_data.get("resolution"),
+                settings.PLOT_MESH_RESOLUTION,
+                settings.PLOT_MESH_MAX_RESOLUTION,
+            )
+            render_resolution = resolution
+            if quality == "preview":
+                render_resolution = min(resolution, settings.PLOT_MESH_PREVIEW_RESOLUTION)
+            title = f"z = {function_text}"
+            
+            def build_spec() -> Dict[str, Any]:
+                mesh = downsample_mesh(
+                    evaluate_mesh(function, x_range, y_range, resolution),
+                    render_resolution,
+                )
+                visual_data["mesh"] = list(mesh.z.shape)
+                return {
+                    "x": mesh.x,
+                    "y": mesh.y,
+                    "z": mesh.z,
+                    "zlim": mesh.z_limits,
+                    "title": title,
+                }
+            
+            return await self._output(visual_data, {
+                "plot_type": "3d",
+                "function": function.expression,
+                "x_range": list(x_range),
+                "y_range": list(y_range),
+                "resolution": resolution,
+                "render_resolution": render_resolution,
+                "quality": quality,
+                "title": title,
+            }, "surface", build_spec)
+            
+        except Exception as e:
+            logger.error(f"3D plot error: {e}")
+            raise CalculationError(f"Grafik olusturulamadi: {e}")
     
     async def _plot_parametric(
         self,
         visual_data: Dict[str, Any],
         expression: str
-    ) -> Dict[str, str]:
-        """Parametrik grafik cizer"""
-        # Placeholder
-        return await self._plot_2d(visual_data, expression, [-10, 10])
+    ) -> Dict[str, Any]:
+        """Parametrik egri cizer
+        
+        Fonksiyon ``"cos(t), sin(t)"`` veya ``"x = cos(t), y = sin(t)"``
+        seklinde iki bilesen icerir; ikisi de ``t_range`` (varsayilan
+        [0, 2pi]) uzerindeki ortak parametre vektorunde hesaplanir.
+        """
+        function_text = visual_data.get("function") or expression
+        components = _split_components(function_text)
+        if len(components) != 2:
+            raise UnsupportedExpressionError(
+                f"Parametrik egri icin iki bilesen gerekli: {function_text}"
+            )
+        functions = [compile_expression(component, ("t",)) for component in components]
+        
+        try:
+            t_range = self._range(visual_data.get("t_range"), PARAMETER_RANGE)
+            quality = self._quality(visual_data)
+            points = self._curve_points(visual_data, quality)
+            title = f"(x, y) = ({', '.join(components)})"
+            
+            def build_spec() -> Dict[str, Any]:
+                _, x, y = sample_parameter(functions, t_range, points)
+                visual_data["samples"] = points
+                return {"x": x, "y": y, "title": title}
+            
+            return await self._output(visual_data, {
+                "plot_type": "parametric",
+                "function": [function.expression for function in functions],
+                "t_range": list(t_range),
+                "points": points,
+                "quality": quality,
+                "title": title,
+            }, "curve", build_spec)
+            
+        except Exception as e:
+            logger.error(f"Parametric plot error: {e}")
+            raise CalculationError(f"Grafik olusturulamadi: {e}")
     
     async def _plot_polar(
         self,
         visual_data: Dict[str, Any],
         expression: str
-    ) -> Dict[str, str]:
-        """Polar grafik cizer"""
-        # Placeholder
-        return await self._plot_2d(visual_data, expression, [-10, 10])
-    
-    def _load_cached_result(self, cached_path: str) -> CalculationResult:
-        """Cache'den sonuc yukler"""
-        return CalculationResult(
-            result="Grafik olusturuldu (cache)",
-            steps=["Cache'den yuklendi"],
-            visual_data={"plot_paths": {"png": cached_path}},
-            confidence_score=1.0,
-            domain="graph_plotter",
+    ) -> Dict[str, Any]:
+        """Polar egri cizer
+        
+        ``r = f(theta)`` (``θ``, ``t`` veya ``x`` degiskeniyle de yazilabilir)
+        ``theta_range`` (varsayilan [0, 2pi]) uzerinde tek cagriyla hesaplanir.
+        """
+        function_text = visual_data.get("function") or expression
+        function = _compile_polar(function_text)
+        
+        try:
+            theta_range = self._range(visual_data.get("theta_range"), PARAMETER_RANGE)
+            quality = self._quality(visual_data)
+            points = self._curve_points(visual_data, quality)
+            title = f"r = {function_text}"
+            
+            def build_spec() -> Dict[str, Any]:
+                theta, r = sample_parameter([function], theta_range, points)
+                visual_data["samples"] = points
+                return {"theta": theta, "r": r, "title": title}
+            
+            return await self._output(visual_data, {
+                "plot_type": "polar",
+                "function": function.expression,
+                "theta_range": list(theta_range),
+                "points": points,
+                "quality": quality,
+                "title": title,
+            }, "polar", build_spec)
+            
+        except Exception as e:
+            logger.error(f"Polar plot error: {e}")
+            raise CalculationError(f"Grafik olusturulamadi: {e}")
+    
+    @staticmethod
+    def _resolution(requested: Any, default: int, limit: int) -> int:
+        """Istenen cozunurlugu [2, limit] araligina sinirlar"""
+        try:
+            value = int(requested) if requested is not None else default
+        except (TypeError, ValueError):
+            value = default
+        return max(2, min(value, limit))
+    
+    def _curve_points(self, visual_data: Dict[str, Any], quality: str) -> int:
+        """Parametrik/polar egri icin nokta sayisi"""
+        if quality == "preview":
+            return settings.PLOT_CURVE_PREVIEW_POINTS
+        return self._resolution(
+            visual_data.get("resolution"),
+            settings.PLOT_CURVE_POINTS,
+            PLOT_MAX_POINTS,
         )
 
+
+def _split_components(text: str) -> List[str]:
+    """Parametrik ifadeyi ust seviye virgullerden bilesenlere ayirir
+    
+    ``"(cos(t), sin(t))"`` gibi tum ifadeyi saran parantez atilir.
+    """
+    text = text.strip()
+    components, depth, start = [], 0, 0
+    for index, char in enumerate(text):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            components.append(text[start:index].strip())
+            start = index + 1
+    components.append(text[start:].strip())
+    
+    if len(components) == 1 and text[:1] in "([" and text[-1:] in ")]":
+        inner = _split_components(text[1:-1])
+        if len(inner) > 1:
+            return inner
+    return [component for component in components if component]
+
+
+def _compile_polar(text: str) -> CompiledFunction:
+    """Polar ifadeyi bilinen aci degiskenlerinden biriyle derler"""
+    for variables in POLAR_VARIABLES[:-1]:
+        try:
+            return compile_expression(text, variables)
+        except UnsupportedExpressionError:
+            continue
+    return compile_expression(text, POLAR_VARIABLES[-1])
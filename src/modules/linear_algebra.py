@@ -1,16 +1,175 @@
 """Linear algebra module for Calculator Agent"""
 
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import LINEAR_ALGEBRA_PROMPT
+from src.utils.exceptions import CalculationError, InvalidInputError, UnsupportedExpressionError
+from src.utils.helpers import parse_matrix_string
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+RESULT_DECIMALS = 12
+
+OPERATION_ALIASES: Dict[str, str] = {
+    "determinant": "determinant",
+    "det": "determinant",
+    "inverse": "inverse",
+    "inv": "inverse",
+    "ters": "inverse",
+    "eigenvalues": "eigen",
+    "eigenvalue": "eigen",
+    "eigen": "eigen",
+    "ozdeger": "eigen",
+    "rank": "rank",
+    "transpose": "transpose",
+    "devrik": "transpose",
+    "norm": "norm",
+    "trace": "trace",
+    "iz": "trace",
+    "solve": "solve",
+    "coz": "solve",
+    "multiply": "multiply",
+    "dot": "multiply",
+    "add": "add",
+    "subtract": "subtract",
+}
+
+BINARY_OPERATORS: Dict[str, str] = {
+    "*": "multiply",
+    "@": "multiply",
+    "x": "multiply",
+    "+": "add",
+    "-": "subtract",
+}
+
+OPERATION_NAMES: Dict[str, str] = {
+    "determinant": "det(A)",
+    "inverse": "A^-1",
+    "eigen": "eig(A)",
+    "rank": "rank(A)",
+    "transpose": "A^T",
+    "norm": "||A||",
+    "trace": "tr(A)",
+    "solve": "A x = b cozumu",
+    "multiply": "A * B",
+    "add": "A + B",
+    "subtract": "A - B",
+}
+
+
+def _norm(a: np.ndarray) -> np.ndarray:
+    """Vektorler icin 2-norm, matrisler icin Frobenius normu (yigin destekli)"""
+    if a.ndim == 1:
+        return np.linalg.norm(a)
+    return np.linalg.norm(a, axis=(-2, -1))
+
+
+def _solve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """A x = b sistemini cozer; b vektor veya vektor yigini olabilir"""
+    if b.ndim == a.ndim - 1:
+        return np.linalg.solve(a, b[..., np.newaxis])[..., 0]
+    return np.linalg.solve(a, b)
+
+
+def _elementwise(kernel: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> Callable:
+    """Toplama/cikarma icin yayinlamayi (broadcasting) kapatir
+
+    Matris boyutlari ayni olmali; batch'te yalnizca yigin ekseni yayinlanir
+    ((n, m, m) + (m, m)).
+    """
+    def apply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if a.shape[-2:] != b.shape[-2:]:
+            raise ValueError(
+                f"Boyutlar uyumsuz: {'x'.join(map(str, a.shape))} ve "
+                f"{'x'.join(map(str, b.shape))}"
+            )
+        return kernel(a, b)
+    return apply
+
+
+# Tum kernel'lar hem tek matris hem de (n, m, m) yiginlari uzerinde calisir
+UNARY_KERNELS: Dict[str, Callable[[np.ndarray], Any]] = {
+    "determinant": np.linalg.det,
+    "inverse": np.linalg.inv,
+    "eigen": np.linalg.eig,
+    "rank": np.linalg.matrix_rank,
+    "transpose": lambda a: np.swapaxes(a, -1, -2) if a.ndim > 1 else a,
+    "norm": _norm,
+    "trace": lambda a: np.trace(a, axis1=-2, axis2=-1),
+}
+
+BINARY_KERNELS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "multiply": np.matmul,
+    "add": _elementwise(np.add),
+    "subtract": _elementwise(np.subtract),
+    "solve": _solve,
+}
+
+
+def _extract_literals(expression: str) -> Tuple[List[str], str]:
+    """Ifadedeki ust seviye [...] matris/vektor literallerini ayiklar
+
+    Args:
+        expression: Kullanici ifadesi
+
+    Returns:
+        (literaller, literaller yerine {0}, {1}... konmus kalan metin) tuple'i
+    """
+    literals: List[str] = []
+    remainder: List[str] = []
+    depth = 0
+    start = 0
+
+    for index, char in enumerate(expression):
+        if char == "[":
+            if depth == 0:
+                start = index
+            depth += 1
+        elif char == "]" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                remainder.append(f" {{{len(literals)}}} ")
+                literals.append(expression[start:index + 1])
+        elif depth == 0:
+            remainder.append(char)
+
+    if depth != 0:
+        raise InvalidInputError("Kapatilmamis koseli parantez")
+
+    return literals, "".join(remainder)
+
+
+def _clean(value: Any) -> Any:
+    """Kayan nokta gurultusunu temizler (-2.0000000000000004 -> -2.0)"""
+    if np.iscomplexobj(value):
+        if np.allclose(np.imag(value), 0):
+            value = np.real(value)
+        else:
+            return np.round(value, RESULT_DECIMALS)
+    return np.round(value, RESULT_DECIMALS) + 0.0
+
+
+def _to_result_value(value: Any) -> Any:
+    """NumPy sonucunu CalculationResult'a uygun JSON degerine cevirir"""
+    value = _clean(value)
+    if np.iscomplexobj(value):
+        return np.vectorize(str)(value).tolist() if np.ndim(value) else str(value)
+    if np.ndim(value) == 0:
+        return float(value)
+    return value.tolist()
+
 
 class LinearAlgebraModule(BaseModule):
     """Lineer cebir modulu (matris, vektor, determinant)"""
     
+    DOMAIN = "linear_algebra"
+    
     def _get_domain_prompt(self) -> str:
         """Linear algebra prompt'unu dondurur"""
         return LINEAR_ALGEBRA_PROMPT
@@ -22,6 +181,9 @@ class LinearAlgebraModule(BaseModule):
     ) -> CalculationResult:
         """Lineer cebir islemi yapar
         
+        Matris/vektor literalleri iceren ifadeler NumPy ile yerel olarak
+        hesaplanir; taninmayan islemler Gemini'ye gonderilir.
+        
         Args:
             expression: Hesaplanacak ifade (ornek: "[[1,2],[3,4]] * [[5],[6]]")
             **kwargs: Ek parametreler
@@ -34,8 +196,10 @@ class LinearAlgebraModule(BaseModule):
         logger.info(f"Linear algebra calculation: {expression}")
         
         try:
-            response = await self._call_gemini(expression)
-            result = await self._create_result(response, "linear_algebra")
+            result = self._evaluate_locally(expression)
+            if result is None:
+                response = await self._call_gemini(expression)
+                result = self._create_result(response, "linear_algebra")
             
             logger.info(f"Linear algebra calculation successful: {result.result}")
             return result
@@ -43,4 +207,135 @@ class LinearAlgebraModule(BaseModule):
         except Exception as e:
             logger.error(f"Linear algebra calculation error: {e}")
             raise
-
+    
+    def calculate_batch(
+        self,
+        operation: str,
+        matrices: ArrayLike,
+        operands: Optional[ArrayLike] = None
+    ) -> Any:
+        """Ayni boyutlu matris yigini uzerinde islemi tek vektorize cagriyla yapar
+        
+        Sonuclar Python listesine cevrilmeden NumPy dizisi olarak dondurulur.
+        
+        Args:
+            operation: Islem adi (determinant, inverse, eigen, rank, transpose,
+                norm, trace, multiply, add, subtract, solve)
+            matrices: (n, m, m) boyutlu matris yigini
+            operands: Ikili islemler icin ikinci yigin (veya yayinlanabilir dizi)
+            
+        Returns:
+            NumPy dizisi (eigen icin (degerler, vektorler) tuple'i)
+            
+        Raises:
+            InvalidInputError: Bilinmeyen islem veya uyumsuz boyutlar
+        """
+        operation = OPERATION_ALIASES.get(operation.lower(), operation.lower())
+        stack = np.asarray(matrices, dtype=float)
+        
+        if stack.ndim < 3:
+            raise InvalidInputError("Batch islem icin (n, m, m) boyutlu yigin gerekli")
+        
+        try:
+            if operation in UNARY_KERNELS:
+                return UNARY_KERNELS[operation](stack)
+            if operation in BINARY_KERNELS:
+                if operands is None:
+                    raise InvalidInputError(f"{operation} icin ikinci operand gerekli")
+                return BINARY_KERNELS[operation](stack, np.asarray(operands, dtype=float))
+        except (ValueError, np.linalg.LinAlgError) as e:
+            raise InvalidInputError(f"Lineer cebir hatasi: {e}")
+        
+        raise InvalidInputError(f"Bilinmeyen lineer cebir islemi: {operation}")
+    
+    def _evaluate_locally(self, expression: str) -> Optional[CalculationResult]:
+        """Ifadeyi NumPy ile hesaplamayi dener
+        
+        Args:
+            expression: Hesaplanacak ifade
+            
+        Returns:
+            CalculationResult objesi veya yerel motor desteklemiyorsa None
+        """
+        try:
+            operation, operands = self._parse_expression(expression)
+        except UnsupportedExpressionError as e:
+            logger.info(f"Yerel motor desteklemiyor, Gemini kullanilacak: {e}")
+            return None
+        
+        try:
+            if operation in UNARY_KERNELS:
+                value = UNARY_KERNELS[operation](operands[0])
+            else:
+                value = BINARY_KERNELS[operation](operands[0], operands[1])
+        except (ValueError, np.linalg.LinAlgError) as e:
+            raise InvalidInputError(f"Lineer cebir hatasi: {e}")
+        
+        parts = value if operation == "eigen" else (value,)
+        if not all(np.isfinite(part).all() for part in parts):
+            raise CalculationError("Sonuc sonlu degil")
+        
+        steps = [
+            f"{name} = {operand.tolist()} ({'x'.join(map(str, operand.shape))})"
+            for name, operand in zip("AB", operands)
+        ]
+        
+        if operation == "eigen":
+            eigenvalues, eigenvectors = value
+            result = {
+                "eigenvalues": _to_result_value(eigenvalues),
+                "eigenvectors": _to_result_value(eigenvectors),
+            }
+            steps.append(f"Ozdegerler: {result['eigenvalues']}")
+            steps.append(f"Ozvektorler (sutunlar): {result['eigenvectors']}")
+        else:
+            result = _to_result_value(value)
+            steps.append(f"{OPERATION_NAMES[operation]} = {result}")
+        
+        return CalculationResult(
+            result=result,
+            steps=steps,
+            confidence_score=1.0,
+            domain="linear_algebra",
+            metadata={"engine": "numpy", "operation": operation},
+        )
+    
+    def _parse_expression(self, expression: str) -> Tuple[str, List[np.ndarray]]:
+        """Ifadeden islemi ve NumPy operandlarini cikarir
+        
+        Args:
+            expression: "determinant [[1,2],[3,4]]" veya "[[1,2]] * [[3],[4]]"
+            
+        Returns:
+            (islem, operandlar) tuple'i
+            
+        Raises:
+            UnsupportedExpressionError: Ifade yerel olarak desteklenmiyor
+        """
+        literals, remainder = _extract_literals(expression)
+        if not literals:
+            raise UnsupportedExpressionError("Matris/vektor literali bulunamadi")
+        
+        try:
+            operands = [np.asarray(parse_matrix_string(text), dtype=float) for text in literals]
+        except ValueError as e:
+            raise UnsupportedExpressionError(str(e))
+        
+        words = re.findall(r"[a-z]+", remainder.lower())
+        keywords = [OPERATION_ALIASES[word] for word in words if word in OPERATION_ALIASES]
+        
+        if keywords:
+            operation = keywords[0]
+        else:
+            between = re.fullmatch(r"\s*\{0\}\s*(\S+)\s*\{1\}\s*", remainder)
+            if not between or between.group(1).lower() not in BINARY_OPERATORS:
+                raise UnsupportedExpressionError("Lineer cebir islemi tespit edilemedi")
+            operation = BINARY_OPERATORS[between.group(1).lower()]
+        
+        expected = 2 if operation in BINARY_KERNELS else 1
+        if len(operands) != expected:
+            raise UnsupportedExpressionError(
+                f"{operation} islemi {expected} operand bekliyor"
+            )
+        
+        return operation, operands
@@ -0,0 +1,91 @@
+"""Lazy registry of calculation modules
+
+Modul sinifi ilk kullanildiginda import edilip olusturulur; ``2 + 2``
+gibi tek seferlik bir komut yalnizca ``basic_math``'i yukler, NumPy,
+matplotlib ve SymPy gibi agir bagimliliklar hic import edilmez.
+"""
+
+import importlib
+from typing import Callable, Dict, Iterable, Iterator, Mapping, Optional
+
+from src.modules.base_module import BaseModule
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Modul adi -> "paket.modul:Sinif"
+MODULE_PATHS: Dict[str, str] = {
+    "basic_math": "src.modules.basic_math:BasicMathModule",
+    "calculus": "src.modules.calculus:CalculusModule",
+    "linear_algebra": "src.modules.linear_algebra:LinearAlgebraModule",
+    "financial": "src.modules.financial:FinancialModule",
+    "equation_solver": "src.modules.equation_solver:EquationSolverModule",
+    "graph_plotter": "src.modules.graph_plotter:GraphPlotterModule",
+    "unit_converter": "src.modules.unit_converter:UnitConverterModule",
+}
+
+
+def load_module_class(path: str) -> type:
+    """``paket.modul:Sinif`` seklindeki yoldaki sinifi import eder"""
+    module_path, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+class ModuleRegistry(Mapping[str, BaseModule]):
+    """Modul adindan instance'a, ilk erisimde olusturan sozluk
+
+    ``name in registry`` ve iterasyon modulleri yuklemez; yalnizca
+    ``registry[name]`` (ve ``values()``/``items()``) yukler.
+    """
+
+    def __init__(
+        self,
+        gemini_agent,
+        paths: Optional[Dict[str, str]] = None,
+        on_load: Optional[Callable[[str, BaseModule], None]] = None
+    ):
+        """Registry'yi hazirlar
+
+        Args:
+            gemini_agent: Modullere verilecek Gemini agent
+            paths: Modul adi -> import yolu (varsayilan: MODULE_PATHS)
+            on_load: Her modul olusturuldugunda cagrilir (ad, instance)
+        """
+        self.gemini_agent = gemini_agent
+        self.paths = dict(MODULE_PATHS if paths is None else paths)
+        self.on_load = on_load
+        self._instances: Dict[str, BaseModule] = {}
+
+    def __getitem__(self, name: str) -> BaseModule:
+        instance = self._instances.get(name)
+        if instance is None:
+            if name not in self.paths:
+                raise KeyError(name)
+            instance = load_module_class(self.paths[name])(self.gemini_agent)
+            self._instances[name] = instance
+            if self.on_load is not None:
+                self.on_load(name, instance)
+            logger.debug(f"Modul yuklendi: {name}")
+        return instance
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def loaded(self) -> Dict[str, BaseModule]:
+        """Simdiye kadar olusturulmus modulleri dondurur"""
+        return dict(self._instances)
+
+    def preload(self, names: Optional[Iterable[str]] = None) -> None:
+        """Modulleri (varsayilan: hepsini) simdi import edip olusturur
+
+        Sunucu modunda ilk isteklerin import maliyeti odememesi icin
+        kullanilir.
+        """
+        for name in (self.paths if names is None else names):
+            self[name]
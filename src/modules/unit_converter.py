@@ -1,58 +1,155 @@
 """Unit Converter module for Calculator Agent"""
 
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
+from src.utils.exceptions import InvalidInputError
 from src.utils.logger import setup_logger
-from typing import Dict, Any
 
 logger = setup_logger()
 
-# Conversion factors
-CONVERSION_FACTORS: Dict[str, Dict[str, float]] = {
-    "length": {
-        "m_to_km": 0.001,
-        "m_to_cm": 100,
-        "m_to_mm": 1000,
-        "m_to_inch": 39.3701,
-        "m_to_ft": 3.28084,
-        "m_to_yd": 1.09361,
-        "m_to_mile": 0.000621371,
-        "km_to_m": 1000,
-        "cm_to_m": 0.01,
-        "mm_to_m": 0.001,
-        "inch_to_m": 0.0254,
-        "ft_to_m": 0.3048,
-        "yd_to_m": 0.9144,
-        "mile_to_m": 1609.34,
-    },
-    "weight": {
-        "kg_to_g": 1000,
-        "kg_to_mg": 1000000,
-        "kg_to_lb": 2.20462,
-        "kg_to_oz": 35.274,
-        "kg_to_ton": 0.001,
-        "g_to_kg": 0.001,
-        "mg_to_kg": 0.000001,
-        "lb_to_kg": 0.453592,
-        "oz_to_kg": 0.0283495,
-        "ton_to_kg": 1000,
-    },
-    "temperature": {
-        "celsius_to_fahrenheit": lambda c: (c * 9/5) + 32,
-        "fahrenheit_to_celsius": lambda f: (f - 32) * 5/9,
-        "celsius_to_kelvin": lambda c: c + 273.15,
-        "kelvin_to_celsius": lambda k: k - 273.15,
-    },
-    "currency": {
-        "usd_to_try": 33.50,
-        "eur_to_try": 36.75,
-        "gbp_to_try": 42.50,
-        "try_to_usd": 0.0299,
-        "try_to_eur": 0.0272,
-        "try_to_gbp": 0.0235,
-    }
+
+class Unit(NamedTuple):
+    """Birim tanımı: taban = değer * factor + offset"""
+    
+    name: str
+    dimension: str
+    factor: float
+    offset: float = 0.0
+
+
+# Boyut -> (birim, tabana çarpan, ofset, takma adlar)
+# Taban birimler: metre, kilogram, kelvin, USD
+UNIT_DEFINITIONS: Dict[str, Tuple[Tuple[str, float, float, Tuple[str, ...]], ...]] = {
+    "length": (
+        ("m", 1.0, 0.0, ("meter", "metre", "meters", "metres")),
+        ("km", 1000.0, 0.0, ("kilometer", "kilometre", "kilometers", "kilometres")),
+        ("cm", 0.01, 0.0, ("centimeter", "centimetre", "centimeters", "centimetres")),
+        ("mm", 0.001, 0.0, ("millimeter", "millimetre", "millimeters", "millimetres")),
+        ("inch", 0.0254, 0.0, ("in", "inches")),
+        ("ft", 0.3048, 0.0, ("foot", "feet")),
+        ("yd", 0.9144, 0.0, ("yard", "yards")),
+        ("mile", 1609.344, 0.0, ("miles", "mi")),
+    ),
+    "weight": (
+        ("kg", 1.0, 0.0, ("kilogram", "kilograms", "kilogramme")),
+        ("g", 0.001, 0.0, ("gram", "grams", "gramme")),
+        ("mg", 1e-6, 0.0, ("milligram", "milligrams", "milligramme")),
+        ("lb", 0.45359237, 0.0, ("pound", "pounds", "lbs")),
+        ("oz", 0.028349523125, 0.0, ("ounce", "ounces")),
+        ("ton", 1000.0, 0.0, ("tons", "tonne", "tonnes")),
+    ),
+    "temperature": (
+        ("kelvin", 1.0, 0.0, ("k",)),
+        ("celsius", 1.0, 273.15, ("c", "°c")),
+        ("fahrenheit", 5 / 9, 273.15 - 32 * 5 / 9, ("f", "°f")),
+    ),
+    "currency": (
+        ("usd", 1.0, 0.0, ("dollar", "dolar", "$")),
+        ("eur", 1.1, 0.0, ("euro", "€")),
+        ("gbp", 1.27, 0.0, ("pound", "sterlin", "£")),
+        ("try", 0.0299, 0.0, ("tl", "lira", "₺")),
+    ),
 }
 
+# Dönüşüm katsayısı cache'indeki en fazla birim çifti sayısı
+COEFFICIENT_CACHE_SIZE = 1024
+
+# Skaler sonuçların yuvarlanacağı basamak sayısı
+ROUND_DECIMALS: Dict[str, int] = {
+    "length": 6,
+    "weight": 6,
+    "temperature": 2,
+    "currency": 2,
+}
+
+
+def _build_registry() -> Dict[str, Dict[str, Unit]]:
+    """Takma ad -> {boyut: Unit} kayıt tablosunu oluşturur
+    
+    "pound" gibi adlar birden fazla boyutta (ağırlık, döviz) geçebildiği
+    için her ad boyut bazında tutulur.
+    """
+    registry: Dict[str, Dict[str, Unit]] = {}
+    for dimension, units in UNIT_DEFINITIONS.items():
+        for name, factor, offset, aliases in units:
+            unit = Unit(name, dimension, factor, offset)
+            for alias in (name, *aliases):
+                registry.setdefault(alias, {})[dimension] = unit
+    return registry
+
+
+UNIT_REGISTRY: Dict[str, Dict[str, Unit]] = _build_registry()
+
+
+def resolve_units(
+    from_unit: str,
+    to_unit: str,
+    dimension: Optional[str] = None
+) -> Tuple[Unit, Unit]:
+    """İki birimi ortak boyutta çözer
+    
+    Args:
+        from_unit: Kaynak birim (takma ad olabilir)
+        to_unit: Hedef birim
+        dimension: Sadece bu boyutta ara (opsiyonel)
+        
+    Returns:
+        (kaynak, hedef) Unit tuple'ı
+        
+    Raises:
+        ValueError: Tanınmayan birim veya uyumsuz boyutlar
+    """
+    source = UNIT_REGISTRY.get(from_unit.lower().strip(), {})
+    target = UNIT_REGISTRY.get(to_unit.lower().strip(), {})
+    dimensions = [
+        name for name in UNIT_DEFINITIONS
+        if name in source and name in target and dimension in (None, name)
+    ]
+    if not dimensions:
+        raise ValueError(f"Bilinmeyen birim dönüşümü: {from_unit} → {to_unit}")
+    return source[dimensions[0]], target[dimensions[0]]
+
+
+def conversion_coefficients(
+    from_unit: str,
+    to_unit: str,
+    dimension: Optional[str] = None
+) -> Tuple[float, float]:
+    """Dönüşümü tek çarp-topla işlemine indirger: hedef = değer * scale + shift
+    
+    Birim adları cache'e sorulmadan önce normalize edilir; tanınmayan
+    birimler hata verdiği için cache'e yalnızca geçerli ad çiftleri girer.
+    
+    Args:
+        from_unit: Kaynak birim
+        to_unit: Hedef birim
+        dimension: Sadece bu boyutta ara (opsiyonel)
+        
+    Returns:
+        (scale, shift) tuple'ı
+        
+    Raises:
+        ValueError: Tanınmayan birim veya uyumsuz boyutlar
+    """
+    return _conversion_coefficients(from_unit.lower().strip(), to_unit.lower().strip(), dimension)
+
+
+@lru_cache(maxsize=COEFFICIENT_CACHE_SIZE)
+def _conversion_coefficients(
+    from_unit: str,
+    to_unit: str,
+    dimension: Optional[str]
+) -> Tuple[float, float]:
+    """Normalize edilmiş birim adları için katsayıları hesaplar"""
+    source, target = resolve_units(from_unit, to_unit, dimension)
+    return source.factor / target.factor, (source.offset - target.offset) / target.factor
+
+
 UNIT_CONVERTER_PROMPT = """
 Sen bir birim cevirme uzmanisisin. Aşağıdaki dönüşümü yaparak sonucu JSON formatında dön.
 JSON format:
@@ -77,6 +174,8 @@ JSON format:
 class UnitConverterModule(BaseModule):
     """Birim çevirici modülü (uzunluk, ağırlık, sıcaklık, döviz kuru)"""
     
+    DOMAIN = "unit_converter"
+    
     def _get_domain_prompt(self) -> str:
         """Unit converter prompt'unu döndürür"""
         return UNIT_CONVERTER_PROMPT
@@ -94,18 +193,23 @@ class UnitConverterModule(BaseModule):
             
         Returns:
             CalculationResult objesi
+            
+        Raises:
+            InvalidInputError: İfade parse edilemedi veya birimler tanınmadı
         """
         self.validate_input(expression)
         
         logger.info(f"Unit conversion: {expression}")
         
         try:
-            # Doğal dili parse et
+            # Doğal dili parse et ve dönüştür
             value, from_unit, to_unit = self._parse_conversion_expression(expression)
-            
-            # Dönüştür
             result = self._convert_units(value, from_unit, to_unit)
-            
+        except ValueError as e:
+            logger.error(f"Unit conversion error: {e}")
+            raise InvalidInputError(str(e))
+        
+        try:
             # CalculationResult oluştur
             calculation_result = CalculationResult(
                 result=result,
@@ -130,6 +234,23 @@ class UnitConverterModule(BaseModule):
             logger.error(f"Unit conversion error: {e}")
             raise
     
+    def is_result_cacheable(self, expression: str) -> bool:
+        """Döviz çevirileri kur değişebileceği için cache'lenmez
+        
+        Args:
+            expression: Çevirme ifadesi
+            
+        Returns:
+            True if cacheable
+        """
+        try:
+            _, from_unit, to_unit = self._parse_conversion_expression(expression)
+        except ValueError:
+            return self.CACHE_RESULTS
+        if self._is_currency(from_unit) or self._is_currency(to_unit):
+            return False
+        return self.CACHE_RESULTS
+    
     def _parse_conversion_expression(self, expression: str) -> tuple:
         """Dönüştürme ifadesini parse eder
         
@@ -170,6 +291,40 @@ class UnitConverterModule(BaseModule):
         
         raise ValueError(f"Geçersiz dönüştürme ifadesi: {expression}")
     
+    def convert_many(
+        self,
+        values: ArrayLike,
+        from_unit: str,
+        to_unit: str,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Değer dizisini tek vektörize çarp-topla ile dönüştürür
+        
+        Sonuçlar yuvarlanmaz; float32 girdiler float32 olarak kalır.
+        
+        Args:
+            values: Liste veya NumPy dizisi
+            from_unit: Kaynak birim
+            to_unit: Hedef birim
+            out: Sonucun yazılacağı dizi (ek bellek ayırmamak için ``values``
+                dizisinin kendisi de verilebilir)
+            
+        Returns:
+            Dönüştürülmüş NumPy dizisi
+            
+        Raises:
+            ValueError: Tanınmayan birim veya uyumsuz boyutlar
+        """
+        scale, shift = conversion_coefficients(from_unit, to_unit)
+        values = np.asarray(values)
+        if not np.issubdtype(values.dtype, np.floating):
+            values = values.astype(float)
+        
+        result = np.multiply(values, values.dtype.type(scale), out=out)
+        if shift:
+            np.add(result, result.dtype.type(shift), out=result)
+        return result
+    
     def _convert_units(self, value: float, from_unit: str, to_unit: str) -> float:
         """Birimler arasında dönüştürme yapar
         
@@ -181,157 +336,56 @@ class UnitConverterModule(BaseModule):
         Returns:
             Dönüştürülmüş değer
         """
-        from_unit = from_unit.lower().strip()
-        to_unit = to_unit.lower().strip()
-        
-        # Uzunluk dönüşümleri
-        if self._is_length_unit(from_unit) and self._is_length_unit(to_unit):
-            return self._convert_length(value, from_unit, to_unit)
-        
-        # Ağırlık dönüşümleri
-        if self._is_weight_unit(from_unit) and self._is_weight_unit(to_unit):
-            return self._convert_weight(value, from_unit, to_unit)
-        
-        # Sıcaklık dönüşümleri
-        if self._is_temperature_unit(from_unit) and self._is_temperature_unit(to_unit):
-            return self._convert_temperature(value, from_unit, to_unit)
-        
-        # Döviz kuru dönüşümleri
-        if self._is_currency(from_unit) and self._is_currency(to_unit):
-            return self._convert_currency(value, from_unit, to_unit)
+        source, _ = resolve_units(from_unit, to_unit)
+        return self._convert(value, from_unit, to_unit, source.dimension)
+    
+    def _convert(
+        self,
+        value: float,
+        from_unit: str,
+        to_unit: str,
+        dimension: str
+    ) -> float:
+        """Önceden hesaplanmış katsayılarla dönüştürüp boyuta göre yuvarlar"""
+        try:
+            scale, shift = conversion_coefficients(from_unit, to_unit, dimension)
+        except ValueError:
+            raise ValueError(f"Tanınmayan {dimension} birimi: {from_unit} → {to_unit}")
         
-        raise ValueError(f"Bilinmeyen birim dönüşümü: {from_unit} → {to_unit}")
+        return round(value * scale + shift, ROUND_DECIMALS[dimension])
     
     def _convert_length(self, value: float, from_unit: str, to_unit: str) -> float:
         """Uzunluk birimlerini dönüştürür"""
-        # Tüm birimleri metre'ye dönüştür
-        length_aliases = {
-            "m": "m", "meter": "m", "metre": "m", "metres": "m", "meters": "m",
-            "km": "km", "kilometer": "km", "kilometre": "km", "kilometres": "km", "kilometers": "km",
-            "cm": "cm", "centimeter": "cm", "centimetre": "cm", "centimetres": "cm", "centimeters": "cm",
-            "mm": "mm", "millimeter": "mm", "millimetre": "mm", "millimetres": "mm", "millimeters": "mm",
-            "inch": "inch", "inches": "inch", "in": "inch",
-            "ft": "ft", "foot": "ft", "feet": "ft",
-            "yd": "yd", "yard": "yd", "yards": "yd",
-            "mile": "mile", "miles": "mile", "mi": "mile",
-        }
-        
-        from_unit = length_aliases.get(from_unit, from_unit)
-        to_unit = length_aliases.get(to_unit, to_unit)
-        
-        # Metre'ye dönüştür
-        to_meters = {
-            "m": 1, "km": 0.001, "cm": 100, "mm": 1000,
-            "inch": 39.3701, "ft": 3.28084, "yd": 1.09361, "mile": 0.000621371
-        }
-        
-        if from_unit not in to_meters or to_unit not in to_meters:
-            raise ValueError(f"Tanınmayan uzunluk birimi")
-        
-        # Metre cinsine dönüştür ve hedef birime dönüştür
-        meters = value / to_meters[from_unit]
-        result = meters * to_meters[to_unit]
-        
-        return round(result, 6)
+        return self._convert(value, from_unit, to_unit, "length")
     
     def _convert_weight(self, value: float, from_unit: str, to_unit: str) -> float:
         """Ağırlık birimlerini dönüştürür"""
-        weight_aliases = {
-            "kg": "kg", "kilogram": "kg", "kilograms": "kg", "kilogramme": "kg",
-            "g": "g", "gram": "g", "grams": "g", "gramme": "g",
-            "mg": "mg", "milligram": "mg", "milligrams": "mg", "milligramme": "mg",
-            "lb": "lb", "pound": "lb", "pounds": "lb", "lbs": "lb",
-            "oz": "oz", "ounce": "oz", "ounces": "oz",
-            "ton": "ton", "tons": "ton", "tonne": "ton", "tonnes": "ton",
-        }
-        
-        from_unit = weight_aliases.get(from_unit, from_unit)
-        to_unit = weight_aliases.get(to_unit, to_unit)
-        
-        # KG cinsine dönüştür
-        to_kg = {
-            "kg": 1, "g": 1000, "mg": 1000000,
-            "lb": 0.453592, "oz": 0.0283495, "ton": 0.001
-        }
-        
-        if from_unit not in to_kg or to_unit not in to_kg:
-            raise ValueError(f"Tanınmayan ağırlık birimi")
-        
-        kg = value / to_kg[from_unit]
-        result = kg * to_kg[to_unit]
-        
-        return round(result, 6)
+        return self._convert(value, from_unit, to_unit, "weight")
     
     def _convert_temperature(self, value: float, from_unit: str, to_unit: str) -> float:
         """Sıcaklık birimlerini dönüştürür"""
-        temp_aliases = {
-            "c": "celsius", "celsius": "celsius", "°c": "celsius",
-            "f": "fahrenheit", "fahrenheit": "fahrenheit", "°f": "fahrenheit",
-            "k": "kelvin", "kelvin": "kelvin",
-        }
-        
-        from_unit = temp_aliases.get(from_unit, from_unit)
-        to_unit = temp_aliases.get(to_unit, to_unit)
-        
-        # Celsius'a dönüştür
-        if from_unit == "fahrenheit":
-            celsius = (value - 32) * 5/9
-        elif from_unit == "kelvin":
-            celsius = value - 273.15
-        else:
-            celsius = value
-        
-        # Hedef birime dönüştür
-        if to_unit == "fahrenheit":
-            result = (celsius * 9/5) + 32
-        elif to_unit == "kelvin":
-            result = celsius + 273.15
-        else:
-            result = celsius
-        
-        return round(result, 2)
+        return self._convert(value, from_unit, to_unit, "temperature")
     
     def _convert_currency(self, value: float, from_currency: str, to_currency: str) -> float:
         """Döviz kuru dönüştürür"""
-        currency_aliases = {
-            "usd": "usd", "dollar": "usd", "dolar": "usd", "$": "usd",
-            "eur": "eur", "euro": "eur", "€": "eur",
-            "gbp": "gbp", "pound": "gbp", "sterlin": "gbp", "£": "gbp",
-            "try": "try", "tl": "try", "lira": "try", "₺": "try",
-        }
-        
-        from_currency = currency_aliases.get(from_currency.lower(), from_currency.lower())
-        to_currency = currency_aliases.get(to_currency.lower(), to_currency.lower())
-        
-        # USD'ye dönüştür
-        to_usd = {
-            "usd": 1, "eur": 1.1, "gbp": 1.27, "try": 0.0299
-        }
-        
-        if from_currency not in to_usd or to_currency not in to_usd:
-            raise ValueError(f"Tanınmayan döviz kuru: {from_currency} → {to_currency}")
-        
-        usd = value / to_usd[from_currency]
-        result = usd * to_usd[to_currency]
-        
-        return round(result, 2)
+        return self._convert(value, from_currency, to_currency, "currency")
+    
+    def _is_unit_of(self, unit: str, dimension: str) -> bool:
+        """Birimin verilen boyutta kayıtlı olup olmadığını kontrol eder"""
+        return dimension in UNIT_REGISTRY.get(unit.lower().strip(), {})
     
     def _is_length_unit(self, unit: str) -> bool:
         """Uzunluk birimi mi kontrol eder"""
-        length_units = {"m", "km", "cm", "mm", "inch", "ft", "yd", "mile", "in", "meter", "metre", "kilometer", "kilometre", "centimeter", "centimetre", "millimeter", "millimetre", "foot", "feet", "yard", "yards"}
-        return unit.lower() in length_units
+        return self._is_unit_of(unit, "length")
     
     def _is_weight_unit(self, unit: str) -> bool:
         """Ağırlık birimi mi kontrol eder"""
-        weight_units = {"kg", "g", "mg", "lb", "oz", "ton", "kilogram", "gram", "milligram", "pound", "ounce", "tonne"}
-        return unit.lower() in weight_units
+        return self._is_unit_of(unit, "weight")
     
     def _is_temperature_unit(self, unit: str) -> bool:
         """Sıcaklık birimi mi kontrol eder"""
-        temp_units = {"c", "f", "k", "celsius", "fahrenheit", "kelvin", "°c", "°f"}
-        return unit.lower() in temp_units
+        return self._is_unit_of(unit, "temperature")
     
     def _is_currency(self, unit: str) -> bool:
         """Döviz kuru mu kontrol eder"""
-        currencies = {"usd", "eur", "gbp", "try", "dollar", "dolar", "euro", "pound", "sterlin", "lira", "$", "€", "£", "₺"}
-        return unit.lower() in currencies
+        return self._is_unit_of(unit, "currency")
@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field
 class CalculationResult(BaseModel):
     """Hesaplama sonucu modeli"""
     
-    result: Union[float, List[float], Dict[str, Any], str] = Field(
+    result: Union[float, List[float], List[List[float]], Dict[str, Any], str] = Field(
         ..., description="Hesaplama sonucu"
     )
     steps: List[str] = Field(
@@ -0,0 +1,522 @@
+"""Asyncio HTTP/JSON server for Calculator Agent
+
+Her worker process tek bir ``CalculatorAgent`` olusturur; modul
+instance'lari, ``GeminiAgent`` istemcisi ve cache'ler tum isteklerde
+paylasilir. Baglantilar HTTP/1.1 keep-alive ile acik tutulur ve ayni
+baglantidan ardisik (pipelined) gelen istekler sirayla cevaplanir.
+
+Endpoint'ler:
+    POST /calculate  {"command": "2 + 2"}            -> sonuc kaydi
+    POST /batch      {"commands": [...], "max_concurrency": 8, "ordered": true}
+                                                      -> {"results": [...]}
+    POST /stream     {"command": "..."}               -> NDJSON olaylari (chunked)
+    GET  /plots/<plot_id>/<png|thumbnail|svg>         -> grafik dosyasi (ilk istekte cizilir)
+    GET  /health                                      -> {"status": "ok"}
+"""
+
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import re
+import signal
+import socket
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.settings import settings
+from src.utils.exceptions import CalculationError
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+MAX_HEADER_BYTES = 16 * 1024
+PLOT_PATH = re.compile(r"^/plots/(?P<plot_id>[0-9a-f]{64})/(?P<variant>[a-z]+)$")
+CONTENT_TYPES = {".png": "image/png", ".svg": "image/svg+xml"}
+
+Response = Tuple[int, Dict[str, Any]]
+
+
+class HTTPError(Exception):
+    """Istemciye HTTP durum koduyla donulecek hata"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class CalculatorServer:
+    """Tek process icinde calisan asyncio HTTP sunucusu"""
+
+    def __init__(
+        self,
+        agent: Any,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        max_body_bytes: Optional[int] = None
+    ):
+        """Sunucuyu hazirlar
+
+        Args:
+            agent: Paylasilan CalculatorAgent instance'i
+            host: Dinlenecek adres (varsayilan: settings.SERVER_HOST)
+            port: Dinlenecek port (0 ise isletim sistemi secer)
+            keepalive_timeout: Bos baglantinin kapatilacagi sure (saniye)
+            max_body_bytes: Kabul edilen maksimum istek govdesi
+        """
+        self.agent = agent
+        self.host = host if host is not None else settings.SERVER_HOST
+        self.port = port if port is not None else settings.SERVER_PORT
+        self.keepalive_timeout = (
+            keepalive_timeout if keepalive_timeout is not None
+            else settings.SERVER_KEEPALIVE_TIMEOUT
+        )
+        self.max_body_bytes = max_body_bytes or settings.SERVER_MAX_BODY_BYTES
+        self.server: Optional[asyncio.AbstractServer] = None
+
+        self.total_requests = 0
+        self.total_connections = 0
+
+    async def start(self, reuse_port: bool = False) -> None:
+        """Dinlemeye baslar
+
+        Args:
+            reuse_port: SO_REUSEPORT ile ayni portu diger worker'larla paylas
+        """
+        self.server = await asyncio.start_server(
+            self.handle_connection,
+            self.host,
+            self.port,
+            reuse_port=reuse_port or None,
+            limit=MAX_HEADER_BYTES,
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Server listening on {self.host}:{self.port} (pid {os.getpid()})")
+
+    async def serve_forever(self) -> None:
+        """Sunucu kapatilana kadar istek kabul eder"""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        """Dinlemeyi durdurur"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Bir baglantidaki istekleri sirayla (keep-alive/pipelining) isler"""
+        self.total_connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), timeout=self.keepalive_timeout
+                    )
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write_response(
+                        writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                        {"error": "Header cok buyuk"}, keep_alive=False
+                    )
+                    break
+
+                keep_alive = await self._handle_request(head, reader, writer)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_request(
+        self,
+        head: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> bool:
+        """Tek istegi okuyup cevaplar
+
+        Returns:
+            Baglanti acik tutulacaksa True
+        """
+        self.total_requests += 1
+        keep_alive = False
+        try:
+            method, path, version, headers = self._parse_head(head)
+            connection = headers.get("connection", "").lower()
+            if version == "HTTP/1.1":
+                wants_keep_alive = connection != "close"
+            else:
+                wants_keep_alive = connection == "keep-alive"
+
+            body = await self._read_body(headers, reader)
+            # Govde tamamen okunmadiysa siradaki istegin siniri bilinmez
+            keep_alive = wants_keep_alive
+            if path == "/stream":
+                return await self._stream(method, body, writer, keep_alive)
+            if path.startswith("/plots/"):
+                return await self._plot_file(method, path, writer, keep_alive)
+            status, payload = await self.dispatch(method, path, body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception as e:
+            logger.error(f"Server error: {e}", exc_info=True)
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+        await self._write_response(writer, status, payload, keep_alive)
+        return keep_alive
+
+    def _parse_head(self, head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        """Istek satirini ve header'lari parse eder"""
+        try:
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Gecersiz istek satiri")
+
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        return method.upper(), target.split("?", 1)[0], version.upper(), headers
+
+    async def _read_body(self, headers: Dict[str, str], reader: asyncio.StreamReader) -> bytes:
+        """Content-Length kadar govde okur"""
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Chunked govde desteklenmiyor")
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Gecersiz Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Istek govdesi cok buyuk")
+
+        return await reader.readexactly(length) if length else b""
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Response:
+        """Istegi ilgili handler'a yonlendirir
+
+        Args:
+            method: HTTP metodu
+            path: Istek yolu
+            body: Ham istek govdesi
+
+        Returns:
+            (durum kodu, JSON payload) tuple'i
+
+        Raises:
+            HTTPError: Bilinmeyen yol, yanlis metod veya gecersiz govde
+        """
+        routes = {
+            "/calculate": ("POST", self._calculate),
+            "/batch": ("POST", self._batch),
+            "/health": ("GET", self._health),
+        }
+        if path not in routes:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Bilinmeyen yol: {path}")
+
+        expected_method, handler = routes[path]
+        if method != expected_method:
+            raise HTTPError(
+                HTTPStatus.METHOD_NOT_ALLOWED, f"{path} sadece {expected_method} kabul eder"
+            )
+
+        return await handler(self._parse_json_body(body))
+
+    def _parse_json_body(self, body: bytes) -> Dict[str, Any]:
+        """Istek govdesini JSON object olarak parse eder"""
+        payload: Dict[str, Any] = {}
+        if body:
+            try:
+                payload = json.loads(body)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Govde gecerli JSON olmali")
+            if not isinstance(payload, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Govde JSON object olmali")
+        return payload
+
+    async def _calculate(self, payload: Dict[str, Any]) -> Response:
+        """POST /calculate"""
+        if not (payload.get("command") or payload.get("expression")):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'command' alani gerekli")
+
+        record = await self.agent.run_record(payload)
+        status = HTTPStatus.OK if record["ok"] else HTTPStatus.UNPROCESSABLE_ENTITY
+        return status, record
+
+    async def _batch(self, payload: Dict[str, Any]) -> Response:
+        """POST /batch"""
+        commands = payload.get("commands")
+        if not isinstance(commands, list):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'commands' listesi gerekli")
+
+        results = [
+            record
+            async for record in self.agent.iter_batch(
+                commands,
+                max_concurrency=self._max_concurrency(payload.get("max_concurrency")),
+                ordered=payload.get("ordered", True),
+            )
+        ]
+        return HTTPStatus.OK, {"results": results}
+
+    @staticmethod
+    def _max_concurrency(value: Any) -> Optional[int]:
+        """Istemcinin max_concurrency degerini dogrulayip sunucu limitine indirir
+
+        Raises:
+            HTTPError: Deger pozitif tamsayi degil
+        """
+        if value is None:
+            return None
+        try:
+            if isinstance(value, bool) or int(value) != float(value):
+                raise ValueError(value)
+            value = int(value)
+        except (TypeError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'max_concurrency' tamsayi olmali")
+        if value < 1:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'max_concurrency' en az 1 olmali")
+        return min(value, settings.SERVER_MAX_BATCH_CONCURRENCY)
+
+    async def _stream(
+        self,
+        method: str,
+        body: bytes,
+        writer: asyncio.StreamWriter,
+        keep_alive: bool
+    ) -> bool:
+        """POST /stream: adimlari chunked NDJSON olarak geldikce yazar
+
+        Basliklar yazildiktan sonra olusan hatalar ``{"event": "error"}``
+        satiri olarak iletilir.
+
+        Returns:
+            Baglanti acik tutulacaksa True
+        """
+        if method != "POST":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "/stream sadece POST kabul eder")
+        payload = self._parse_json_body(body)
+        command = str(payload.get("command") or payload.get("expression") or "")
+        if not command:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'command' alani gerekli")
+
+        head = (
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/x-ndjson; charset=utf-8\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1"))
+
+        try:
+            async for event in self.agent.stream_command(command):
+                if event["event"] == "result":
+                    event = {
+                        "event": "result",
+                        "ok": True,
+                        **self.agent.record_fields(event["result"]),
+                    }
+                await self._write_chunk(writer, event)
+        except ConnectionError:
+            return False
+        except Exception as e:
+            logger.warning(f"Stream command failed: {e}")
+            await self._write_chunk(
+                writer, {"event": "error", "error": str(e), "error_type": type(e).__name__}
+            )
+
+        writer.write(b"0\r\n\r\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            return False
+        return keep_alive
+
+    async def _plot_file(
+        self,
+        method: str,
+        path: str,
+        writer: asyncio.StreamWriter,
+        keep_alive: bool
+    ) -> bool:
+        """GET /plots/<plot_id>/<variant>: grafik varyantini dosya olarak doner
+
+        Varyant daha once cizilmediyse cache'teki cizim tanimindan simdi
+        cizilir; boylece istemci yalnizca gosterdigi varyantin bedelini oder.
+
+        Returns:
+            Baglanti acik tutulacaksa True
+        """
+        if method != "GET":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "/plots sadece GET kabul eder")
+        match = PLOT_PATH.match(path)
+        if not match:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Bilinmeyen yol: {path}")
+
+        try:
+            file_path = await self.agent.render_plot(match["plot_id"], match["variant"])
+        except CalculationError as e:
+            raise HTTPError(HTTPStatus.NOT_FOUND, str(e))
+
+        body = await asyncio.to_thread(Path(file_path).read_bytes)
+        content_type = CONTENT_TYPES.get(os.path.splitext(file_path)[1], "application/octet-stream")
+        await self._write_body(writer, HTTPStatus.OK, body, content_type, keep_alive)
+        return keep_alive
+
+    async def _write_chunk(self, writer: asyncio.StreamWriter, event: Dict[str, Any]) -> None:
+        """Tek NDJSON satirini chunk olarak yazar ve flush eder"""
+        line = json.dumps(event, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+        writer.write(f"{len(line):x}\r\n".encode("latin-1") + line + b"\r\n")
+        await writer.drain()
+
+    async def _health(self, payload: Dict[str, Any]) -> Response:
+        """GET /health"""
+        return HTTPStatus.OK, {
+            "status": "ok",
+            "pid": os.getpid(),
+            "requests": self.total_requests,
+            "connections": self.total_connections,
+            "result_cache": self.agent.result_cache_stats(),
+            "plot_cache": self.agent.plot_cache_stats(),
+        }
+
+    async def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict[str, Any],
+        keep_alive: bool
+    ) -> None:
+        """JSON cevabi yazar"""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        await self._write_body(
+            writer, status, body, "application/json; charset=utf-8", keep_alive
+        )
+
+    async def _write_body(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str,
+        keep_alive: bool
+    ) -> None:
+        """Ham govdeli cevabi yazar"""
+        status = HTTPStatus(status)
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def _run_worker(host: str, port: int, reuse_port: bool, preload: bool) -> None:
+    """Worker process'in event loop'u: tek CalculatorAgent, tek sunucu"""
+    from src.main import CalculatorAgent
+
+    # SIGTERM (ana process'in terminate'i) sunucuyu durdurur; boylece
+    # cizim worker'lari oksuz kalmadan kapatilir
+    with contextlib.suppress(NotImplementedError):
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, asyncio.current_task().cancel
+        )
+
+    agent = CalculatorAgent()
+    try:
+        agent.warm_up(preload=preload)
+        server = CalculatorServer(agent, host=host, port=port)
+        await server.start(reuse_port=reuse_port)
+        await server.serve_forever()
+    finally:
+        agent.shutdown()
+
+
+def _worker_main(host: str, port: int, reuse_port: bool, preload: bool) -> None:
+    """multiprocessing hedefi"""
+    try:
+        asyncio.run(_run_worker(host, port, reuse_port, preload))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+def serve(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    preload: bool = False
+) -> None:
+    """Sunucuyu bir veya birden fazla worker process ile calistirir
+
+    Birden fazla worker, SO_REUSEPORT ile ayni portu paylasir ve baglantilar
+    isletim sistemi tarafindan dagitilir. SO_REUSEPORT olmayan platformlarda
+    tek worker ile calisilir.
+
+    Args:
+        host: Dinlenecek adres (varsayilan: settings.SERVER_HOST)
+        port: Dinlenecek port (varsayilan: settings.SERVER_PORT)
+        workers: Worker process sayisi (varsayilan: settings.SERVER_WORKERS)
+        preload: Tum modulleri (ve agir bagimliliklarini) ilk istekten once
+            yukle; aksi halde moduller ilk kullanildiklarinda yuklenir
+    """
+    host = host if host is not None else settings.SERVER_HOST
+    port = port if port is not None else settings.SERVER_PORT
+    workers = max(1, workers or settings.SERVER_WORKERS)
+
+    if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        logger.warning("SO_REUSEPORT desteklenmiyor, tek worker ile calisiliyor")
+        workers = 1
+
+    if workers == 1:
+        _worker_main(host, port, reuse_port=False, preload=preload)
+        return
+
+    # Worker'lar daemon degil: plot renderer'in process pool'u gibi kendi
+    # alt process'lerini olusturabilmeleri gerekir; bu yuzden burada
+    # acikca sonlandirilip beklenirler
+    processes = [
+        multiprocessing.Process(target=_worker_main, args=(host, port, True, preload))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"{workers} worker baslatildi: {host}:{port}")
+    # docker stop gibi SIGTERM ile kapatmada da worker'lari duzgun sonlandir
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
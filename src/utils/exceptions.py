@@ -24,3 +24,8 @@ class ModuleNotFoundError(CalculationError):
     """Modul bulunamadi"""
     pass
 
+
+
+class UnsupportedExpressionError(InvalidInputError):
+    """Ifade yerel motorla degerlendirilemiyor"""
+    pass
@@ -2,6 +2,7 @@
 
 import pytest
 from src.modules.basic_math import BasicMathModule
+from src.utils.exceptions import CalculationError
 
 
 @pytest.mark.asyncio
@@ -24,3 +25,64 @@ async def test_basic_sqrt(mock_gemini_agent):
     assert result is not None
     assert result.domain == "basic_math"
 
+
+
+@pytest.mark.asyncio
+async def test_basic_arithmetic_evaluated_locally(mock_gemini_agent):
+    """Duz aritmetik Gemini'ye gitmeden hesaplanmali"""
+    module = BasicMathModule(mock_gemini_agent)
+    result = await module.calculate("sqrt(256) + 2^3 * 2pi")
+    
+    assert result.result == pytest.approx(16 + 16 * 3.141592653589793)
+    assert result.metadata == {"engine": "local"}
+    assert len(result.steps) >= 2
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_basic_trigonometry_degrees(mock_gemini_agent):
+    """Derece cinsinden trigonometri yerel hesaplanmali"""
+    module = BasicMathModule(mock_gemini_agent)
+    result = await module.calculate("sin(30deg)")
+    
+    assert result.result == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_basic_natural_language_falls_back_to_gemini(mock_gemini_agent):
+    """Yerel motorun anlamadigi ifade Gemini'ye gonderilmeli"""
+    module = BasicMathModule(mock_gemini_agent)
+    result = await module.calculate("what is two plus two")
+    
+    assert result.result == 42.0
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_basic_division_by_zero(mock_gemini_agent):
+    """Sifira bolme yerel olarak hata vermeli"""
+    module = BasicMathModule(mock_gemini_agent)
+    
+    with pytest.raises(CalculationError):
+        await module.calculate("1 / 0")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", ["1e400", "1e308 * 10", "-1e308 - 1e308"])
+async def test_basic_overflow_is_rejected(mock_gemini_agent, expression):
+    """Sonsuza tasan sonuclar inf olarak donmemeli"""
+    module = BasicMathModule(mock_gemini_agent)
+    
+    with pytest.raises(CalculationError):
+        await module.calculate(expression)
+    mock_gemini_agent.generate_json_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_basic_deep_nesting_falls_back_to_gemini(mock_gemini_agent):
+    """Cok derin ic ice ifade RecursionError yerine Gemini'ye gitmeli"""
+    module = BasicMathModule(mock_gemini_agent)
+    result = await module.calculate("-" * 998 + "1")
+    
+    assert result.result == 42.0
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
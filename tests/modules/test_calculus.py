@@ -1,8 +1,11 @@
 """Tests for calculus module"""
 
+import time
+
 import pytest
+from src.config.settings import settings
 from src.modules.calculus import CalculusModule
-from src.utils.exceptions import InvalidInputError
+from src.utils.exceptions import CalculationError, InvalidInputError
 
 
 @pytest.mark.asyncio
@@ -34,3 +37,86 @@ async def test_calculus_integral(mock_gemini_agent):
     assert result is not None
     assert result.domain == "calculus"
 
+
+
+@pytest.mark.asyncio
+async def test_calculus_derivative_computed_with_sympy(mock_gemini_agent):
+    """Noktada turev SymPy ile yerel hesaplanmali"""
+    module = CalculusModule(mock_gemini_agent)
+    result = await module.calculate("derivative x^2 sin(x) at x=pi")
+    
+    assert result.result == pytest.approx(-9.8696044, rel=1e-6)
+    assert result.metadata["engine"] == "sympy"
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_calculus_definite_integral_exact(mock_gemini_agent):
+    """Belirli integral kesin sonuc vermeli"""
+    module = CalculusModule(mock_gemini_agent)
+    result = await module.calculate("integral x^2 from 0 to 1")
+    
+    assert result.result == pytest.approx(1 / 3)
+    assert any("1/3" in step for step in result.steps)
+
+
+@pytest.mark.asyncio
+async def test_calculus_limit_and_series(mock_gemini_agent):
+    """Limit ve Taylor serisi yerel hesaplanmali"""
+    module = CalculusModule(mock_gemini_agent)
+    
+    limit = await module.calculate("limit sin(x)/x as x->0")
+    series = await module.calculate("taylor series sin(x) at x=0 order 5")
+    
+    assert limit.result == 1.0
+    assert series.result == "-x**3/6 + x"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", ["limit 1/x as x->0", "limit abs(x)/x as x->0"])
+async def test_calculus_one_sided_limit_is_not_reported(mock_gemini_agent, expression):
+    """Sag ve sol limitleri farkli olan ifadede limit yok hatasi verilmeli"""
+    module = CalculusModule(mock_gemini_agent)
+    
+    with pytest.raises(CalculationError, match="Limit yok"):
+        await module.calculate(expression)
+    mock_gemini_agent.generate_json_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_calculus_unparseable_falls_back_to_gemini(mock_gemini_agent):
+    """SymPy'nin anlamadigi ifade Gemini'ye gonderilmeli"""
+    module = CalculusModule(mock_gemini_agent)
+    result = await module.calculate("gradient of the temperature field")
+    
+    assert result.result == 42.0
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", [
+    "derivative 9^9^9^9*x",
+    "derivative x^1000000",
+    "integral 1/x from -1 to 1",
+])
+async def test_calculus_oversized_or_non_finite_falls_back_to_gemini(mock_gemini_agent, expression):
+    """Asiri buyuk usler parse edilmeden, sonlu olmayan integraller hesaptan sonra reddedilmeli"""
+    module = CalculusModule(mock_gemini_agent)
+    result = await module.calculate(expression)
+    
+    assert result.result == 42.0
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_calculus_sympy_timeout_falls_back_to_gemini(mock_gemini_agent, monkeypatch):
+    """Sure limitini asan SymPy hesabi beklenmemeli"""
+    module = CalculusModule(mock_gemini_agent)
+    monkeypatch.setattr(settings, "SYMPY_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(module, "_solve_symbolically", lambda expression: time.sleep(1))
+    
+    started = time.perf_counter()
+    result = await module.calculate("derivative x^2")
+    
+    assert time.perf_counter() - started < 0.5
+    assert result.result == 42.0
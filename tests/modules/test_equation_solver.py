@@ -0,0 +1,98 @@
+"""Tests for equation solver module"""
+
+import numpy as np
+import pytest
+from src.modules.equation_solver import EquationSolverModule
+
+
+@pytest.mark.asyncio
+async def test_quadratic_solved_locally(mock_gemini_agent):
+    """Polinom denklemler Gemini'ye gitmeden cozulmeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate("2x^2 - 5x + 3 = 0")
+    
+    assert result.result == pytest.approx([1.0, 1.5])
+    assert result.domain == "equation_solver"
+    assert result.metadata["engine"] == "numpy"
+    mock_gemini_agent.generate_json_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_complex_roots_reported(mock_gemini_agent):
+    """Reel koku olmayan polinomda karmasik kokler dondurulmeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate("x^2 + 1 = 0")
+    
+    assert result.result["real_roots"] == []
+    assert sorted(result.result["complex_roots"]) == ["-1j", "1j"]
+
+
+@pytest.mark.asyncio
+async def test_linear_system_solved_locally(mock_gemini_agent):
+    """Dogrusal denklem sistemi yerel olarak cozulmeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate("x + y = 3; x - y = 1")
+    
+    assert result.result == {"x": pytest.approx(2.0), "y": pytest.approx(1.0)}
+    mock_gemini_agent.generate_json_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_nonlinear_equation_root_search(mock_gemini_agent):
+    """Transandant denklem kokleri sayisal olarak bulunmali"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate("cos(x) = x")
+    
+    assert result.result == pytest.approx([0.7390851332])
+
+
+@pytest.mark.asyncio
+async def test_unsupported_equation_falls_back_to_gemini(mock_gemini_agent):
+    """Yerel cozucunun desteklemedigi denklem Gemini'ye gitmeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate("dy/dx = y")
+    
+    assert result.result == 42.0
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", [
+    "x^1000000 = 1",
+    "x^200 = 1",
+    "x + y = 3, x - y",
+    "x + y = 3, x - y = 1 = 2",
+])
+async def test_oversized_or_malformed_equation_falls_back_to_gemini(mock_gemini_agent, expression):
+    """Cok yuksek dereceli polinom ve bozuk sistemler hata yerine Gemini'ye gitmeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate(expression)
+    
+    assert result.result == 42.0
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+def test_polynomial_batch_matches_numpy_roots(mock_gemini_agent):
+    """Batch cozum numpy.roots ile ayni kokleri vermeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    rng = np.random.default_rng(0)
+    coefficients = rng.uniform(1, 5, size=(50, 4))
+    
+    roots = module.solve_polynomial_batch(coefficients)
+    
+    assert roots.shape == (50, 3)
+    for row, row_roots in zip(coefficients, roots):
+        assert np.sort_complex(row_roots) == pytest.approx(
+            np.sort_complex(np.roots(row))
+        )
+
+
+def test_linear_batch(mock_gemini_agent):
+    """Batch dogrusal sistem cozumu"""
+    module = EquationSolverModule(mock_gemini_agent)
+    matrices = np.array([[[2.0, 1.0], [1.0, 3.0]], [[1.0, 0.0], [0.0, 2.0]]])
+    constants = np.array([[3.0, 5.0], [1.0, 4.0]])
+    
+    assert module.solve_linear_batch(matrices, constants) == pytest.approx(
+        np.array([[0.8, 1.4], [1.0, 2.0]])
+    )
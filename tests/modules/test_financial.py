@@ -0,0 +1,153 @@
+"""Tests for financial module"""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from src.core import finance
+from src.modules.financial import FinancialModule
+from src.utils.exceptions import InvalidInputError
+
+
+@pytest.mark.asyncio
+async def test_loan_payment_computed_locally(mock_gemini_agent):
+    """Kredi taksiti Gemini'ye gitmeden kurus hassasiyetinde hesaplanmali"""
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate("loan 100000 6% 30 years")
+    
+    assert result.result == Decimal("599.55")
+    assert result.domain == "financial"
+    assert result.metadata["engine"] == "decimal"
+    mock_gemini_agent.generate_json_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_npv_and_irr(mock_gemini_agent):
+    """NPV ve IRR yerel olarak hesaplanmali"""
+    module = FinancialModule(mock_gemini_agent)
+    npv = await module.calculate("npv 10% -1000 300 400 500")
+    irr = await module.calculate("irr -1000 300 400 500")
+    
+    assert npv.result == Decimal("-21.04")
+    assert irr.result == pytest.approx(0.0889633947)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", [
+    "%5 faiz ile 100000 kredi 10 yil",
+    "kredi 100000 %5 120 ay",
+    "loan 100000 0.05 10 years",
+])
+async def test_loan_roles_assigned_by_percent_and_unit(mock_gemini_agent, expression):
+    """Tutar, faiz ve vade yazilis sirasindan bagimsiz taninmali"""
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate(expression)
+    
+    assert result.result == Decimal("1060.66")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", [
+    "loan 100000 6 30 years",
+    "loan 100000 6% 30",
+    "amortization 1000 5% 5000 years",
+])
+async def test_ambiguous_or_oversized_loan_rejected(mock_gemini_agent, expression):
+    """Rolleri belirsiz veya vadesi cok uzun krediler InvalidInputError vermeli"""
+    module = FinancialModule(mock_gemini_agent)
+    
+    with pytest.raises(InvalidInputError):
+        await module.calculate(expression)
+
+
+@pytest.mark.asyncio
+async def test_amortization_schedule_closes_exactly(mock_gemini_agent):
+    """Odeme plani sonunda kalan borc tam sifir olmali"""
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate("amortization 1000 12% 3 months")
+    schedule = result.result["schedule"]
+    
+    assert len(schedule) == 3
+    assert schedule[-1]["balance"] == "0.00"
+    assert sum(Decimal(row["principal"]) for row in schedule) == Decimal("1000")
+
+
+@pytest.mark.asyncio
+async def test_unrecognized_expression_falls_back_to_gemini(mock_gemini_agent):
+    """Taninmayan finansal ifade Gemini'ye gitmeli"""
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate("hisse senedi getirisi nedir")
+    
+    assert result.result == Decimal("42.0")
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+def test_loan_payment_batch_matches_exact(mock_gemini_agent):
+    """Vektorize taksitler Decimal sonuclarla kurus farkinda uyusmali"""
+    module = FinancialModule(mock_gemini_agent)
+    rng = np.random.default_rng(0)
+    principals = rng.uniform(1e4, 1e6, 100_000)
+    rates = rng.uniform(0.01, 0.3, 100_000)
+    
+    payments = module.loan_payments(principals, rates, 360)
+    exact = module.loan_payments(principals[:100], rates[:100], 360, exact=True)
+    
+    assert payments.shape == (100_000,)
+    assert payments[:100] == pytest.approx([float(value) for value in exact], abs=0.006)
+
+
+def test_irr_batch_zeroes_npv(mock_gemini_agent):
+    """Batch IRR her seri icin NPV'yi sifirlamali"""
+    module = FinancialModule(mock_gemini_agent)
+    cash_flows = np.array([[-1000, 300, 400, 500], [-500, 100, 100, 400], [-100, 110, 0, 0]])
+    
+    rates = module.irr_batch(cash_flows)
+    
+    assert rates[2] == pytest.approx(0.1)
+    assert module.npv_batch(rates, cash_flows) == pytest.approx([0, 0, 0], abs=1e-8)
+
+
+def test_zero_rate_loan():
+    """Faizsiz kredide taksit anapara / vade olmali"""
+    schedule = finance.amortization_schedule(1200, 0.0, 12)
+    
+    assert finance.loan_payment(1200, 0.0, 12) == pytest.approx(100.0)
+    assert schedule["balance"][-1] == pytest.approx(0.0)
+    assert finance.decimal_loan_payment(1200, 0, 12) == Decimal("100.00")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", [
+    "compound interest 5% on 1000 for 10 years",
+    "bilesik faiz 10 yil %5 1000",
+    "compound interest 1000 5% 120 months",
+])
+async def test_compound_interest_roles_assigned_by_percent_and_unit(mock_gemini_agent, expression):
+    """Bilesik faizde roller yazilis sirasindan bagimsiz taninmali"""
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate(expression)
+    
+    assert result.result == Decimal("1628.89")
+
+
+@pytest.mark.asyncio
+async def test_npv_rate_taken_from_percent_value(mock_gemini_agent):
+    """NPV'de oran yuzde isaretli sayi olmali, kalanlar sirasiyla nakit akislari"""
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate("npv of -1000, 300, 400, 500 at 10%")
+    
+    assert result.result == Decimal("-21.04")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", [
+    "npv -1000 300 400 500",
+    "npv 10% -1000 300 5% 500",
+    "compound interest 1000 5% 10",
+])
+async def test_ambiguous_npv_or_compound_interest_rejected(mock_gemini_agent, expression):
+    """Orani veya vadesi belirsiz ifadeler InvalidInputError vermeli"""
+    module = FinancialModule(mock_gemini_agent)
+    
+    with pytest.raises(InvalidInputError):
+        await module.calculate(expression)
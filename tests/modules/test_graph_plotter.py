@@ -0,0 +1,293 @@
+"""Tests for graph plotter module"""
+
+import asyncio
+import base64
+import io
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+from src.core.expression_compiler import compile_expression
+from src.core.plot_cache import PlotCache
+from src.core.sample_export import decimate_indices
+from src.core.renderer import PlotRenderer, render_line_plot
+from src.core.sampling import adaptive_sample, downsample_mesh, evaluate_mesh
+from src.modules.graph_plotter import GraphPlotterModule
+from src.utils.exceptions import CalculationError, UnsupportedExpressionError
+
+
+def test_compiled_function_evaluates_all_points_at_once():
+    """Derlenen fonksiyon dizinin tamamini tek cagriyla hesaplamali"""
+    x = np.linspace(-2, 2, 5)
+    function = compile_expression("y = 2x^2 - 3sin(x) + pi")
+    
+    expected = 2 * x ** 2 - 3 * np.sin(x) + np.pi
+    assert np.allclose(function(x), expected)
+    assert function.expression == "2*x**2-3*sin(x)+pi"
+    assert compile_expression("2 x ^ 2 - 3 sin(x) + pi") is function
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('ls')",
+    "x.__class__",
+    "(lambda: 1)()",
+    "open('f')",
+    "max(x, 1)",
+    "x if x else 1",
+    "-" * 3000 + "x",
+    "(" * 3000 + "x" + ")" * 3000,
+])
+def test_compiler_rejects_unsafe_expressions(expression):
+    """Beyaz liste disindaki her sey reddedilmeli"""
+    with pytest.raises(UnsupportedExpressionError):
+        compile_expression(expression)
+
+
+def test_compiled_function_marks_undefined_points():
+    """Tanimsiz noktalar hata firlatmadan NaN/inf olmali"""
+    y = compile_expression("log(x) + 1/x")(np.array([-1.0, 0.0, 1.0]))
+    
+    assert np.isnan(y[0]) and not np.isfinite(y[1])
+    assert y[2] == pytest.approx(1.0)
+    assert compile_expression("3")(np.zeros(4)).shape == (4,)
+
+
+def test_adaptive_sampling_uses_few_points_for_smooth_curves():
+    """Duz egriler sabit 1000 noktadan cok daha az noktayla orneklenmeli"""
+    x, y, y_limits = adaptive_sample(compile_expression("x^2"), -10, 10)
+    
+    assert x.size < 200
+    assert np.all(np.diff(x) > 0)
+    assert np.allclose(y, x ** 2)
+    assert y_limits is None
+
+
+def test_adaptive_sampling_refines_narrow_peaks():
+    """Baslangic izgarasinin kacirdigi dar tepe bulunmali"""
+    x, y, _ = adaptive_sample(compile_expression("1/((x-0.01)^2+0.00001)"), -1, 1)
+    
+    assert np.nanmax(y) > 5e4
+    assert not np.isnan(y).any()
+
+
+def test_adaptive_sampling_breaks_line_at_asymptotes():
+    """tan(x) asimptotlarinda cizgi kirilmali ve y ekseni sinirlanmali"""
+    x, y, y_limits = adaptive_sample(compile_expression("tan(x)"), -10, 10, max_points=2000)
+    
+    asymptotes = np.pi / 2 + np.pi * np.arange(-4, 3)
+    breaks = x[np.isnan(y)]
+    assert len(breaks) == 6
+    assert np.allclose(breaks, asymptotes[np.abs(asymptotes) < 10], atol=1e-3)
+    assert x.size < 1000
+    assert y_limits is not None and y_limits[1] < 100
+    
+    segments = np.split(y, np.flatnonzero(np.isnan(y)))
+    assert all(np.all(np.diff(segment[np.isfinite(segment)]) > 0) for segment in segments)
+
+
+@pytest.mark.asyncio
+async def test_plot_2d_renders_actual_function(mock_gemini_agent, tmp_path):
+    """Gemini'nin verdigi fonksiyon gercekten cizilmeli"""
+    mock_gemini_agent.generate_json_response.return_value = {
+        "result": "Grafik olusturuldu",
+        "steps": ["sin(x) ciziliyor"],
+        "confidence_score": 1.0,
+        "visual_data": {"function": "sin(x)/x", "x_range": [-10, 10], "plot_type": "2d"},
+    }
+    module = GraphPlotterModule(mock_gemini_agent)
+    module.plot_cache = PlotCache(str(tmp_path), max_bytes=0)
+    
+    result = await module.calculate("plot sin(x)/x")
+    
+    png_path = result.visual_data["plot_paths"]["png"]
+    assert png_path.startswith(str(tmp_path))
+    assert result.visual_data["samples"] < 1000
+    with open(png_path, "rb") as png:
+        assert png.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.mark.asyncio
+async def test_process_pool_renders_without_blocking_event_loop(tmp_path):
+    """Cizim worker process'lerde yapilmali, event loop calismaya devam etmeli"""
+    renderer = PlotRenderer(max_workers=2)
+    renderer.start()
+    x = np.linspace(0, 10, 500)
+    ticks = 0
+    
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+    
+    tick_task = asyncio.ensure_future(ticker())
+    try:
+        paths = await asyncio.gather(*(
+            renderer.render(render_line_plot, {
+                "x": x, "y": np.sin(x * k), "title": f"sin({k}x)", "path": str(tmp_path / f"{k}.png"),
+            })
+            for k in range(1, 5)
+        ))
+        worker_pids = {
+            await asyncio.get_running_loop().run_in_executor(renderer._executor, os.getpid)
+            for _ in range(4)
+        }
+    finally:
+        tick_task.cancel()
+        renderer.shutdown()
+    
+    assert all(os.path.getsize(path) > 0 for path in paths)
+    assert renderer.rendered == 4
+    assert ticks > 0
+    assert os.getpid() not in worker_pids
+
+
+def _render_in_daemon(path: str, results) -> None:
+    """Daemon process icinde renderer'i baslatip bir grafik cizer"""
+    renderer = PlotRenderer(max_workers=2)
+    renderer.start()
+    x = np.linspace(0, 1, 10)
+    spec = {"x": x, "y": x, "title": "x", "path": path}
+    results.put((asyncio.run(renderer.render(render_line_plot, spec)), renderer.max_workers))
+
+
+def test_renderer_falls_back_to_thread_in_daemon_process(tmp_path):
+    """Daemon sunucu worker'inda pool yerine thread'de cizilmeli"""
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_render_in_daemon, args=(str(tmp_path / "daemon.png"), results), daemon=True
+    )
+    process.start()
+    path, max_workers = results.get(timeout=60)
+    process.join(timeout=60)
+    
+    assert process.exitcode == 0
+    assert max_workers == 0
+    assert os.path.getsize(path) > 0
+
+
+def test_mesh_evaluated_in_one_pass_and_downsampled_for_preview():
+    """Yuzey tek cagriyla hesaplanmali, onizlemede uclari koruyarak seyreltilmeli"""
+    function = compile_expression("z = x^2 - y", ("x", "y"))
+    mesh = evaluate_mesh(function, (-2, 2), (0, 1), 101)
+    
+    assert mesh.z.shape == (101, 101)
+    assert mesh.z[-1, 0] == pytest.approx(4 - 1)
+    
+    preview = downsample_mesh(mesh, 30)
+    assert max(preview.z.shape) <= 30
+    assert (preview.x[0], preview.x[-1], preview.y[-1]) == (-2, 2, 1)
+    assert np.allclose(preview.z, preview.x[None, :] ** 2 - preview.y[:, None])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("visual_data, expected", [
+    ({"function": "sin(x) * cos(y)", "plot_type": "3d", "quality": "preview"}, {"mesh": [30, 30]}),
+    ({"function": "sin(x) * cos(y)", "plot_type": "3d", "resolution": 10_000}, {"mesh": [250, 250]}),
+    ({"function": "(cos(3t), sin(2t))", "plot_type": "parametric"}, {"samples": 1000}),
+    ({"function": "r = 1 + cos(θ)", "plot_type": "polar", "quality": "preview"}, {"samples": 200}),
+])
+async def test_non_2d_plot_types_render_with_resolution_budget(
+    mock_gemini_agent, tmp_path, visual_data, expected
+):
+    """3D, parametrik ve polar grafikler gercekten ve butce icinde cizilmeli"""
+    mock_gemini_agent.generate_json_response.return_value = {
+        "result": "Grafik olusturuldu",
+        "steps": [],
+        "confidence_score": 1.0,
+        "visual_data": visual_data,
+    }
+    module = GraphPlotterModule(mock_gemini_agent)
+    module.plot_cache = PlotCache(str(tmp_path), max_bytes=0)
+    module.renderer = PlotRenderer(max_workers=0)
+    
+    result = await module.calculate("plot")
+    
+    for field, value in expected.items():
+        assert result.visual_data[field] == value
+    with open(result.visual_data["plot_paths"]["png"], "rb") as png:
+        assert png.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.mark.asyncio
+async def test_data_output_returns_samples_without_rendering(mock_gemini_agent, tmp_path):
+    """output="data" ornekleri float32/npy/JSON olarak dondurmeli, PNG yazmamali"""
+    mock_gemini_agent.generate_json_response.return_value = {
+        "result": "Grafik olusturuldu",
+        "steps": [],
+        "confidence_score": 1.0,
+        "visual_data": {"function": "tan(x)", "x_range": [-10, 10], "plot_type": "2d"},
+    }
+    module = GraphPlotterModule(mock_gemini_agent)
+    module.plot_cache = PlotCache(str(tmp_path), max_bytes=0)
+    
+    binary = (await module.calculate("plot tan(x)", output="data")).visual_data
+    packed = binary["data"]["arrays"]
+    x = np.frombuffer(base64.b64decode(packed["x"]["data"]), dtype="<f4")
+    y = np.frombuffer(base64.b64decode(packed["y"]["data"]), dtype="<f4")
+    
+    assert "plot_paths" not in binary
+    assert module.renderer.rendered == 0 and not os.listdir(tmp_path)
+    assert x.shape == tuple(packed["x"]["shape"]) == (binary["samples"],)
+    assert np.isnan(y).any()
+    assert np.allclose(y[np.isfinite(y)], np.tan(x[np.isfinite(y)]), rtol=1e-3, atol=1e-3)
+    assert binary["data"]["limits"]["y"][1] < 100
+    
+    npy = (await module.calculate("plot tan(x)", output="data", encoding="npy")).visual_data
+    assert np.array_equal(
+        np.load(io.BytesIO(base64.b64decode(npy["data"]["arrays"]["x"]["data"]))), x
+    )
+    
+    decimated = (await module.calculate(
+        "plot tan(x)", output="data", encoding="json", max_points=100
+    )).visual_data["data"]["arrays"]
+    assert len(decimated["x"]) == len(decimated["y"]) <= 100
+    assert None in decimated["y"]
+
+
+def test_decimation_keeps_peaks_and_endpoints():
+    """Min-max decimation dar tepeleri ve uc noktalari korumali"""
+    x = np.linspace(-5, 5, 10_001)
+    y = np.exp(-((x - 1.2345) ** 2) / 1e-6)
+    
+    index = decimate_indices(y, 50)
+    
+    assert index.size <= 50
+    assert index[0] == 0 and index[-1] == x.size - 1
+    assert y[index].max() == y.max()
+
+
+@pytest.mark.asyncio
+async def test_variants_are_rendered_lazily_from_cached_description(mock_gemini_agent, tmp_path):
+    """Yalnizca istenen varyant cizilmeli, digerleri tanimdan sonradan uretilmeli"""
+    mock_gemini_agent.generate_json_response.return_value = {
+        "result": "Grafik olusturuldu",
+        "steps": [],
+        "confidence_score": 1.0,
+        "visual_data": {"function": "sin(x)", "x_range": [-5, 5], "plot_type": "2d"},
+    }
+    module = GraphPlotterModule(mock_gemini_agent)
+    module.plot_cache = PlotCache(str(tmp_path), max_bytes=0)
+    module.renderer = PlotRenderer(max_workers=0)
+    
+    visual_data = (await module.calculate("plot sin(x)", formats="thumbnail")).visual_data
+    
+    assert list(visual_data["plot_paths"]) == ["thumbnail"]
+    assert module.renderer.rendered == 1
+    
+    # Baska bir worker: ornekleme yapmadan, yalnizca cache'teki tanimdan cizer
+    other = GraphPlotterModule(mock_gemini_agent)
+    other.plot_cache = PlotCache(str(tmp_path), max_bytes=0)
+    other.renderer = PlotRenderer(max_workers=0)
+    svg_path = await other.render_variant(visual_data["plot_id"], "svg")
+    png_path = await other.render_variant(visual_data["plot_id"], "png")
+    
+    with open(svg_path, "rb") as svg:
+        assert b"<svg" in svg.read(500)
+    assert os.path.getsize(png_path) > os.path.getsize(visual_data["plot_paths"]["thumbnail"])
+    assert await other.render_variant(visual_data["plot_id"], "svg") == svg_path
+    assert other.renderer.rendered == 2
+    
+    with pytest.raises(CalculationError):
+        await other.render_variant("0" * 64, "png")
@@ -1,7 +1,9 @@
 """Tests for linear algebra module"""
 
+import numpy as np
 import pytest
 from src.modules.linear_algebra import LinearAlgebraModule
+from src.utils.exceptions import CalculationError, InvalidInputError
 
 
 @pytest.mark.asyncio
@@ -23,3 +25,81 @@ async def test_determinant(mock_gemini_agent):
     assert result is not None
     assert result.domain == "linear_algebra"
 
+
+
+@pytest.mark.asyncio
+async def test_matrix_operations_computed_locally(mock_gemini_agent):
+    """Matris literalli ifadeler NumPy ile yerel hesaplanmali"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    
+    product = await module.calculate("[[1,2],[3,4]] * [[5],[6]]")
+    determinant = await module.calculate("determinant [[1,2],[3,4]]")
+    inverse = await module.calculate("inverse [[1,2],[3,4]]")
+    solution = await module.calculate("solve [[2,1],[1,3]] [3,5]")
+    
+    assert product.result == [[17.0], [39.0]]
+    assert determinant.result == -2.0
+    assert inverse.result == [[-2.0, 1.0], [1.5, -0.5]]
+    assert solution.result == pytest.approx([0.8, 1.4])
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_eigenvalues(mock_gemini_agent):
+    """Ozdegerler dict icinde donmeli"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    result = await module.calculate("eigenvalues [[2,0],[0,3]]")
+    
+    assert result.result["eigenvalues"] == [2.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_singular_matrix_inverse(mock_gemini_agent):
+    """Tekil matrisin tersi hata vermeli"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    
+    with pytest.raises(InvalidInputError):
+        await module.calculate("inverse [[1,2],[2,4]]")
+
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", ["[[1,2],[3,4]] + [1,2]", "[[1,2],[3,4]] - [[1],[2]]"])
+async def test_elementwise_shape_mismatch_rejected(mock_gemini_agent, expression):
+    """Toplama/cikarmada farkli boyutlar yayinlanmamali"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    
+    with pytest.raises(InvalidInputError):
+        await module.calculate(expression)
+
+
+@pytest.mark.asyncio
+async def test_non_finite_result_rejected(mock_gemini_agent):
+    """Sonsuz sonuc basarili sonuc olarak donmemeli"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    
+    with pytest.raises(CalculationError):
+        await module.calculate("determinant [[1e400,1],[1,1]]")
+
+def test_batch_determinant_and_solve(mock_gemini_agent):
+    """Matris yigini tek vektorize cagriyla islenmeli"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    stack = np.stack([np.eye(3) * k for k in range(1, 101)])
+    
+    determinants = module.calculate_batch("det", stack)
+    solutions = module.calculate_batch("solve", stack, np.ones((100, 3)))
+    
+    assert isinstance(determinants, np.ndarray)
+    assert determinants.shape == (100,)
+    assert determinants[1] == pytest.approx(8.0)
+    assert solutions[3] == pytest.approx([0.25, 0.25, 0.25])
+
+
+@pytest.mark.asyncio
+async def test_natural_language_falls_back_to_gemini(mock_gemini_agent):
+    """Literal icermeyen ifade Gemini'ye gonderilmeli"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    result = await module.calculate("explain what an eigenvector is")
+    
+    assert result.result == 42.0
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
@@ -1,9 +1,16 @@
 """Unit Converter Module Tests"""
 
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from src.modules.unit_converter import UnitConverterModule
+from src.modules.unit_converter import (
+    COEFFICIENT_CACHE_SIZE,
+    UnitConverterModule,
+    _conversion_coefficients,
+    conversion_coefficients,
+)
 from src.schemas.models import CalculationResult
+from src.utils.exceptions import InvalidInputError
 
 
 @pytest.fixture
@@ -247,3 +254,63 @@ class TestUnitConverterIntegration:
             result = unit_converter_module._convert_units(value, from_unit, to_unit)
             assert isinstance(result, (int, float))
             assert result > 0
+
+
+class TestBulkConversions:
+    """Test vectorized convert_many API"""
+    
+    def test_convert_many_matches_scalar(self, unit_converter_module):
+        """Test array conversion matches scalar conversion"""
+        values = np.linspace(-40, 100, 1000)
+        result = unit_converter_module.convert_many(values, "celsius", "fahrenheit")
+        
+        assert result.shape == values.shape
+        assert result[0] == pytest.approx(-40)
+        assert result == pytest.approx(values * 9 / 5 + 32)
+    
+    def test_convert_many_accepts_list(self, unit_converter_module):
+        """Test list input and alias resolution"""
+        result = unit_converter_module.convert_many([1, 2, 3], "miles", "km")
+        assert result == pytest.approx([1.609344, 3.218688, 4.828032])
+    
+    def test_convert_many_preserves_float32_in_place(self, unit_converter_module):
+        """Test float32 arrays can be converted in place"""
+        values = np.array([0.0, 1.5], dtype=np.float32)
+        result = unit_converter_module.convert_many(values, "kg", "g", out=values)
+        
+        assert result is values
+        assert result.dtype == np.float32
+        assert values.tolist() == [0.0, 1500.0]
+    
+    def test_convert_many_incompatible_units(self, unit_converter_module):
+        """Test mismatched dimensions raise error"""
+        with pytest.raises(ValueError):
+            unit_converter_module.convert_many([1.0], "km", "kg")
+    
+    def test_ambiguous_alias_resolved_by_target(self, unit_converter_module):
+        """Test 'pound' resolves to weight or currency depending on target"""
+        assert unit_converter_module._convert_units(1, "pound", "kg") == pytest.approx(0.453592)
+        assert unit_converter_module._convert_units(1, "pound", "usd") == pytest.approx(1.27)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", ["convert 5 feet", "100 km to kg"])
+async def test_calculate_reports_bad_conversion_as_invalid_input(unit_converter_module, expression):
+    """Test unparseable or incompatible conversions raise InvalidInputError"""
+    with pytest.raises(InvalidInputError):
+        await unit_converter_module.calculate(expression)
+
+
+def test_coefficient_cache_is_bounded_and_keyed_on_normalized_names():
+    """Test spelling variants share one cache entry and unknown units are not cached"""
+    _conversion_coefficients.cache_clear()
+    
+    for spelling in ("KM", " km ", "Km"):
+        assert conversion_coefficients(spelling, "M") == (1000.0, 0.0)
+    with pytest.raises(ValueError):
+        conversion_coefficients("furlong", "m")
+    
+    info = _conversion_coefficients.cache_info()
+    assert info.currsize == 1
+    assert info.hits == 2
+    assert info.maxsize == COEFFICIENT_CACHE_SIZE
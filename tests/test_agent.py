@@ -0,0 +1,293 @@
+"""Tests for Gemini agent request handling"""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.core.agent import GeminiAgent, RateLimiter
+from src.core.batcher import MicroBatcher
+from src.config.settings import settings
+from src.core.cache import ResponseCache
+from src.utils.exceptions import GeminiAPIError
+
+
+@pytest.fixture
+def gemini_agent():
+    """Gercek API'ye baglanmayan Gemini agent"""
+    with patch("src.core.agent.genai"):
+        agent = GeminiAgent(api_key="test-key", cache=ResponseCache())
+    return agent
+
+
+def _slow_response(text: str, delay: float = 0.05) -> AsyncMock:
+    async def respond(prompt, max_retries=None):
+        await asyncio.sleep(delay)
+        return text
+
+    return AsyncMock(side_effect=respond)
+
+
+@pytest.mark.asyncio
+async def test_repeated_prompt_served_from_cache(gemini_agent):
+    """Ayni prompt ikinci kez Gemini'ye gitmemeli"""
+    gemini_agent.generate_with_retry = AsyncMock(return_value='{"result": 4, "steps": []}')
+
+    first = await gemini_agent.generate_json_response("2 + 2", domain="basic_math")
+    second = await gemini_agent.generate_json_response("2 + 2", domain="basic_math")
+
+    assert first == second == {"result": 4, "steps": []}
+    assert gemini_agent.generate_with_retry.await_count == 1
+    assert gemini_agent.cache_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_coalesced(gemini_agent):
+    """Eszamanli ayni prompt'lar tek Gemini istegi paylasmali"""
+    gemini_agent.generate_with_retry = _slow_response('{"result": 4, "steps": ["a"]}')
+
+    results = await asyncio.gather(
+        *(gemini_agent.generate_json_response("2 + 2") for _ in range(10))
+    )
+
+    assert gemini_agent.generate_with_retry.await_count == 1
+    assert gemini_agent.coalesced_requests == 9
+    assert gemini_agent.inflight_count() == 0
+    assert all(result == {"result": 4, "steps": ["a"]} for result in results)
+    assert results[0] is not results[1]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_error_propagates_to_all_waiters(gemini_agent):
+    """Paylasilan istek hatasi tum bekleyenlere iletilmeli"""
+    async def fail(prompt, max_retries=None):
+        await asyncio.sleep(0.01)
+        raise GeminiAPIError("API hatasi")
+
+    gemini_agent.generate_with_retry = AsyncMock(side_effect=fail)
+
+    results = await asyncio.gather(
+        *(gemini_agent.generate_json_response("2 + 2") for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, GeminiAPIError) for result in results)
+    assert gemini_agent.generate_with_retry.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_request(gemini_agent):
+    """Bir bekleyenin iptali digerlerinin sonucunu etkilememeli"""
+    gemini_agent.generate_with_retry = _slow_response('{"result": 4}')
+
+    cancelled = asyncio.ensure_future(gemini_agent.generate_json_response("2 + 2"))
+    survivor = asyncio.ensure_future(gemini_agent.generate_json_response("2 + 2"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await survivor == {"result": 4}
+    assert cancelled.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst():
+    """Bucket dolu iken burst kadar cagri beklemeden gecmeli"""
+    limiter = RateLimiter(calls_per_minute=60, burst=5)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(5):
+        async with limiter:
+            pass
+
+    assert loop.time() - started < 0.1
+    assert limiter.metrics()["total_acquired"] == 5
+    assert limiter.metrics()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_refills_after_burst():
+    """Bucket bosaldiginda yeni token dolana kadar beklenmeli"""
+    limiter = RateLimiter(calls_per_minute=600, burst=1)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with limiter:
+        pass
+    async with limiter:
+        pass
+
+    assert loop.time() - started >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_limits_concurrency():
+    """Ayni anda max_concurrent'ten fazla istek devam etmemeli"""
+    limiter = RateLimiter(calls_per_minute=6000, burst=100, max_concurrent=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert limiter.metrics()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_distinct_prompts_packed_into_one_request(gemini_agent):
+    """Ayni domain'den eszamanli farkli prompt'lar tek istekte gonderilmeli"""
+    sent = []
+    
+    async def respond(prompt, max_retries=None, max_output_tokens=None):
+        sent.append(prompt)
+        count = prompt.count("### Gorev")
+        return json.dumps([{"result": index, "steps": []} for index in range(1, count + 1)])
+    
+    gemini_agent.generate_with_retry = AsyncMock(side_effect=respond)
+    prompts = [f"Talimat\nJSON dondur\nIfade: {i} + 1" for i in range(4)]
+    
+    results = await asyncio.gather(
+        *(gemini_agent.generate_json_response(prompt, domain="calculus") for prompt in prompts)
+    )
+    
+    assert len(sent) == 1
+    assert sent[0].count("Talimat") == 1
+    assert [result["result"] for result in results] == [1, 2, 3, 4]
+    assert gemini_agent.batch_stats()["batched_prompts"] == 4
+
+
+@pytest.mark.asyncio
+async def test_malformed_batch_response_falls_back_to_single_requests(gemini_agent):
+    """Dizi ayrilamazsa prompt'lar tek tek gonderilmeli"""
+    async def respond(prompt, max_retries=None, max_output_tokens=None):
+        if "### Gorev" in prompt:
+            return '[{"result": 1}]'
+        return json.dumps({"result": prompt.rsplit(" ", 1)[-1]})
+    
+    gemini_agent.generate_with_retry = AsyncMock(side_effect=respond)
+    
+    results = await asyncio.gather(
+        gemini_agent.generate_json_response("Ifade: a", domain="financial"),
+        gemini_agent.generate_json_response("Ifade: b", domain="financial"),
+    )
+    
+    assert [result["result"] for result in results] == ["a", "b"]
+    assert gemini_agent.generate_with_retry.await_count == 3
+    assert gemini_agent.batch_stats()["fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_output_limit_scales_with_batch_size(gemini_agent):
+    """Birlesik istegin cikti limiti prompt sayisiyla olceklenmeli ve modele sigmali"""
+    limits = []
+    
+    async def respond(prompt, max_retries=None, max_output_tokens=None):
+        limits.append(max_output_tokens)
+        count = prompt.count("### Gorev")
+        return json.dumps([{"result": index} for index in range(count)])
+    
+    gemini_agent.generate_with_retry = AsyncMock(side_effect=respond)
+    
+    await asyncio.gather(
+        gemini_agent.generate_json_response("Ifade: a", domain="calculus"),
+        gemini_agent.generate_json_response("Ifade: b", domain="calculus"),
+    )
+    
+    assert limits == [2 * settings.MAX_OUTPUT_TOKENS]
+    assert (
+        gemini_agent.batcher.max_batch_size * settings.MAX_OUTPUT_TOKENS
+        <= settings.MODEL_MAX_OUTPUT_TOKENS
+    )
+    assert gemini_agent._get_generation_config(10**9)["max_output_tokens"] == (
+        settings.MODEL_MAX_OUTPUT_TOKENS
+    )
+
+@pytest.mark.asyncio
+async def test_batch_window_applies_only_while_requests_in_flight():
+    """Tek basina gelen prompt beklememeli; yuk altinda gelenler toplanmali"""
+    sent = []
+    
+    async def send(prompt):
+        sent.append(prompt)
+        await asyncio.sleep(0.05)
+        count = prompt.count("### Gorev")
+        return json.dumps([{"result": i} for i in range(count)]) if count else '{"result": 0}'
+    
+    batcher = MicroBatcher(send, max_batch_size=8, window=0.2)
+    loop = asyncio.get_running_loop()
+    
+    started = loop.time()
+    await batcher.submit("Ifade: solo", key="basic_math")
+    assert loop.time() - started < 0.15
+    
+    first = asyncio.ensure_future(batcher.submit("Ifade: a", key="calculus"))
+    await asyncio.sleep(0.01)
+    later = [
+        asyncio.ensure_future(batcher.submit(f"Ifade: {name}", key="calculus"))
+        for name in ("b", "c")
+    ]
+    await asyncio.gather(first, *later)
+    
+    assert len(sent) == 3
+    assert sent[2].count("### Gorev") == 2
+
+
+def _streamed_response(chunks, delay: float = 0.0):
+    """``generate_content_async(stream=True)`` yanitini taklit eder"""
+    class Chunk:
+        def __init__(self, text):
+            self.text = text
+    
+    class Response:
+        def __aiter__(self):
+            return self._iterate()
+        
+        async def _iterate(self):
+            for chunk in chunks:
+                await asyncio.sleep(delay)
+                yield Chunk(chunk)
+    
+    return AsyncMock(return_value=Response())
+
+
+@pytest.mark.asyncio
+async def test_stream_json_response_yields_steps_before_result(gemini_agent):
+    """Adimlar tamamlandikca, sonuc en son verilmeli ve cache'e yazilmali"""
+    text = '```json\n{"result": 2, "steps": ["d/dx x^2 = 2x", "x = 1 icin 2"], "confidence_score": 1.0}```'
+    gemini_agent.model.generate_content_async = _streamed_response(
+        [text[i:i + 5] for i in range(0, len(text), 5)]
+    )
+    
+    events = [event async for event in gemini_agent.stream_json_response("turev", domain="calculus")]
+    
+    assert [event["event"] for event in events] == ["step", "step", "result"]
+    assert [event["step"] for event in events[:2]] == ["d/dx x^2 = 2x", "x = 1 icin 2"]
+    assert events[-1]["data"]["result"] == 2
+    assert gemini_agent.model.generate_content_async.call_args.kwargs["stream"] is True
+    
+    cached = [event async for event in gemini_agent.stream_json_response("turev")]
+    assert cached == events
+    assert gemini_agent.model.generate_content_async.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_step_listener_switches_json_response_to_streaming(gemini_agent):
+    """Listener aktifken generate_json_response akis yolunu kullanmali"""
+    from src.core.streaming import step_listener
+    
+    gemini_agent.model.generate_content_async = _streamed_response(
+        ['{"result": 1, "steps": ["a",', ' "b"]}']
+    )
+    received = []
+    
+    with step_listener(received.append):
+        result = await gemini_agent.generate_json_response("ifade", domain="basic_math")
+    
+    assert received == ["a", "b"]
+    assert result == {"result": 1, "steps": ["a", "b"]}
+    assert gemini_agent.batch_stats()["requests"] == 0
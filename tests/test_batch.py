@@ -0,0 +1,121 @@
+"""Tests for CalculatorAgent batch processing"""
+
+import asyncio
+import json
+
+import pytest
+from src.main import ORDERED_BUFFER_FACTOR, CalculatorAgent, _read_batch_file
+
+
+@pytest.fixture
+def calculator_agent(mock_gemini_agent):
+    """Mock Gemini agent kullanan CalculatorAgent"""
+    return CalculatorAgent(gemini_agent=mock_gemini_agent)
+
+
+@pytest.mark.asyncio
+async def test_process_batch_preserves_order(calculator_agent):
+    """Sonuclar girdi sirasinda donmeli"""
+    commands = [f"{i} + 1" for i in range(50)]
+    
+    records = await calculator_agent.process_batch(commands, max_concurrency=4)
+    
+    assert [record["index"] for record in records] == list(range(50))
+    assert [record["result"] for record in records] == [float(i + 1) for i in range(50)]
+    assert all(record["ok"] for record in records)
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_do_not_stop_batch(calculator_agent):
+    """Hatali komut kaydi ok=false olarak donmeli, digerleri islenmeli"""
+    records = await calculator_agent.process_batch(
+        ["2 + 2", "eval('1')", {"id": "x", "command": "3 * 3"}]
+    )
+    
+    assert records[0]["result"] == 4.0
+    assert records[1]["ok"] is False
+    assert records[1]["error_type"] == "SecurityViolationError"
+    assert records[2]["id"] == "x"
+    assert records[2]["result"] == 9.0
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_max_concurrency(calculator_agent, mock_gemini_agent):
+    """Ayni anda max_concurrency'den fazla komut islenmemeli"""
+    active = 0
+    peak = 0
+    
+    async def respond(prompt, domain=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"result": 1.0, "steps": []}
+    
+    mock_gemini_agent.generate_json_response.side_effect = respond
+    commands = [f"kok {i} nedir" for i in range(20)]
+    
+    records = await calculator_agent.process_batch(commands, max_concurrency=3)
+    
+    assert len(records) == 20
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_unordered_batch_yields_in_completion_order(calculator_agent, mock_gemini_agent):
+    """ordered=False iken erken biten komut once gelmeli"""
+    async def respond(prompt, domain=None):
+        await asyncio.sleep(0.05)
+        return {"result": 1.0, "steps": []}
+    
+    mock_gemini_agent.generate_json_response.side_effect = respond
+    
+    indexes = [
+        record["index"]
+        async for record in calculator_agent.iter_batch(
+            ["yavas bir soru", "2 + 2"], max_concurrency=2, ordered=False
+        )
+    ]
+    
+    assert indexes == [1, 0]
+
+
+
+@pytest.mark.asyncio
+async def test_ordered_batch_buffer_is_bounded(calculator_agent, mock_gemini_agent):
+    """Siradaki yavas komut beklenirken girdi sinirsiz tuketilmemeli"""
+    release = asyncio.Event()
+    consumed = 0
+    
+    async def respond(prompt, domain=None):
+        await release.wait()
+        return {"result": 1.0, "steps": []}
+    
+    def commands():
+        nonlocal consumed
+        yield "yavas bir soru"
+        for i in range(1000):
+            consumed += 1
+            yield f"{i} + 1"
+    
+    mock_gemini_agent.generate_json_response.side_effect = respond
+    batch = asyncio.ensure_future(
+        calculator_agent.process_batch(commands(), max_concurrency=2)
+    )
+    await asyncio.sleep(0.1)
+    
+    assert consumed <= 2 * ORDERED_BUFFER_FACTOR + 2
+    release.set()
+    records = await batch
+    assert [record["index"] for record in records] == list(range(1001))
+
+def test_read_batch_file_supports_plain_and_jsonl(tmp_path):
+    """Duz satirlar ve JSONL kayitlari birlikte okunabilmeli"""
+    path = tmp_path / "commands.txt"
+    path.write_text(
+        "2 + 2\n\n# yorum\n" + json.dumps({"id": 7, "command": "3 * 3"}) + "\n",
+        encoding="utf-8",
+    )
+    
+    assert list(_read_batch_file(str(path))) == ["2 + 2", {"id": 7, "command": "3 * 3"}]
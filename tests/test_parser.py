@@ -0,0 +1,51 @@
+"""CommandParser routing testleri"""
+
+import pytest
+
+from src.core.parser import CommandParser
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("100 km to miles", "unit_converter"),
+    ("25 celsius kaç fahrenheit", "unit_converter"),
+    ("10 kg→lb", "unit_converter"),
+    ("convert 5 feet", "unit_converter"),
+    ("plot x from 0 to 10", "graph_plotter"),
+    ("limitini bul", "calculus"),
+    ("determinant [[1,2],[3,4]]", "linear_algebra"),
+    ("loan 100000 6% 30 years", "financial"),
+    ("2 + 2", "basic_math"),
+])
+def test_natural_language_routing(text, expected):
+    """Anahtar kelime ve yapisal desen yonlendirmesi"""
+    module, expression = CommandParser().parse(text)
+    
+    assert module == expected
+    assert expression == text
+
+
+def test_keyword_priority_is_deterministic():
+    """Birden fazla domain eslesirse tablo sirasi kazanir"""
+    parser = CommandParser()
+    
+    assert parser.parse("plot the derivative of x^2")[0] == "calculus"
+    assert parser.parse("derivative of x^2 then plot")[0] == "calculus"
+
+
+def test_prefix_requires_word_boundary():
+    """'!calculator' gibi prefix ile baslayan kelimeler prefix sayilmaz"""
+    parser = CommandParser()
+    
+    assert parser.parse("!calc x^2")[0] == "calculus"
+    assert parser.parse("!calc x^2")[1] == "x^2"
+    assert parser.parse("!unit 5 m to cm") == ("unit_converter", "5 m to cm")
+    assert parser.parse("!calculator 1 + 1")[0] == "basic_math"
+
+
+def test_subclass_tables_are_recompiled():
+    """Alt sinif tablolari kendi regex ve cache'i ile derlenir"""
+    class CustomParser(CommandParser):
+        MODULE_KEYWORDS = (("financial", ("tl",)),)
+    
+    assert CustomParser().parse("500 tl")[0] == "financial"
+    assert CommandParser().parse("500 tl")[0] == "basic_math"
@@ -0,0 +1,111 @@
+"""Tests for persistent plot cache"""
+
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from src.core.plot_cache import PlotCache, make_plot_key
+
+
+SPEC = {"plot_type": "2d", "function": "sin(x)", "x_range": [-10.0, 10.0], "dpi": 150}
+
+
+def _writer(content: bytes, calls: list):
+    """Verilen yola sabit icerik yazan sahte renderer"""
+    async def render(path: str) -> None:
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        with open(path, "wb") as file:
+            file.write(content)
+    return render
+
+
+def test_plot_key_is_stable_across_processes():
+    """Anahtar hash salt'indan bagimsiz olmali ve girdiye duyarli olmali"""
+    code = (
+        "from src.core.plot_cache import make_plot_key;"
+        f"print(make_plot_key({SPEC!r}))"
+    )
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    
+    assert digests == {make_plot_key(SPEC)}
+    assert make_plot_key(dict(reversed(list(SPEC.items())))) == make_plot_key(SPEC)
+    assert make_plot_key({**SPEC, "dpi": 300}) != make_plot_key(SPEC)
+
+
+@pytest.mark.asyncio
+async def test_plot_cache_survives_restart_and_dedupes_renders(tmp_path):
+    """Ayni anahtar bir kez cizilmeli, yeni cache instance'i dosyayi bulmali"""
+    cache = PlotCache(str(tmp_path), max_bytes=0)
+    key = make_plot_key(SPEC)
+    calls = []
+    
+    paths = await asyncio.gather(*(cache.get_or_render(key, _writer(b"png", calls)) for _ in range(5)))
+    
+    assert len(calls) == 1
+    assert set(paths) == {str(tmp_path / f"{key}.png")}
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".png")] == [f"{key}.png"]
+    
+    restarted = PlotCache(str(tmp_path), max_bytes=0)
+    assert await restarted.get_or_render(key, _writer(b"png", calls)) == paths[0]
+    assert len(calls) == 1
+    assert restarted.metrics()["hits"] == 1
+    assert restarted.metrics()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_plot_cache_evicts_least_recently_used(tmp_path):
+    """Boyut limiti asilinca en uzun suredir kullanilmayan dosya silinmeli"""
+    cache = PlotCache(str(tmp_path), max_bytes=25)
+    keys = [make_plot_key({**SPEC, "function": name}) for name in ("a", "b", "c")]
+    calls = []
+    
+    await cache.get_or_render(keys[0], _writer(b"x" * 10, calls))
+    await cache.get_or_render(keys[1], _writer(b"x" * 10, calls))
+    cache.get(keys[0])
+    await cache.get_or_render(keys[2], _writer(b"x" * 10, calls))
+    
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert not (tmp_path / f"{keys[1]}.png").exists()
+    assert cache.metrics()["evictions"] == 1
+    assert cache.metrics()["bytes"] == 20
+
+
+def test_plot_cache_concurrent_writers_share_files(tmp_path):
+    """Farkli process'ler ayni dizine yazarken dosyalar bozulmamali"""
+    code = (
+        "import asyncio, sys\n"
+        "from src.core.plot_cache import PlotCache\n"
+        "cache = PlotCache(sys.argv[1], max_bytes=0)\n"
+        "async def render(path):\n"
+        "    open(path, 'wb').write(b'x' * 4096)\n"
+        "async def main():\n"
+        "    for i in range(20):\n"
+        "        await cache.get_or_render(f'{i:064x}', render)\n"
+        "asyncio.run(main())\n"
+    )
+    workers = [
+        subprocess.Popen([sys.executable, "-c", code, str(tmp_path)])
+        for _ in range(3)
+    ]
+    assert all(worker.wait(timeout=60) == 0 for worker in workers)
+    
+    cache = PlotCache(str(tmp_path), max_bytes=0)
+    for i in range(20):
+        path = cache.get(f"{i:064x}")
+        with open(path, "rb") as file:
+            assert file.read() == b"x" * 4096
+    assert not [name for name in os.listdir(tmp_path) if ".tmp." in name]
+    assert cache.metrics()["entries"] == 20
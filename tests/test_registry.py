@@ -0,0 +1,52 @@
+"""Tests for lazy module registry"""
+
+import subprocess
+import sys
+
+import pytest
+from src.config.settings import settings
+from src.main import CalculatorAgent
+from src.modules.basic_math import BasicMathModule
+
+
+@pytest.mark.asyncio
+async def test_modules_are_created_on_first_use(mock_gemini_agent, monkeypatch):
+    """Moduller ilk kullanimda olusturulmali, ayarlar o anda uygulanmali"""
+    monkeypatch.setattr(settings, "RESULT_CACHE_EXCLUDED_MODULES", ["calculus"])
+    agent = CalculatorAgent(gemini_agent=mock_gemini_agent)
+    
+    assert agent.modules.loaded() == {}
+    assert "graph_plotter" in agent.modules
+    assert agent.plot_cache_stats() == {}
+    
+    await agent.execute("2 + 2")
+    
+    assert list(agent.modules.loaded()) == ["basic_math"]
+    assert isinstance(agent.modules["basic_math"], BasicMathModule)
+    assert agent.modules["basic_math"] is agent.modules["basic_math"]
+    
+    agent.warm_up(preload=True)
+    
+    assert set(agent.modules.loaded()) == set(agent.modules)
+    assert agent.modules["calculus"].CACHE_RESULTS is False
+    assert agent.modules["basic_math"].CACHE_RESULTS is True
+    with pytest.raises(KeyError):
+        agent.modules["unknown"]
+
+
+def test_simple_command_skips_heavy_imports():
+    """Basit bir komut NumPy, SymPy, matplotlib ve Gemini SDK'sini yuklememeli"""
+    code = (
+        "import asyncio, sys\n"
+        "from src.core.agent import GeminiAgent\n"
+        "from src.main import CalculatorAgent\n"
+        "agent = CalculatorAgent(GeminiAgent(api_key='test-key'))\n"
+        "assert asyncio.run(agent.execute('2 + 2')).result == 4\n"
+        "heavy = ('numpy', 'sympy', 'matplotlib', 'google.generativeai')\n"
+        "print(','.join(name for name in heavy if name in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    
+    assert output.strip() == ""
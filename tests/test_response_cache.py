@@ -0,0 +1,64 @@
+"""Tests for Gemini response cache"""
+
+from src.core.cache import ResponseCache, make_cache_key
+
+
+def test_cache_key_is_deterministic():
+    """Ayni girdiler ayni anahtari uretmeli"""
+    config = {"temperature": 0.1, "top_p": 0.95}
+    key1 = make_cache_key("gemini-2.0-flash", config, "2 + 2")
+    key2 = make_cache_key("gemini-2.0-flash", dict(reversed(list(config.items()))), "2 + 2")
+
+    assert key1 == key2
+    assert key1 != make_cache_key("gemini-2.0-flash", config, "2 + 3")
+    assert key1 != make_cache_key("gemini-1.5-pro", config, "2 + 2")
+
+
+def test_cache_hit_returns_copy():
+    """Cache'den donen kayit disaridan degistirilememeli"""
+    cache = ResponseCache(max_entries=10)
+    cache.set("k", {"result": 4.0, "steps": ["2 + 2 = 4"]})
+
+    first = cache.get("k")
+    first["steps"].append("degisiklik")
+
+    assert cache.get("k") == {"result": 4.0, "steps": ["2 + 2 = 4"]}
+    assert cache.stats.hits == 2
+    assert cache.get("yok") is None
+    assert cache.stats.misses == 1
+
+
+def test_cache_lru_eviction():
+    """Kapasite asilinca en eski kullanilan kayit silinmeli"""
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", {"result": 1})
+    cache.set("b", {"result": 2})
+    cache.get("a")
+    cache.set("c", {"result": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"result": 1}
+    assert cache.stats.evictions == 1
+
+
+def test_cache_domain_ttl():
+    """Domain TTL'i 0 olan yanitlar cache'lenmemeli, suresi dolanlar silinmeli"""
+    cache = ResponseCache(domain_ttls={"financial": 0, "calculus": -1})
+    cache.set("fin", {"result": 1}, domain="financial")
+    assert cache.get("fin") is None
+
+    cache.domain_ttls["calculus"] = 1e-9
+    cache.set("calc", {"result": 2}, domain="calculus")
+    assert cache.get("calc") is None
+    assert cache.stats.expirations == 1
+
+
+def test_cache_disk_tier_survives_restart(tmp_path):
+    """Disk katmani yeni cache instance'inda da okunabilmeli"""
+    db_path = str(tmp_path / "responses.db")
+    ResponseCache(db_path=db_path).set("k", {"result": 42.0})
+
+    restarted = ResponseCache(db_path=db_path)
+
+    assert restarted.get("k") == {"result": 42.0}
+    assert restarted.stats.disk_hits == 1
@@ -0,0 +1,137 @@
+"""Tests for CalculatorAgent result cache"""
+
+import pytest
+from src.core.cache import MAX_ALIASES_PER_ENTRY, CachedResult, ResultCache
+from src.main import CalculatorAgent
+
+
+@pytest.fixture
+def calculator_agent(mock_gemini_agent):
+    """Mock Gemini agent kullanan CalculatorAgent"""
+    return CalculatorAgent(gemini_agent=mock_gemini_agent)
+
+
+def test_result_cache_eviction_drops_aliases():
+    """Tahliye edilen kaydin ham girdi alias'lari da silinmeli"""
+    cache = ResultCache(max_entries=1)
+    key_a = ResultCache.make_key("basic_math", "1  +  1")
+    cache.set(key_a, CachedResult(2.0), alias="1 + 1")
+    
+    assert key_a == ResultCache.make_key("basic_math", "1 + 1")
+    assert cache.lookup("1 + 1").result == 2.0
+    
+    cache.set(ResultCache.make_key("basic_math", "2 + 2"), CachedResult(4.0), alias="2 + 2")
+    
+    assert cache.lookup("1 + 1") is None
+    assert cache.get(key_a) is None
+    assert cache.stats.evictions == 1
+
+
+
+def test_result_cache_keeps_most_recent_aliases():
+    """Ayni kayda ulasan girdi varyantlari sinirsiz birikmemeli"""
+    cache = ResultCache()
+    key = ResultCache.make_key("basic_math", "1 + 1")
+    entry = CachedResult(2.0)
+    cache.set(key, entry, alias="1 + 1")
+    
+    variants = [" " * count + "1 + 1" for count in range(1, 50)]
+    for variant in variants:
+        cache.get(key, alias=variant)
+    
+    assert len(entry.aliases) == MAX_ALIASES_PER_ENTRY
+    assert len(cache._aliases) == MAX_ALIASES_PER_ENTRY
+    assert cache.lookup(variants[-1]) is entry
+    assert cache.lookup("1 + 1") is None
+
+def test_result_cache_entries_expire_with_domain_ttl(monkeypatch):
+    """Kayitlar domain TTL'i dolunca dusmeli, TTL'i 0 olan domain cache'lenmemeli"""
+    now = [1000.0]
+    monkeypatch.setattr("src.core.cache.time.time", lambda: now[0])
+    cache = ResultCache(default_ttl=60, domain_ttls={"unit_converter": 5, "financial": 0})
+    math_key = ResultCache.make_key("basic_math", "1 + 1")
+    unit_key = ResultCache.make_key("unit_converter", "100 usd to eur")
+    cache.set(math_key, CachedResult(2.0), alias="1 + 1")
+    cache.set(unit_key, CachedResult(92.0), alias="100 usd to eur")
+    cache.set(ResultCache.make_key("financial", "loan"), CachedResult(1.0))
+    
+    assert len(cache) == 2
+    now[0] += 10
+    assert cache.lookup("100 usd to eur") is None
+    assert cache.get(unit_key) is None
+    assert cache.lookup("1 + 1").result == 2.0
+    
+    now[0] += 60
+    assert cache.get(math_key) is None
+    assert len(cache) == 0
+    assert cache.stats.expirations == 2
+
+
+@pytest.mark.asyncio
+async def test_repeated_command_reuses_result_and_output(calculator_agent):
+    """Tekrarlanan komut ayni sonucu ve formatli ciktiyi dondurmeli"""
+    module = calculator_agent.modules["basic_math"]
+    calls = []
+    original = module.calculate
+    
+    async def counting_calculate(expression, **kwargs):
+        calls.append(expression)
+        return await original(expression, **kwargs)
+    
+    module.calculate = counting_calculate
+    
+    first = await calculator_agent.process_command("2 + 2")
+    second = await calculator_agent.process_command("2 + 2")
+    third = await calculator_agent.process_command("2  +  2")
+    
+    assert first is second
+    assert third == first
+    assert calls == ["2 + 2"]
+    
+    stats = calculator_agent.result_cache_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_currency_and_excluded_modules_are_not_cached(calculator_agent):
+    """Doviz cevirileri ve kapatilan moduller cache'lenmemeli"""
+    await calculator_agent.execute("100 usd to eur")
+    await calculator_agent.execute("100 km to miles")
+    assert len(calculator_agent.result_cache) == 1
+    
+    calculator_agent.modules["basic_math"].CACHE_RESULTS = False
+    await calculator_agent.execute("3 * 3")
+    await calculator_agent.execute("3 * 3")
+    assert len(calculator_agent.result_cache) == 1
+
+
+def test_plot_results_are_not_cached(calculator_agent):
+    """Grafik sonuclari PlotCache'in silebilecegi dosya yollari icerdigi icin cache'lenmemeli"""
+    module = calculator_agent.modules["graph_plotter"]
+    
+    assert not module.is_result_cacheable("plot sin(x)")
+
+
+@pytest.mark.asyncio
+async def test_request_options_reach_module_and_key_the_cache(calculator_agent):
+    """Kayit secenekleri module iletilmeli ve ayri cache kaydi olusturmali"""
+    module = calculator_agent.modules["basic_math"]
+    calls = []
+    original = module.calculate
+    
+    async def recording_calculate(expression, **kwargs):
+        calls.append(kwargs)
+        return await original(expression, **kwargs)
+    
+    module.calculate = recording_calculate
+    
+    await calculator_agent.run_record("2 + 2")
+    await calculator_agent.run_record({"command": "2 + 2", "options": {"output": "data"}})
+    await calculator_agent.run_record({"command": "2 + 2", "options": {"output": "data"}})
+    invalid = await calculator_agent.run_record({"command": "2 + 2", "options": ["data"]})
+    
+    assert calls == [{}, {"output": "data"}]
+    assert invalid["ok"] is False
+    assert invalid["error_type"] == "InvalidInputError"
@@ -0,0 +1,177 @@
+"""Tests for the asyncio HTTP server"""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from src.config.settings import settings
+from src.core.plot_cache import PlotCache
+from src.core.renderer import PlotRenderer
+from src.main import CalculatorAgent
+from src.server import CalculatorServer, HTTPError
+
+
+@pytest_asyncio.fixture
+async def server(mock_gemini_agent):
+    """Rastgele portta calisan test sunucusu"""
+    server = CalculatorServer(
+        CalculatorAgent(gemini_agent=mock_gemini_agent), host="127.0.0.1", port=0
+    )
+    await server.start()
+    yield server
+    await server.close()
+
+
+def _request(method: str, path: str, payload=None, connection: str = "keep-alive") -> bytes:
+    body = json.dumps(payload).encode() if payload is not None else b""
+    return (
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: {connection}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = dict(line.split(": ", 1) for line in lines[1:] if line)
+    body = await reader.readexactly(int(headers["Content-Length"]))
+    return status, headers, json.loads(body)
+
+
+@pytest.mark.asyncio
+async def test_pipelined_requests_on_keepalive_connection(server):
+    """Ayni baglantidan art arda gonderilen istekler sirayla cevaplanmali"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(
+        _request("POST", "/calculate", {"command": "2 + 2"})
+        + _request("POST", "/calculate", {"command": "3 * 3"})
+        + _request("GET", "/health", connection="close")
+    )
+    await writer.drain()
+    
+    first = await _read_response(reader)
+    second = await _read_response(reader)
+    health = await _read_response(reader)
+    writer.close()
+    
+    assert first[0] == 200 and first[2]["result"] == 4.0
+    assert first[1]["Connection"] == "keep-alive"
+    assert second[2]["result"] == 9.0
+    assert health[2]["status"] == "ok"
+    assert health[1]["Connection"] == "close"
+    assert server.total_connections == 1
+    assert server.total_requests == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint(server):
+    """POST /batch sonuclari girdi sirasinda donmeli"""
+    status, payload = await server.dispatch(
+        "POST", "/batch", json.dumps({"commands": ["1 + 1", "eval('x')", "2 * 5"]}).encode()
+    )
+    
+    assert status == 200
+    assert [record["ok"] for record in payload["results"]] == [True, False, True]
+    assert payload["results"][2]["result"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_batch_max_concurrency_validated_and_clamped(server, monkeypatch):
+    """Gecersiz max_concurrency 400 donmeli, cok buyuk deger sunucu limitine inmeli"""
+    seen = []
+    
+    async def recording_iter_batch(commands, max_concurrency=None, ordered=True):
+        seen.append(max_concurrency)
+        yield {"ok": True}
+    
+    monkeypatch.setattr(server.agent, "iter_batch", recording_iter_batch)
+    monkeypatch.setattr(settings, "SERVER_MAX_BATCH_CONCURRENCY", 8)
+    
+    for value in ("abc", 0, 2.5, True):
+        with pytest.raises(HTTPError) as error:
+            await server.dispatch(
+                "POST", "/batch", json.dumps({"commands": ["1 + 1"], "max_concurrency": value}).encode()
+            )
+        assert error.value.status == 400
+    
+    for value in ("4", 10 ** 9):
+        await server.dispatch(
+            "POST", "/batch", json.dumps({"commands": ["1 + 1"], "max_concurrency": value}).encode()
+        )
+    assert seen == [4, 8]
+
+
+@pytest.mark.asyncio
+async def test_errors_mapped_to_http_status(server):
+    """Gecersiz istekler uygun HTTP durum kodlariyla cevaplanmali"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(
+        _request("GET", "/yok")
+        + _request("GET", "/calculate")
+        + b"POST /calculate HTTP/1.1\r\nContent-Length: 5\r\n\r\n{bad}"
+    )
+    await writer.drain()
+    
+    statuses = [(await _read_response(reader))[0] for _ in range(3)]
+    writer.close()
+    
+    assert statuses == [404, 405, 400]
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_writes_ndjson_chunks(server):
+    """POST /stream olaylari chunked NDJSON olarak yazmali"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(_request("POST", "/stream", {"command": "2 + 2"}, connection="close"))
+    await writer.drain()
+    
+    head = await reader.readuntil(b"\r\n\r\n")
+    events = []
+    while True:
+        size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+        if size == 0:
+            break
+        events.append(json.loads(await reader.readexactly(size)))
+        await reader.readexactly(2)
+    writer.close()
+    
+    assert b"Transfer-Encoding: chunked" in head
+    assert events[0]["event"] == "step"
+    assert events[-1]["event"] == "result"
+    assert events[-1]["ok"] is True and events[-1]["result"] == 4.0
+
+
+@pytest.mark.asyncio
+async def test_plot_variant_endpoint_serves_files(server, mock_gemini_agent, tmp_path):
+    """GET /plots/<id>/<varyant> grafigi dosya olarak donmeli"""
+    plotter = server.agent.modules["graph_plotter"]
+    plotter.plot_cache = PlotCache(str(tmp_path), max_bytes=0)
+    plotter.renderer = PlotRenderer(max_workers=0)
+    mock_gemini_agent.generate_json_response.return_value = {
+        "result": "Grafik olusturuldu",
+        "steps": [],
+        "confidence_score": 1.0,
+        "visual_data": {"function": "x^2", "plot_type": "2d"},
+    }
+    _, record = await server.dispatch(
+        "POST", "/calculate", json.dumps({"command": "plot x^2"}).encode()
+    )
+    plot_id = record["visual_data"]["plot_id"]
+    
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(
+        _request("GET", f"/plots/{plot_id}/svg")
+        + _request("GET", f"/plots/{'0' * 64}/svg", connection="close")
+    )
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    length = int(head.split("Content-Length: ")[1].split("\r\n")[0])
+    svg = await reader.readexactly(length)
+    missing = await _read_response(reader)
+    writer.close()
+    
+    assert "Content-Type: image/svg+xml" in head
+    assert b"<svg" in svg
+    assert missing[0] == 404
@@ -0,0 +1,69 @@
+"""Tests for streamed step emission"""
+
+import io
+
+import pytest
+from src.core.streaming import StepStreamParser
+from src.main import CalculatorAgent
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1000])
+def test_parser_emits_steps_independent_of_chunking(chunk_size):
+    """Adimlar parca sinirlarindan bagimsiz ayni sekilde ayiklanmali"""
+    text = (
+        'Yanit:\n{"result": 4, "steps": ["a, \\"b\\"]", {"x": [1, 2]}, "c"], '
+        '"note": {"steps": ["ic ice"]}, "confidence_score": 0.9}'
+    )
+    parser = StepStreamParser()
+    
+    steps = []
+    for start in range(0, len(text), chunk_size):
+        steps.extend(parser.feed(text[start:start + chunk_size]))
+    
+    assert steps == ['a, "b"]', {"x": [1, 2]}, "c"]
+    assert parser.step_count == 3
+    assert parser.text == text
+
+
+def test_parser_emits_each_step_as_soon_as_it_completes():
+    """Dizi kapanmadan tamamlanan adim hemen verilmeli"""
+    parser = StepStreamParser()
+    
+    assert parser.feed('{"steps": ["birinci"') == []
+    assert parser.feed(', "ikin') == ["birinci"]
+    assert parser.feed('ci"]') == ["ikinci"]
+
+
+@pytest.mark.asyncio
+async def test_stream_command_relays_gemini_steps(mock_gemini_agent):
+    """Gemini'den gelen adimlar sonuc hesaplanmadan iletilmeli"""
+    from src.core.streaming import current_step_listener
+    
+    async def respond(prompt, domain=None, max_retries=None):
+        listener = current_step_listener()
+        listener("adim 1")
+        listener("adim 2")
+        return {"result": 42.0, "steps": ["adim 1", "adim 2"], "confidence_score": 0.9}
+    
+    mock_gemini_agent.generate_json_response.side_effect = respond
+    agent = CalculatorAgent(gemini_agent=mock_gemini_agent)
+    
+    events = [event async for event in agent.stream_command("!calculus limit sin(x)/x, x->0 kaniti")]
+    
+    assert [event["event"] for event in events] == ["step", "step", "result"]
+    assert [event["index"] for event in events[:2]] == [0, 1]
+    assert events[-1]["result"].result == 42.0
+
+
+@pytest.mark.asyncio
+async def test_print_streamed_local_result(mock_gemini_agent):
+    """Yerel sonucun adimlari sonuctan once yazilmali"""
+    agent = CalculatorAgent(gemini_agent=mock_gemini_agent)
+    output = io.StringIO()
+    
+    await agent.print_streamed("2 + 3", stream=output)
+    await agent.print_streamed("eval('1')", stream=output)
+    
+    text = output.getvalue()
+    assert text.index("📝 Adimlar:") < text.index("✅ Sonuc: 5")
+    assert "❌ Guvenlik hatasi" in text
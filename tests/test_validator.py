@@ -0,0 +1,44 @@
+"""InputValidator testleri"""
+
+import pytest
+
+from src.core.validator import InputValidator
+from src.utils.exceptions import InvalidInputError, SecurityViolationError
+
+
+def test_validate_rejects_forbidden_patterns_case_insensitively():
+    """Yasakli ifadeler buyuk/kucuk harften bagimsiz yakalanir"""
+    validator = InputValidator()
+    
+    with pytest.raises(SecurityViolationError, match="eval\\("):
+        validator.validate("2 + EVAL('1')")
+    with pytest.raises(SecurityViolationError, match="__import__"):
+        validator.validate("__IMPORT__('os')")
+    assert validator.validate("  sin(x) + cos(x)  ") == "sin(x) + cos(x)"
+
+
+def test_validate_combines_length_and_charset():
+    """Uzunluk ve karakter kumesi ayni cagride kontrol edilir"""
+    validator = InputValidator()
+    
+    with pytest.raises(InvalidInputError, match="cok uzun"):
+        validator.validate("1+" * 600)
+    with pytest.raises(InvalidInputError, match="Gecersiz karakter"):
+        validator.validate("2 $ 3", numeric=True)
+    with pytest.raises(SecurityViolationError):
+        validator.validate("x + exec(1)", numeric=True)
+    assert validator.validate("2 $ 3") == "2 $ 3"
+    assert validator.validate("[1, 2]; 3^e", numeric=True) == "[1, 2]; 3^e"
+
+
+def test_request_scope_memoizes_validation(monkeypatch):
+    """Ayni istek icinde ikinci dogrulama tarama yapmaz"""
+    validator = InputValidator()
+    
+    with validator.request_scope():
+        validator.validate("2 + 2")
+        monkeypatch.setattr(InputValidator, "_FORBIDDEN", ("2",))
+        assert validator.validate("2 + 2") == "2 + 2"
+    
+    with pytest.raises(SecurityViolationError):
+        validator.validate("2 + 2")